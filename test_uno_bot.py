@@ -0,0 +1,86 @@
+import io
+import os
+import shlex
+import sys
+import time
+import unittest
+
+from uno_bot import BotProcess, BotMatch, BotError, BotPlayer, parse_move, serve
+from uno_fixed import Color
+from uno_players import create_player, player_spec, strategy_names
+from uno_tournament import Tournament
+
+REFERENCE_BOT = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "uno_bot.py"),
+                 "--serve"]
+
+
+class TestBotProtocol(unittest.TestCase):
+    def play(self, concurrency):
+        bot = BotProcess(REFERENCE_BOT)
+        try:
+            self.assertEqual(bot.handshake(), "Referenzbot")
+            return BotMatch(bot, 20, concurrency=concurrency, seed=3).run()
+        finally:
+            bot.close()
+
+    def test_batching_does_not_change_results(self):
+        single = self.play(1)
+        batched = self.play(8)
+        self.assertEqual(single["games"], 20)
+        self.assertEqual(single["errors"], 0)
+        for key in ("bot_wins", "computer_wins", "turns", "decisions"):
+            self.assertEqual(single[key], batched[key])
+        self.assertEqual(single["round_trips"], single["decisions"])
+        self.assertLess(batched["round_trips"], single["decisions"] / 2)
+
+    def test_bot_plays_in_tournaments(self):
+        spec = "BotPlayer:command=" + shlex.join(REFERENCE_BOT)
+        player = create_player(spec, "Bot")
+        self.assertIsInstance(player, BotPlayer)
+        self.assertEqual(player_spec(player), spec)
+        self.assertNotIn("BotPlayer", strategy_names())
+        with self.assertRaises(ValueError):
+            create_player("BotPlayer", "Bot")
+
+        tournament = Tournament(["ComputerPlayer", spec], 20, seed=2)
+        self.assertTrue(tournament.run())
+        self.assertEqual(sum(stats["wins"] for stats in tournament.stats.values()) +
+                         tournament.drawn + tournament.unfinished, 20)
+        bots = [player for player in tournament.players if isinstance(player, BotPlayer)]
+        self.assertEqual([bot.errors for bot in bots], [0])
+
+    def test_parse_move(self):
+        self.assertEqual(parse_move("draw", [0]), (None, None, False))
+        self.assertEqual(parse_move("play 2 uno color Grün", [2]), (2, Color.GREEN, True))
+        self.assertIsNone(parse_move("play 1", [2]))
+        self.assertIsNone(parse_move("play 2 color Lila", [2]))
+
+    def test_serve_answers_whole_batch(self):
+        turn = '{"id": %d, "top": "Rot 5", "declared": null, "hand": ["Farbwahl", "Blau 1"], ' \
+               '"playable": [0], "opponents": [3]}'
+        output = io.StringIO()
+        serve(io.StringIO("uno 1\nbatch 2\nturn " + turn % 4 + "\nturn " + turn % 9 + "\nquit\n"), output)
+        self.assertEqual(output.getvalue().splitlines(),
+                         ["ok Referenzbot", "4 play 0 uno color Blau", "9 play 0 uno color Blau"])
+
+    def test_bot_that_exits_raises(self):
+        bot = BotProcess([sys.executable, "-c", "pass"])
+        with self.assertRaises(BotError):
+            bot.handshake()
+        bot.close()
+
+    def test_silent_bot_is_killed(self):
+        silent = "import sys, time; print('ok Stumm', flush=True); sys.stdin.readline(); time.sleep(60)"
+        for code in ("import time; time.sleep(60)", silent):
+            bot = BotProcess([sys.executable, "-c", code], timeout=0.5)
+            started = time.monotonic()
+            with self.assertRaises(BotError):
+                bot.handshake()
+                BotMatch(bot, 1).run()
+            self.assertLess(time.monotonic() - started, 5)
+            bot.close()
+            self.assertIsNotNone(bot.process.poll())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
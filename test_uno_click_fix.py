@@ -4,10 +4,11 @@ Test to verify the UNO GUI click bug fix.
 This test creates a minimal UNO game scenario and verifies that clicking cards works correctly.
 """
 
+import time
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 import tkinter as tk
-from uno import Game, Card, Color, CardType, HumanPlayer, ComputerPlayer
+from uno_fixed import Game, Card, Color, CardType, HumanPlayer, ComputerPlayer
 
 class TestUnoClickFix(unittest.TestCase):
     def setUp(self):
@@ -150,6 +151,182 @@ class TestUnoClickFix(unittest.TestCase):
             callback(card)  # Pass the card as CardWidget does
             self.assertEqual(played_indices, [i], f"Callback {i} should play card at index {i}")
 
+    def test_update_display_reuses_widgets(self):
+        """Test that update_display only touches widgets of changed cards"""
+        from uno_gui_improved import UnoGUI
+        
+        gui = UnoGUI(self.root)
+        gui.game = self.game
+        gui.update_display()
+        
+        old_widgets = list(gui.player_card_frames)
+        gui.update_display()
+        self.assertEqual(gui.player_card_frames, old_widgets)
+        
+        # Playing the middle card removes only its widget
+        played = self.game.players[0].hand.pop(1)
+        gui.update_display()
+        self.assertEqual(gui.player_card_frames, [old_widgets[0], old_widgets[2]])
+        self.assertIn(old_widgets[1], gui.spare_card_frames)
+        self.assertNotIn(played, [w.card for w in gui.player_card_frames])
+    
+    def test_large_hand_is_virtualized(self):
+        """Test that only the visible window of a large hand gets widgets"""
+        from uno_gui_improved import UnoGUI
+        
+        gui = UnoGUI(self.root)
+        gui.game = self.game
+        player = self.game.players[0]
+        player.hand = [Card(Color.BLUE, CardType.NUMBER, i % 10) for i in range(40)]
+        gui.update_display()
+        
+        self.assertEqual(len(gui.player_card_frames), gui.hand_capacity)
+        self.assertEqual([w.card for w in gui.player_card_frames], player.hand[:gui.hand_capacity])
+        
+        created = set(map(id, gui.player_card_frames + gui.spare_card_frames))
+        for _ in range(10):
+            gui.scroll_hand(1)
+        self.assertEqual(gui.hand_offset, 40 - gui.hand_capacity)
+        self.assertEqual([w.card for w in gui.player_card_frames], player.hand[-gui.hand_capacity:])
+        # Scrolling recycles the existing widgets
+        self.assertEqual(set(map(id, gui.player_card_frames + gui.spare_card_frames)), created)
+
+    def test_canvas_hit_testing(self):
+        """Test that clicks on the canvas table resolve to the right hand card"""
+        from uno_gui_improved import UnoGUI
+        
+        gui = UnoGUI(self.root, renderer="canvas")
+        gui.game = self.game
+        gui.can_play = True
+        gui.update_display()
+        
+        played = []
+        gui.table.click_callback = played.append
+        
+        for item, card in zip(gui.table.hand_items, self.game.players[0].hand):
+            x1, y1, x2, y2 = item.bbox
+            self.assertIs(gui.table.hand_card_at(x1 + 1, y1 + 1), item)
+            self.assertIs(item.card, card)
+        
+        # Red 5 is playable on Red 7, Blue 3 is not
+        for i in (0, 1):
+            x1, y1, _, _ = gui.table.hand_items[i].bbox
+            gui.table._on_click(Mock(x=x1 + 1, y=y1 + 1))
+        self.assertEqual(played, [self.game.players[0].hand[0]])
+        
+        # All card bodies come from the shared image cache
+        self.assertLessEqual(len(gui.table.images.images), 8)
+
+    def test_cards_fly_at_the_same_time(self):
+        """Test that overlapping animations do not share a canvas item"""
+        from uno_gui_improved import UnoGUI
+        
+        gui = UnoGUI(self.root, renderer="canvas")
+        gui.game = self.game
+        table = gui.table
+        table.render(self.game, True)
+        landed = []
+        
+        played = Card(Color.RED, CardType.NUMBER, 5)
+        answer = Card(Color.RED, CardType.SKIP)
+        first = table.fly_card(played, (0, 400), table.top_card_position, frames=4,
+                               landed=lambda: landed.append(played))
+        next(first)
+        second = table.fly_card(answer, table.computer_position, table.top_card_position, frames=2,
+                                landed=lambda: landed.append(answer))
+        next(second)
+        self.game.discard_pile += [played, answer]
+        table.render(self.game, True)
+        # The pile shows its old top until the cards arrive
+        self.assertIs(table.top_card_item.card, self.game.discard_pile[0])
+        
+        self.assertEqual(table.cards_landing, 2)
+        for _ in second:
+            pass
+        for _ in first:
+            pass
+        self.assertEqual(landed, [answer, played])
+        self.assertEqual(len(set(table.spare_flying_items)), 2)
+        table.render(self.game, True)
+        self.assertIs(table.top_card_item.card, answer)
+    
+    def test_computer_decision_from_worker(self):
+        """Test that the computer's move comes back through the queue"""
+        from uno_gui_improved import UnoGUI
+        
+        gui = UnoGUI(self.root)
+        gui.game = self.game
+        gui.computer_turn = Mock()
+        gui.computer_min_delay_ms = 0
+        gui.computer_poll_ms = 1
+        
+        def decide(hand):
+            self.game.players[1].hand = hand
+            gui.schedule_computer_turn()
+            # A decision for an old token is ignored
+            gui.computer_decisions.put((gui.computer_turn_token - 1, (5, None), None))
+            gui.computer_worker.join()
+            time.sleep(gui.computer_poll_ms / 1000)
+            self.root.update()  # runs the due poll, which finds the decision
+        
+        decide([Card(Color.RED, CardType.NUMBER, 1)])
+        gui.computer_turn.assert_called_once_with(0, None)
+        
+        # The color of a wild card is decided on the worker too
+        gui.computer_turn.reset_mock()
+        decide([Card(Color.WILD, CardType.WILD), Card(Color.BLUE, CardType.NUMBER, 3),
+                Card(Color.BLUE, CardType.NUMBER, 4)])
+        gui.computer_turn.assert_called_once_with(0, Color.BLUE)
+
+    def test_computer_uno_call_follows_its_strategy(self):
+        """Test that forget_uno decides the computer's UNO call, also for a drawn card"""
+        from uno_gui_improved import UnoGUI
+        
+        gui = UnoGUI(self.root)
+        gui.game = self.game
+        gui.animate_computer_play = Mock()
+        for forget_uno, called in ((0.0, True), (1.0, False)):
+            computer = ComputerPlayer("Computer", forget_uno=forget_uno)
+            self.game.players[1] = computer
+            computer.hand = [Card(Color.RED, CardType.NUMBER, 1), Card(Color.BLUE, CardType.NUMBER, 2)]
+            gui.computer_turn(0)
+            self.assertEqual(computer.has_called_uno, called)
+            
+            # A drawn card that is played leaves the hand before the call
+            computer.hand = [Card(Color.GREEN, CardType.NUMBER, 2)]
+            computer.has_called_uno = False
+            self.game.discard_pile.append(Card(Color.BLUE, CardType.NUMBER, 3))
+            self.game.deck.cards.append(Card(Color.BLUE, CardType.NUMBER, 4))
+            gui.computer_turn(None)
+            self.assertEqual(len(computer.hand), 1)
+            self.assertEqual(computer.has_called_uno, called)
+
+    def test_frame_scheduler_shows_all_messages(self):
+        """Test that queued messages are all shown and redraws are coalesced"""
+        from uno_gui_improved import FrameScheduler
+        
+        redraws = []
+        shown = []
+        scheduler = FrameScheduler(self.root, lambda: redraws.append(1), shown.append)
+        scheduler.message_ms = 0
+        
+        for text in ["Computer spielt: Rot 5", "Computer ruft UNO!", "Computer wählt: Rot"]:
+            scheduler.post_message(text)
+        for _ in range(5):
+            scheduler.request_redraw()
+        
+        steps = []
+        scheduler.animate(iter([1, 2]))
+        scheduler.animate(steps.append(i) for i in range(3))
+        
+        for _ in range(4):
+            scheduler._run_frame()
+        
+        self.assertEqual(shown, ["Computer spielt: Rot 5", "Computer ruft UNO!", "Computer wählt: Rot"])
+        self.assertEqual(len(redraws), 1)
+        self.assertEqual(steps, [0, 1, 2])
+        self.assertFalse(scheduler.animations)
+
 if __name__ == "__main__":
     # Run tests with minimal verbosity
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,57 @@
+import itertools
+import os
+import random
+import unittest
+from collections import Counter
+from contextlib import redirect_stdout
+
+from uno_deck import CountedDeck, FenwickTree
+from uno_fixed import Game, ComputerPlayer
+from uno_state import face_of
+
+
+class TestFenwickTree(unittest.TestCase):
+    def test_take_matches_prefix_sums(self):
+        rng = random.Random(4)
+        for size in (1, 7, 54, 64):
+            counts = [rng.randint(0, 3) for _ in range(size)]
+            counts[-1] += 1
+            tree = FenwickTree(size)
+            tree.rebuild(counts)
+            while tree.total:
+                target = rng.randrange(tree.total)
+                expected = next(i for i, s in enumerate(itertools.accumulate(counts)) if s > target)
+                self.assertEqual(tree.find(target), expected)
+                self.assertEqual(tree.take(target), expected)
+                counts[expected] -= 1
+            self.assertEqual(tree.tree, [0] * (size + 1))
+
+
+class TestCountedDeck(unittest.TestCase):
+    def test_draws_every_card_once(self):
+        deck = CountedDeck(2)
+        drawn = [deck.draw() for _ in range(216)]
+        self.assertIsNone(deck.draw())
+        self.assertEqual(len(set(map(id, drawn))), 216)
+        self.assertEqual(Counter(map(face_of, drawn)), Counter(map(face_of, deck.all_cards)))
+
+        deck.add_cards(drawn[:10])
+        self.assertEqual(deck.cards_remaining(), 10)
+        deck.reset()
+        self.assertEqual(deck.cards_remaining(), 216)
+
+    def test_large_table_keeps_all_cards(self):
+        random.seed(8)
+        game = Game(deck=CountedDeck(3))
+        game.players = [ComputerPlayer(f"Computer {i + 1}") for i in range(14)]
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for _ in range(5):
+                game.reset()
+                while not game.is_over():
+                    game.play_turn()
+                    cards = game.deck.cards + game.discard_pile + [c for p in game.players for c in p.hand]
+                    self.assertEqual(len(set(map(id, cards))), 324)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,122 @@
+import random
+import unittest
+
+from uno_endgame import EndgameSolver
+from uno_fixed import Game, HouseRules, ComputerPlayer, Card, Color, CardType
+from uno_search import FACE_COLOR, WILD
+from uno_state import FACES, FACE_BY_NAME
+from uno_tournament import Tournament
+
+RED_5 = FACE_BY_NAME["Rot 5"]
+RED_SKIP = FACE_BY_NAME["Rot Aussetzen"]
+WILD_CARD = FACE_BY_NAME["Farbwahl"]
+
+
+def unseen_of(*faces):
+    unseen = [0] * len(FACES)
+    for face in faces:
+        unseen[face] += 1
+    return unseen
+
+
+def random_position(rng):
+    deck = [face for face in range(len(FACES)) for _ in range(2)]
+    rng.shuffle(deck)
+    mover = tuple(sorted(deck[:rng.randint(1, 3)]))
+    other = tuple(sorted(deck[3:3 + rng.randint(1, 3)]))
+    top = deck[6]
+    if FACE_COLOR[top] == WILD:
+        top = FACE_BY_NAME["Gelb 7"]
+    return mover, other, top, FACE_COLOR[top], tuple(deck[7:13])
+
+
+class TestEndgameSolver(unittest.TestCase):
+    def test_skips_before_going_out(self):
+        solver = EndgameSolver()
+        hand = (RED_5, RED_SKIP)
+        other = (FACE_BY_NAME["Rot 7"],)
+        deck = (FACE_BY_NAME["Grün 1"],) * 6
+        self.assertTrue(solver.play(hand, other, (RED_SKIP, 0), deck))
+        self.assertFalse(solver.play(hand, other, (RED_5, 0), deck))
+        unseen = unseen_of(*[FACE_BY_NAME["Rot 7"]] * 10)
+        self.assertEqual(solver.best_move(hand, 1, FACE_BY_NAME["Rot 3"], 0, unseen), (RED_SKIP, 0))
+
+    def test_calls_color_the_opponent_cannot_answer(self):
+        solver = EndgameSolver()
+        hand = (FACE_BY_NAME["Blau 2"], WILD_CARD)
+        unseen = unseen_of(FACE_BY_NAME["Rot 4"], *[FACE_BY_NAME["Grün 1"]] * 10)
+        self.assertEqual(solver.best_move(hand, 1, FACE_BY_NAME["Rot 3"], 0, unseen), (WILD_CARD, 1))
+
+    def test_leaves_open_choices_to_the_caller(self):
+        # Both cards win at once, so there is nothing to decide
+        solver = EndgameSolver()
+        hand = (FACE_BY_NAME["Rot 1"], FACE_BY_NAME["Rot 2"])
+        self.assertIsNone(solver.best_move(hand[:1], 3, RED_5, 0, unseen_of(*[RED_5] * 20)))
+        self.assertIsNone(solver.best_move(hand, 3, RED_5, 0, unseen_of(*[RED_5] * 20)))
+
+    def test_memo_cap_keeps_the_values(self):
+        rng = random.Random(7)
+        positions = [random_position(rng) for _ in range(300)]
+        unbounded = EndgameSolver()
+        capped = EndgameSolver(max_entries=50)
+        for position in positions:
+            self.assertEqual(capped.wins(*position), unbounded.wins(*position))
+            self.assertLessEqual(len(capped.memo), 50)
+        self.assertGreater(len(unbounded.memo), 50)
+
+    def test_repeated_positions_come_from_the_memo(self):
+        solver = EndgameSolver()
+        position = random_position(random.Random(2))
+        solver.wins(*position)
+        misses = solver.misses
+        solver.wins(*position)
+        self.assertEqual(solver.misses, misses)
+        self.assertGreater(solver.hits, 0)
+
+
+class TestComputerPlayerEndgame(unittest.TestCase):
+    def endgame(self, rules=None, players=2):
+        game = Game(rules)
+        game.players = [ComputerPlayer(f"Computer {i + 1}") for i in range(players)]
+        game.reset()
+        player = game.players[0]
+        player.hand = [Card(Color.RED, CardType.NUMBER, 5), Card(Color.RED, CardType.SKIP)]
+        game.players[1].hand = [Card(Color.RED, CardType.NUMBER, 7)]
+        game.discard_pile.append(Card(Color.RED, CardType.NUMBER, 3))
+        return player
+
+    def test_plays_won_endgame(self):
+        player = self.endgame()
+        self.assertEqual(player.choose_card(Card(Color.RED, CardType.NUMBER, 3)), 1)
+
+    def test_search_can_be_turned_off_and_keeps_the_random_stream(self):
+        top_card = Card(Color.RED, CardType.NUMBER, 3)
+        player = self.endgame()
+        player.endgame_cards = 0
+        self.assertIsNone(player.endgame_move(top_card))
+
+        player.endgame_cards = 2
+        random.seed(4)
+        expected = random.random()
+        random.seed(4)
+        moves = {player.endgame_move(top_card) for _ in range(5)}
+        self.assertEqual(random.random(), expected)
+        self.assertEqual(moves, {1})
+
+    def test_searches_only_plain_two_player_endgames(self):
+        top_card = Card(Color.RED, CardType.NUMBER, 3)
+        self.assertIsNone(self.endgame(players=3).endgame_move(top_card))
+        self.assertIsNone(self.endgame(HouseRules(stacking=True)).endgame_move(top_card))
+        player = self.endgame()
+        player.hand += [Card(Color.BLUE, CardType.NUMBER, n) for n in range(1, 5)]
+        self.assertIsNone(player.endgame_move(top_card))
+
+    def test_plays_tournaments(self):
+        tournament = Tournament(["Endspiel", "ComputerPlayer"], 100, seed=3)
+        self.assertTrue(tournament.run())
+        self.assertEqual(sum(stats["wins"] for stats in tournament.stats.values()) +
+                         tournament.drawn + tournament.unfinished, 100)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,307 @@
+import os
+import random
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from uno_fixed import Game, GamePool, Deck, HouseRules, Match, ComputerPlayer, HumanPlayer, Card, Color, CardType
+
+
+def new_computer_game(num_players=2, rules=None):
+    game = Game(rules)
+    game.players = [ComputerPlayer(f"Computer {i + 1}") for i in range(num_players)]
+    return game
+
+
+def play_out(game, max_turns=500):
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for _ in range(max_turns):
+            game.play_turn()
+            if game.is_over():
+                break
+
+
+class TestGameReset(unittest.TestCase):
+    def test_reset_restores_full_deck(self):
+        game = new_computer_game(3)
+        game.reset()
+        play_out(game, max_turns=30)
+        game.players[0].has_called_uno = True
+        game.direction = -1
+        game.declared_color = Color.RED
+
+        game.reset()
+        cards_in_play = len(game.deck.cards) + len(game.discard_pile) + \
+            sum(len(player.hand) for player in game.players)
+        self.assertEqual(cards_in_play, 108)
+        self.assertEqual(len(game.discard_pile), 1)
+        self.assertTrue(all(len(player.hand) == 7 for player in game.players))
+        self.assertFalse(game.players[0].has_called_uno)
+        self.assertEqual((game.current_player_index, game.direction, game.declared_color), (0, 1, None))
+
+    def test_reset_deals_like_a_new_game(self):
+        random.seed(7)
+        fresh = new_computer_game()
+        fresh.deal()
+
+        reused = new_computer_game()
+        reused.reset()
+        play_out(reused, max_turns=40)
+        random.seed(7)
+        reused.reset()
+
+        self.assertEqual([str(c) for c in fresh.players[0].hand], [str(c) for c in reused.players[0].hand])
+        self.assertEqual(str(fresh.get_top_card()), str(reused.get_top_card()))
+
+    def test_seeded_deck_ignores_other_random_use(self):
+        orders = []
+        for draws in (0, 5):
+            deck = Deck()
+            deck.seed(42)
+            for _ in range(draws):
+                random.random()
+            deck.reset()
+            deck.add_cards([deck.draw() for _ in range(10)])
+            orders.append([str(card) for card in deck.cards])
+        self.assertEqual(orders[0], orders[1])
+    
+    def test_pool_reuses_games(self):
+        pool = GamePool(new_computer_game)
+        game = pool.acquire()
+        play_out(game)
+        pool.release(game)
+
+        again = pool.acquire()
+        self.assertIs(again, game)
+        self.assertEqual(len(again.players[1].hand), 7)
+        self.assertIsNot(pool.acquire(), game)
+
+    def test_pooled_game_deals_like_a_new_one(self):
+        def deal(game):
+            return [[str(card) for card in player.hand] for player in game.players] + [str(game.get_top_card())]
+
+        pool = GamePool(new_computer_game)
+        game = pool.acquire(3)
+        play_out(game)
+        pool.release(game)
+        reused = pool.acquire(9)
+        self.assertIs(reused, game)
+        reused_deal, reused_draw = deal(reused), random.random()
+
+        fresh = GamePool(new_computer_game).acquire(9)
+        self.assertEqual(deal(fresh), reused_deal)
+        self.assertEqual(random.random(), reused_draw)
+
+
+class TestHouseRules(unittest.TestCase):
+    def staged_game(self, rules, hands, top):
+        """A dealt game whose hands and top card are replaced by the given cards"""
+        game = new_computer_game(len(hands), rules)
+        game.reset()
+        for player, hand in zip(game.players, hands):
+            player.hand[:] = hand
+        game.discard_pile[:] = [top]
+        return game
+
+    def test_every_variant_keeps_all_cards_in_play(self):
+        for names in [[name] for name in HouseRules.NAMES] + [HouseRules.NAMES]:
+            random.seed(11)
+            game = new_computer_game(4, HouseRules.from_names(names))
+            for _ in range(5):
+                game.reset()
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                    for _ in range(300):
+                        game.play_turn()
+                        cards = game.deck.cards + game.discard_pile + [c for p in game.players for c in p.hand]
+                        self.assertEqual(len(set(map(id, cards))), 108, names)
+                        if game.check_winner():
+                            break
+
+    def test_unknown_rule_is_rejected(self):
+        with self.assertRaises(ValueError):
+            HouseRules.from_names(["stacking", "doppelt"])
+
+    def test_stacking_passes_the_penalty_on(self):
+        game = self.staged_game(HouseRules(stacking=True), [
+            [Card(Color.RED, CardType.DRAW_TWO), Card(Color.BLUE, CardType.NUMBER, 1)],
+            [Card(Color.RED, CardType.DRAW_TWO), Card(Color.BLUE, CardType.NUMBER, 2)],
+            [Card(Color.GREEN, CardType.NUMBER, 3)],
+        ], Card(Color.RED, CardType.NUMBER, 5))
+        play_out(game, max_turns=2)
+        self.assertEqual(game.pending_draw, 4)
+        self.assertEqual(len(game.players[1].hand), 1)
+        play_out(game, max_turns=1)
+        self.assertEqual((game.pending_draw, len(game.players[2].hand)), (0, 5))
+        self.assertEqual(game.current_player_index, 0)
+
+    def test_stacking_asks_again_for_a_card_that_cannot_stack(self):
+        game = self.staged_game(HouseRules(stacking=True), [
+            [Card(Color.RED, CardType.NUMBER, 3), Card(Color.BLUE, CardType.DRAW_TWO)],
+            [Card(Color.GREEN, CardType.NUMBER, 3)],
+        ], Card(Color.RED, CardType.DRAW_TWO))
+        human = HumanPlayer("Spieler")
+        human.hand[:] = game.players[0].hand
+        game.players[0] = human
+        game.pending_draw = 2
+        with patch("builtins.input", side_effect=["1", "2", "j"]) as asked:
+            play_out(game, max_turns=1)
+        self.assertEqual(asked.call_count, 3)
+        self.assertEqual(game.pending_draw, 4)
+        self.assertEqual([str(c) for c in human.hand], ["Rot 3"])
+
+    def test_jump_in_waits_for_a_played_card(self):
+        game = self.staged_game(HouseRules(jump_in=True), [
+            [Card(Color.BLUE, CardType.NUMBER, 1)],
+            [Card(Color.RED, CardType.NUMBER, 5), Card(Color.GREEN, CardType.NUMBER, 2)],
+        ], Card(Color.RED, CardType.NUMBER, 5))
+        game.deck.cards[:] = [Card(Color.YELLOW, CardType.NUMBER, 2)]
+        play_out(game, max_turns=1)
+        self.assertEqual(len(game.players[1].hand), 2)
+        self.assertEqual(len(game.discard_pile), 1)
+
+    def test_seven_swaps_and_zero_passes_hands(self):
+        game = self.staged_game(HouseRules(seven_o=True), [
+            [Card(Color.RED, CardType.NUMBER, 7), Card(Color.BLUE, CardType.NUMBER, 1),
+             Card(Color.BLUE, CardType.NUMBER, 2)],
+            [Card(Color.GREEN, CardType.NUMBER, 3)],
+            [Card(Color.GREEN, CardType.NUMBER, 4), Card(Color.GREEN, CardType.NUMBER, 5)],
+        ], Card(Color.RED, CardType.NUMBER, 5))
+        play_out(game, max_turns=1)
+        self.assertEqual([str(c) for c in game.players[0].hand], ["Grün 3"])
+        self.assertEqual([str(c) for c in game.players[1].hand], ["Blau 1", "Blau 2"])
+
+        game.players[1].hand.append(Card(Color.RED, CardType.NUMBER, 0))
+        game.discard_pile.append(Card(Color.RED, CardType.NUMBER, 9))
+        hands = [list(map(str, p.hand)) for p in game.players]
+        play_out(game, max_turns=1)
+        self.assertEqual([str(c) for c in game.players[2].hand], ["Blau 1", "Blau 2"])
+        self.assertEqual([str(c) for c in game.players[0].hand], hands[2])
+
+    def test_jump_in_continues_after_the_jumper(self):
+        game = self.staged_game(HouseRules(jump_in=True), [
+            [Card(Color.RED, CardType.NUMBER, 4), Card(Color.BLUE, CardType.NUMBER, 1)],
+            [Card(Color.YELLOW, CardType.NUMBER, 8), Card(Color.YELLOW, CardType.NUMBER, 9)],
+            [Card(Color.RED, CardType.NUMBER, 4), Card(Color.GREEN, CardType.NUMBER, 2)],
+        ], Card(Color.RED, CardType.NUMBER, 5))
+        play_out(game, max_turns=1)
+        self.assertEqual(len(game.players[2].hand), 1)
+        self.assertEqual(len(game.discard_pile), 3)
+        self.assertEqual(game.current_player_index, 0)
+
+    def test_draw_until_playable_with_forced_play(self):
+        game = self.staged_game(HouseRules(draw_until_playable=True, forced_play=True), [
+            [Card(Color.BLUE, CardType.NUMBER, 1)],
+            [Card(Color.BLUE, CardType.NUMBER, 2)],
+        ], Card(Color.RED, CardType.NUMBER, 5))
+        game.deck.cards[:] = [Card(Color.RED, CardType.NUMBER, 3),
+                              Card(Color.GREEN, CardType.NUMBER, 1), Card(Color.YELLOW, CardType.NUMBER, 2)]
+        play_out(game, max_turns=1)
+        self.assertEqual(len(game.players[0].hand), 3)
+        self.assertEqual(str(game.get_top_card()), "Rot 3")
+
+
+class TestDrawnGames(unittest.TestCase):
+    def staged_game(self, hands, top):
+        game = new_computer_game(len(hands))
+        game.reset()
+        for player, hand in zip(game.players, hands):
+            player.hand[:] = hand
+        game.deck.cards.clear()
+        game.discard_pile[:] = [top]
+        return game
+
+    def test_stall_ends_as_drawn(self):
+        game = self.staged_game([[Card(Color.BLUE, CardType.NUMBER, 1)],
+                                 [Card(Color.GREEN, CardType.NUMBER, 2)]],
+                                Card(Color.RED, CardType.NUMBER, 5))
+        play_out(game, max_turns=10)
+        self.assertTrue(game.is_over())
+        self.assertIsNone(game.check_winner())
+        self.assertIn("gezogen", game.drawn)
+
+    def test_repeated_position_ends_as_drawn(self):
+        # The two red cards travel back and forth through the discard pile forever
+        game = self.staged_game([[Card(Color.RED, CardType.NUMBER, 3), Card(Color.BLUE, CardType.NUMBER, 1),
+                                  Card(Color.BLUE, CardType.NUMBER, 2)],
+                                 [Card(Color.GREEN, CardType.NUMBER, 8), Card(Color.GREEN, CardType.NUMBER, 9)]],
+                                Card(Color.RED, CardType.NUMBER, 5))
+        play_out(game, max_turns=100)
+        self.assertEqual(game.drawn, "Stellung hat sich wiederholt")
+        self.assertLess(game.positions[game._position()], 4)
+
+    def test_reset_clears_drawn_state(self):
+        game = self.staged_game([[Card(Color.BLUE, CardType.NUMBER, 1)],
+                                 [Card(Color.GREEN, CardType.NUMBER, 2)]],
+                                Card(Color.RED, CardType.NUMBER, 5))
+        play_out(game, max_turns=10)
+        game.reset()
+        self.assertFalse(game.is_over())
+        self.assertEqual((game.idle_turns, game.positions), (0, {}))
+
+
+class TestScoring(unittest.TestCase):
+    def test_card_points(self):
+        self.assertEqual(Card(Color.RED, CardType.NUMBER, 7).points, 7)
+        self.assertEqual(Card(Color.BLUE, CardType.REVERSE).points, 20)
+        self.assertEqual(Card(Color.WILD, CardType.WILD_DRAW_FOUR).points, 50)
+
+    def test_hand_points_follow_every_draw_and_play(self):
+        random.seed(2)
+        game = new_computer_game(4, HouseRules(stacking=True, seven_o=True))
+        game.reset()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            while not game.is_over():
+                game.play_turn()
+                for player in game.players:
+                    self.assertEqual(player.hand_points, sum(card.points for card in player.hand))
+        self.assertEqual(game.round_points(), sum(p.hand_points for p in game.players))
+
+    def test_match_is_played_to_target(self):
+        random.seed(5)
+        match = Match(new_computer_game(3), target=500)
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            winner = match.play()
+        result = match.result()
+        self.assertEqual(result["winner"], winner.name)
+        self.assertGreaterEqual(result["scores"][winner.name], 500)
+        self.assertEqual(sum(r["points"] for r in match.rounds), sum(result["scores"].values()))
+        self.assertEqual([r["round"] for r in match.rounds], list(range(1, result["rounds"] + 1)))
+
+
+
+class TestComputerPlayerParams(unittest.TestCase):
+    def test_defaults_are_the_classic_heuristic(self):
+        self.assertEqual(ComputerPlayer("Computer").params(), ComputerPlayer.PARAMS)
+
+    def test_card_order_follows_params(self):
+        top_card = Card(Color.RED, CardType.NUMBER, 5)
+        hand = [Card(Color.RED, CardType.NUMBER, 1), Card(Color.RED, CardType.SKIP),
+                Card(Color.WILD, CardType.WILD), Card(Color.BLUE, CardType.NUMBER, 2)]
+
+        def choice(**params):
+            player = ComputerPlayer("Computer", endgame_cards=0, **params)
+            player.hand = list(hand)
+            return player.choose_card(top_card)
+
+        self.assertEqual(choice(), 1)
+        self.assertEqual(choice(actions_first=False), 0)
+        self.assertEqual(choice(wild_threshold=4), 2)
+
+    def test_color_and_uno_params(self):
+        player = ComputerPlayer("Computer", color_rule="points", forget_uno=0.0)
+        player.hand = [Card(Color.RED, CardType.NUMBER, 1), Card(Color.RED, CardType.NUMBER, 2),
+                       Card(Color.BLUE, CardType.DRAW_TWO)]
+        self.assertEqual(player.choose_color(), Color.BLUE)
+        self.assertTrue(all(player.wants_uno_call() for _ in range(200)))
+        forgetful = ComputerPlayer("Computer", forget_uno=1.0)
+        self.assertFalse(any(forgetful.wants_uno_call() for _ in range(200)))
+
+    def test_unknown_params_are_rejected(self):
+        with self.assertRaises(ValueError):
+            ComputerPlayer("Computer", wild_limit=2)
+        with self.assertRaises(ValueError):
+            ComputerPlayer("Computer", color_rule="lieblingsfarbe")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+import os
+import random
+import unittest
+from contextlib import redirect_stdout
+
+from uno_fixed import Game, HouseRules, ComputerPlayer, Card, Color, CardType
+from uno_knowledge import CountingComputerPlayer
+from uno_state import FACES, face_of
+from uno_tournament import Tournament
+
+
+def hidden_faces(game, owner):
+    """Face counts of all cards owner cannot see: the deck and the other hands"""
+    counts = [0] * len(FACES)
+    for card in game.deck.cards + [card for player in game.players if player is not owner
+                                   for card in player.hand]:
+        counts[face_of(card)] += 1
+    return counts
+
+
+def counting_game(rules=None):
+    game = Game(rules)
+    game.players = [CountingComputerPlayer("Zähler"), ComputerPlayer("Computer 1"),
+                    ComputerPlayer("Computer 2")]
+    return game
+
+
+class TestCardCounter(unittest.TestCase):
+    def check_games(self, rules=None, games=20):
+        random.seed(11)
+        game = counting_game(rules)
+        owner = game.players[0]
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for _ in range(games):
+                game.reset()
+                for _ in range(300):
+                    self.assertEqual(owner.counter.unseen, hidden_faces(game, owner))
+                    self.assertEqual(sum(owner.counter.unseen_by_color), sum(owner.counter.unseen))
+                    game.play_turn()
+                    if game.is_over():
+                        break
+
+    def test_unseen_matches_hidden_cards(self):
+        self.check_games()
+
+    def test_unseen_matches_hidden_cards_with_house_rules(self):
+        self.check_games(HouseRules(stacking=True, jump_in=True, seven_o=True))
+
+    def test_passing_marks_color_as_lacking(self):
+        game = counting_game()
+        game.reset()
+        owner, opponent = game.players[0], game.players[1]
+        game.discard_pile.append(Card(Color.RED, CardType.NUMBER, 5))
+        opponent.hand = [Card(Color.BLUE, CardType.NUMBER, 1), Card(Color.GREEN, CardType.NUMBER, 2)]
+        game.deck.cards = [Card(Color.YELLOW, CardType.NUMBER, 3)] * 3
+        game.current_player_index = 1
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            game.play_turn()
+        self.assertTrue(owner.counter.lacks(opponent, Color.RED))
+        self.assertFalse(owner.counter.lacks(opponent, Color.BLUE))
+
+        # Playing a card and drawing another keeps the hand size but may bring the color back
+        opponent.hand.pop()
+        game.draw_for(opponent)
+        self.assertFalse(owner.counter.lacks(opponent, Color.RED))
+
+    def test_prefers_color_the_next_player_lacks(self):
+        game = counting_game()
+        game.reset()
+        owner, opponent = game.players[0], game.players[1]
+        owner.counter.lacking = {opponent: {Color.BLUE}}
+        owner.hand = [Card(Color.RED, CardType.NUMBER, 3), Card(Color.RED, CardType.NUMBER, 4),
+                      Card(Color.BLUE, CardType.NUMBER, 3), Card(Color.GREEN, CardType.NUMBER, 1)]
+        top_card = Card(Color.YELLOW, CardType.NUMBER, 3)
+        self.assertEqual(owner.choose_card(top_card), 2)
+        owner.hand = [Card(Color.RED, CardType.NUMBER, 1), Card(Color.BLUE, CardType.NUMBER, 1)]
+        self.assertEqual(owner.choose_color(), Color.BLUE)
+
+    def test_plays_tournaments(self):
+        tournament = Tournament(["ComputerPlayer", "CountingComputerPlayer"], 200, seed=5)
+        self.assertTrue(tournament.run())
+        self.assertEqual(sum(stats["wins"] for stats in tournament.stats.values()) +
+                         tournament.drawn + tournament.unfinished, 200)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
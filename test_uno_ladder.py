@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from uno_ladder import Ladder, Rating, feed, win_probability, play_league
+
+
+class TestLadder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ladder.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_wins_move_ratings_and_upsets_move_them_more(self):
+        ladder = Ladder(self.path)
+        ladder.record("A", ["B"])
+        a, b = ladder.ratings["A"], ladder.ratings["B"]
+        self.assertGreater(a.mu, 25.0)
+        self.assertLess(b.mu, 25.0)
+        self.assertLess(a.sigma, 25.0 / 3)
+        self.assertGreater(win_probability(a, b), 0.5)
+
+        expected = Rating(30.0, 2.0)
+        upset = Rating(20.0, 2.0)
+        ladder.ratings.update({"Favorit": expected, "Außenseiter": upset})
+        ladder.record("Favorit", ["Außenseiter"])
+        small_gain = expected.mu - 30.0
+        ladder.ratings.update({"Favorit": Rating(30.0, 2.0), "Außenseiter": Rating(20.0, 2.0)})
+        ladder.record("Außenseiter", ["Favorit"])
+        self.assertGreater(ladder.ratings["Außenseiter"].mu - 20.0, 5 * small_gain)
+
+        # Without a winner nothing is learned
+        ladder.record(None, ["A", "B"])
+        self.assertEqual(ladder.ratings["A"].games, 1)
+        ladder.close()
+
+    def test_results_are_written_in_batches(self):
+        ladder = Ladder(self.path, max_batch=10, max_delay=3600)
+        for i in range(25):
+            ladder.record(f"Bot {i % 3}", [f"Bot {(i + 1) % 3}", "Engine"])
+        self.assertEqual(ladder.commits, 2)
+        with sqlite3.connect(self.path) as db:
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM results").fetchone()[0], 20)
+        ladder.close()
+
+        reopened = Ladder(self.path)
+        self.assertEqual(reopened.db.execute("SELECT COUNT(*) FROM results").fetchone()[0], 25)
+        self.assertEqual({name: (r.mu, r.sigma, r.games, r.wins) for name, r in reopened.ratings.items()},
+                         {name: (r.mu, r.sigma, r.games, r.wins) for name, r in ladder.ratings.items()})
+        self.assertEqual(reopened.ratings["Engine"].games, 25)
+        reopened.close()
+
+    def test_quiet_feed_writes_its_batch_in_time(self):
+        ladder = Ladder(self.path, max_batch=1000, max_delay=0.1)
+        more = threading.Event()
+
+        def lines():
+            yield '{"winner": "A", "losers": ["B"]}\n'
+            # The feed stays quiet until the batch had to be written
+            more.wait(5)
+            yield '{"winner": "B", "losers": ["A"]}\n'
+
+        quiet_commits = []
+
+        def check():
+            deadline = time.monotonic() + 5
+            while ladder.commits == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            quiet_commits.append(ladder.commits)
+            more.set()
+
+        checker = threading.Thread(target=check)
+        checker.start()
+        self.assertEqual(feed(ladder, lines()), (2, []))
+        checker.join()
+        self.assertEqual(quiet_commits, [1])
+        ladder.close()
+        with sqlite3.connect(self.path) as db:
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM results").fetchone()[0], 2)
+
+    def test_feed_skips_malformed_lines(self):
+        ladder = Ladder(self.path)
+        lines = ['{"winner": "A", "losers": ["B"]}\n', "kein json\n", '{"winner": 5, "losers": ["B"]}\n',
+                 '{"winner": "A", "losers": "B"}\n', "[1, 2]\n", "\n", '{"winner": "B", "losers": ["A"]}\n']
+        self.assertEqual(feed(ladder, lines), (2, [2, 3, 4, 5]))
+        self.assertEqual((ladder.ratings["A"].games, ladder.ratings["B"].games), (2, 2))
+        ladder.close()
+
+    def test_pairings_prefer_open_games_and_unsettled_ratings(self):
+        ladder = Ladder(self.path)
+        ladder.ratings.update({"Stark": Rating(35.0, 1.0), "Mittel": Rating(25.0, 1.0),
+                               "Mittel 2": Rating(25.5, 1.0), "Schwach": Rating(15.0, 1.0)})
+        self.assertEqual(ladder.pairings(), [("Mittel", "Mittel 2")])
+        pairs = ladder.pairings(count=2)
+        self.assertEqual(len({name for pair in pairs for name in pair}), 4)
+
+        # A newcomer is worth more than two settled equals
+        ladder.add("Neu")
+        self.assertIn("Neu", ladder.pairings()[0])
+        ladder.close()
+
+    def test_league_rates_computer_strategies(self):
+        ladder = Ladder(self.path)
+        played = play_league(ladder, ["Profi", "Anfänger", "ComputerPlayer"], 40, seed=1)
+        self.assertEqual(played, 40)
+        self.assertEqual(set(ladder.ratings), {"Profi", "Anfänger", "ComputerPlayer"})
+        rated = sum(rating.games for rating in ladder.ratings.values()) // 2
+        self.assertEqual(ladder.db.execute("SELECT COUNT(*) FROM results").fetchone()[0], rated)
+        self.assertIn("Profi", ladder.report())
+        with self.assertRaises(ValueError):
+            play_league(ladder, ["Profi"], 10)
+        ladder.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,127 @@
+import asyncio
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from uno_fixed import Game, HouseRules, ComputerPlayer
+from uno_loadgen import run
+from uno_policy import MLPPolicy, PolicyBatcher, PolicyPlayer, decide_moves, np, FEATURES
+from uno_players import create_player, strategy_names
+from uno_server import UnoServer
+from uno_tournament import Tournament
+
+
+def policy_games(policy, count, rules=None):
+    """Games advanced to a turn of their PolicyPlayer"""
+    games = []
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for i in range(count):
+            game = Game(rules)
+            game.players = [PolicyPlayer("Policy", policy), ComputerPlayer("Computer")]
+            game.reset()
+            for _ in range(i % 7):
+                game.play_turn()
+            while game.current_player_index != 0 and not game.is_over():
+                game.play_turn()
+            if not game.is_over():
+                games.append(game)
+    return games
+
+
+@unittest.skipIf(np is None, "NumPy ist nicht installiert")
+class TestPolicy(unittest.TestCase):
+    def test_batch_decides_like_single_calls(self):
+        random.seed(1)
+        policy = MLPPolicy.random((32, 16), seed=2)
+        players = [game.players[0] for game in policy_games(policy, 60)]
+        decide_moves(players)
+        batched = [player.planned_move() for player in players]
+        for player, move in zip(players, batched):
+            decide_moves([player])
+            self.assertEqual(player.planned_move(), move)
+        self.assertTrue(any(index is not None for index, _ in batched))
+
+    def test_plays_only_legal_cards(self):
+        random.seed(3)
+        policy = MLPPolicy.random(seed=4)
+        for rules in (None, HouseRules(stacking=True)):
+            for game in policy_games(policy, 30, rules):
+                player = game.players[0]
+                top_card, declared_color = game.get_top_card(), game.declared_color
+                index = player.choose_card(top_card, declared_color)
+                if index is not None:
+                    self.assertTrue(player.hand[index].can_play_on(top_card, declared_color))
+                elif not game.pending_draw:
+                    self.assertFalse(any(card.can_play_on(top_card, declared_color) for card in player.hand))
+
+    def test_rejects_weights_of_another_shape(self):
+        with self.assertRaises(ValueError):
+            MLPPolicy([(np.zeros((FEATURES + 1, 8)), np.zeros(8)), (np.zeros((8, 58)), np.zeros(58))])
+        with self.assertRaises(ValueError):
+            MLPPolicy([(np.zeros((FEATURES, 8)), np.zeros(8))])
+
+    def test_missing_weights_are_named(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fehlt.npz")
+            PolicyPlayer.weights_path = path
+            try:
+                with self.assertRaisesRegex(ValueError, "fehlt.npz.*--policy"):
+                    create_player("PolicyPlayer", "Policy")
+                self.assertNotIn("PolicyPlayer", strategy_names())
+                MLPPolicy.random(seed=5).save(path)
+                self.assertIn("PolicyPlayer", strategy_names())
+            finally:
+                PolicyPlayer.weights_path = "uno_policy.npz"
+
+    def test_plays_tournaments_from_weights_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "policy.npz")
+            MLPPolicy.random(seed=5).save(path)
+            PolicyPlayer.weights_path = path
+            try:
+                tournament = Tournament(["ComputerPlayer", "PolicyPlayer"], 50, seed=1)
+                self.assertTrue(tournament.run())
+            finally:
+                PolicyPlayer.weights_path = "uno_policy.npz"
+        self.assertEqual(sum(stats["wins"] for stats in tournament.stats.values()) +
+                         tournament.drawn + tournament.unfinished, 50)
+
+
+@unittest.skipIf(np is None, "NumPy ist nicht installiert")
+class TestPolicyBatcher(unittest.TestCase):
+    def test_concurrent_decisions_share_a_forward_pass(self):
+        random.seed(6)
+        policy = MLPPolicy.random(seed=7)
+        players = [game.players[0] for game in policy_games(policy, 200)]
+
+        async def scenario():
+            batcher = PolicyBatcher(max_delay=0.01)
+            await batcher.open()
+            await asyncio.gather(*(batcher.decide(player) for player in players))
+            await batcher.close()
+            return batcher
+
+        batcher = asyncio.run(scenario())
+        self.assertEqual(batcher.decisions, len(players))
+        self.assertLess(batcher.batches, 5)
+        self.assertTrue(all(player.planned_move() is not None for player in players))
+
+    def test_server_tables_use_the_batcher(self):
+        async def scenario():
+            server = UnoServer(move_timeout=5.0, num_computers=2, policy=MLPPolicy.random(seed=8))
+            tcp_server = await server.start("127.0.0.1", 0)
+            port = tcp_server.sockets[0].getsockname()[1]
+            async with tcp_server:
+                stats = await run("127.0.0.1", port, active=20, idle=0, duration=0.5)
+            await server.close()
+            return server, stats
+
+        server, stats = asyncio.run(scenario())
+        self.assertEqual(stats["errors"], 0)
+        self.assertGreater(server.stats()["policy_decisions"], server.stats()["policy_batches"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,106 @@
+import os
+import random
+import unittest
+from contextlib import redirect_stdout
+
+from uno_fixed import Game, ComputerPlayer, Card, Color, CardType
+from uno_search import Expectimax, ExpectimaxPlayer, LOSS, WIN, FACE_COLOR
+from uno_state import FACES, FACE_BY_NAME
+from uno_tournament import Tournament
+
+
+class PlainExpectimax(Expectimax):
+    """The same search without any pruning"""
+
+    def _chance(self, outcomes, alpha, beta, probe=False):
+        return sum(p * outcome(LOSS, WIN, False) for p, outcome in outcomes)
+
+    def _my_turn(self, top, color, depth, alpha, beta, lacking, probe=False):
+        return super()._my_turn(top, color, depth, LOSS - 1, WIN + 1, lacking)
+
+
+def random_position(rng):
+    deck = [face for face in range(len(FACES)) for _ in range(2)]
+    rng.shuffle(deck)
+    hand = deck[:rng.randint(1, 5)]
+    top = rng.randrange(len(FACES) - 2)
+    unseen = [0] * len(FACES)
+    for face in deck[10:70]:
+        unseen[face] += 1
+    return hand, rng.randint(1, 4), top, FACE_COLOR[top], unseen
+
+
+class TestExpectimax(unittest.TestCase):
+    def test_pruning_keeps_the_value(self):
+        rng = random.Random(4)
+        for _ in range(40):
+            position = random_position(rng)
+            plain = PlainExpectimax(3, max_nodes=10 ** 9)
+            pruned = Expectimax(3, max_nodes=10 ** 9)
+            if plain.best_move(*position) is None:
+                self.assertIsNone(pruned.best_move(*position))
+                continue
+            pruned.best_move(*position)
+            self.assertAlmostEqual(pruned.value, plain.value)
+            self.assertLessEqual(pruned.nodes, plain.nodes)
+
+    def test_node_budget_bounds_the_work(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            position = random_position(rng)
+            search = Expectimax(6, max_nodes=200)
+            first = search.best_move(*position)
+            self.assertLess(search.nodes, 400)
+            # Fixed depth and budget: the same position always gets the same answer
+            self.assertEqual(Expectimax(6, max_nodes=200).best_move(*position), first)
+
+    def test_finds_win_with_skip(self):
+        hand = [FACE_BY_NAME["Rot 5"], FACE_BY_NAME["Rot Aussetzen"]]
+        unseen = [2] * len(FACES)
+        top = FACE_BY_NAME["Rot 3"]
+        search = Expectimax(3)
+        self.assertEqual(search.best_move(hand, 1, top, 0, unseen), (FACE_BY_NAME["Rot Aussetzen"], 0))
+        self.assertEqual(search.value, WIN)
+
+    def test_calls_color_of_its_hand(self):
+        hand = [FACE_BY_NAME["Farbwahl"], FACE_BY_NAME["Blau 1"], FACE_BY_NAME["Blau 2"], FACE_BY_NAME["Grün 3"]]
+        unseen = [2] * len(FACES)
+        move = Expectimax(3).best_move(hand, 5, FACE_BY_NAME["Rot 9"], 0, unseen)
+        self.assertEqual(move, (FACE_BY_NAME["Farbwahl"], 1))
+
+
+class TestExpectimaxPlayer(unittest.TestCase):
+    def test_calls_planned_color(self):
+        game = Game()
+        player = ExpectimaxPlayer("Suche")
+        game.players = [player, ComputerPlayer("Computer")]
+        game.reset()
+        player.hand = [Card(Color.WILD, CardType.WILD), Card(Color.BLUE, CardType.NUMBER, 1),
+                       Card(Color.BLUE, CardType.NUMBER, 2), Card(Color.GREEN, CardType.NUMBER, 3)]
+        self.assertEqual(player.choose_card(Card(Color.RED, CardType.NUMBER, 9)), 0)
+        planned = player.planned_color
+        self.assertIn(planned, [Color.RED, Color.BLUE, Color.GREEN, Color.YELLOW])
+        self.assertEqual(player.choose_color(), planned)
+        self.assertIsNone(player.planned_color)
+
+    def test_plays_tournaments(self):
+        tournament = Tournament(["ComputerPlayer", "ExpectimaxPlayer"], 30, seed=2)
+        self.assertTrue(tournament.run())
+        self.assertEqual(sum(stats["wins"] for stats in tournament.stats.values()) +
+                         tournament.drawn + tournament.unfinished, 30)
+
+    def test_plays_with_three_players(self):
+        random.seed(6)
+        game = Game()
+        game.players = [ExpectimaxPlayer("Suche"), ComputerPlayer("Computer 1"), ComputerPlayer("Computer 2")]
+        game.reset()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for _ in range(1000):
+                game.play_turn()
+                if game.is_over():
+                    break
+        self.assertTrue(game.is_over())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
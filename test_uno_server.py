@@ -0,0 +1,165 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from uno_journal import GroupCommitJournal, read_journal
+from uno_server import UnoServer
+from uno_loadgen import run, choose_reply
+
+
+class TestUnoServer(unittest.TestCase):
+    def test_bots_finish_games(self):
+        async def scenario():
+            server = UnoServer(move_timeout=5.0)
+            tcp_server = await server.start("127.0.0.1", 0)
+            port = tcp_server.sockets[0].getsockname()[1]
+            async with tcp_server:
+                stats = await run("127.0.0.1", port, active=5, idle=5, duration=0.3)
+            return server, stats
+
+        server, stats = asyncio.run(scenario())
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["idle_connected"], 5)
+        self.assertGreater(stats["games"], 0)
+        self.assertGreater(server.games_finished, 0)
+
+    def test_silent_client_times_out(self):
+        async def scenario():
+            server = UnoServer(move_timeout=0.01, max_turns=20)
+            tcp_server = await server.start("127.0.0.1", 0)
+            port = tcp_server.sockets[0].getsockname()[1]
+            async with tcp_server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                types = []
+                while True:
+                    message = json.loads(await reader.readline())
+                    types.append(message["type"])
+                    if message["type"] == "end":
+                        break
+                writer.close()
+            return types
+
+        types = asyncio.run(scenario())
+        self.assertEqual(types[0], "welcome")
+        self.assertIn("timeout", types)
+        self.assertEqual(types[-1], "end")
+
+
+async def play_some_turns(port, moves):
+    """Play up to moves decisions at a new table; the table id"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    table_id = None
+    while moves:
+        message = json.loads(await reader.readline())
+        if message["type"] == "welcome":
+            table_id = message["table"]
+        elif message["type"] in ("choose_card", "choose_color"):
+            writer.write((choose_reply(message) + "\n").encode())
+            await writer.drain()
+            moves -= 1
+        elif message["type"] == "end":
+            break
+    writer.close()
+    return table_id
+
+
+def snapshot(game):
+    return ([[str(c) for c in p.hand] for p in game.players],
+            [str(c) for c in game.discard_pile], [str(c) for c in game.deck.cards],
+            game.current_player_index, game.direction, game.declared_color)
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "journal.log")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_group_commit_batches_concurrent_records(self):
+        async def scenario():
+            journal = GroupCommitJournal(self.path, max_delay=0.01)
+            await journal.open()
+            await asyncio.gather(*(journal.append({"table": i, "op": "turn"}) for i in range(200)))
+            await journal.close()
+            return journal
+
+        journal = asyncio.run(scenario())
+        self.assertEqual(journal.records, 200)
+        self.assertLess(journal.commits, 5)
+
+        # A torn record at the end (crash during write) is ignored
+        with open(self.path, "ab") as f:
+            f.write(b'{"table": 999, "op"')
+        self.assertEqual(len(list(read_journal(self.path))), 200)
+
+    def test_restart_rebuilds_games_in_progress(self):
+        async def scenario():
+            server = UnoServer(journal_path=self.path)
+            tcp_server = await server.start("127.0.0.1", 0)
+            port = tcp_server.sockets[0].getsockname()[1]
+            table_id = await play_some_turns(port, 3)
+            while table_id not in server.suspended:
+                await asyncio.sleep(0.01)
+            before = snapshot(server.suspended[table_id].game)
+            tcp_server.close()
+            await server.close()
+
+            restarted = UnoServer(journal_path=self.path)
+            tcp_server = await restarted.start("127.0.0.1", 0)
+            after = snapshot(restarted.suspended[table_id].game)
+
+            # The client can pick the game up again on a new connection
+            port = tcp_server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            welcomes = []
+            while True:
+                message = json.loads(await reader.readline())
+                if message["type"] == "welcome":
+                    welcomes.append(message["table"])
+                if message["type"] == "choose_card" and len(welcomes) == 1:
+                    writer.write(f"resume {table_id}\n".encode())
+                    await writer.drain()
+                    break
+            message = json.loads(await reader.readline())
+            writer.close()
+            tcp_server.close()
+            await restarted.close()
+            return before, after, message
+
+        before, after, message = asyncio.run(scenario())
+        self.assertEqual(before, after)
+        self.assertEqual(message["type"], "welcome")
+
+    def test_restart_rebuilds_game_from_the_pool(self):
+        async def scenario():
+            server = UnoServer(journal_path=self.path)
+            tcp_server = await server.start("127.0.0.1", 0)
+            port = tcp_server.sockets[0].getsockname()[1]
+            # A finished game goes back to the pool and deals the next table
+            await play_some_turns(port, 10 ** 6)
+            while not server.pool.free:
+                await asyncio.sleep(0.01)
+            table_id = await play_some_turns(port, 3)
+            while table_id not in server.suspended:
+                await asyncio.sleep(0.01)
+            before = snapshot(server.suspended[table_id].game)
+            tcp_server.close()
+            await server.close()
+
+            restarted = UnoServer(journal_path=self.path)
+            tcp_server = await restarted.start("127.0.0.1", 0)
+            after = snapshot(restarted.suspended[table_id].game)
+            tcp_server.close()
+            await restarted.close()
+            return before, after
+
+        before, after = asyncio.run(scenario())
+        self.assertEqual(before, after)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
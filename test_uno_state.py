@@ -0,0 +1,180 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from uno_fixed import Game, HouseRules, HumanPlayer, ComputerPlayer, Color
+from uno_state import save_binary, load_binary, save_json, load_json, save_game, load_game
+from uno_players import STRATEGIES, create_player, register_strategy, strategy_names
+from test_uno_fixed import new_computer_game, play_out
+
+
+def snapshot(game):
+    return ([(type(p).__name__, p.name, [str(c) for c in p.hand], p.has_called_uno,
+              p.just_played_second_to_last) for p in game.players],
+            [str(c) for c in game.discard_pile], [str(c) for c in game.deck.cards],
+            game.current_player_index, game.direction, game.declared_color)
+
+
+class TestGameState(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+        self.game = new_computer_game(3)
+        self.game.reset()
+        play_out(self.game, max_turns=25)
+        self.game.direction = -1
+        self.game.declared_color = Color.GREEN
+        self.game.players[1].has_called_uno = True
+
+    def test_binary_round_trip(self):
+        data = save_binary(self.game)
+        loaded = load_binary(data)
+        self.assertEqual(snapshot(loaded), snapshot(self.game))
+        self.assertEqual(save_binary(loaded), data)
+        self.assertEqual([p.hand_points for p in loaded.players], [p.hand_points for p in self.game.players])
+        self.assertLess(len(data), 300)
+
+    def test_json_round_trip(self):
+        text = save_json(self.game)
+        self.assertIn('"Grün"', text)
+        self.assertEqual(snapshot(load_json(text)), snapshot(self.game))
+
+    def test_loaded_game_resets_to_full_deck(self):
+        game = new_computer_game(3)
+        game.reset()
+        for player in game.players:
+            for _ in range(5):
+                player.draw_card(game.deck)
+        loaded = load_binary(save_binary(game))
+        loaded.reset()
+        self.assertEqual(len(loaded.deck.cards) + len(loaded.discard_pile) +
+                         sum(len(p.hand) for p in loaded.players), 108)
+
+    def test_load_into_existing_game_reuses_players(self):
+        target = new_computer_game(3)
+        players = list(target.players)
+        loaded = load_binary(save_binary(self.game), target)
+        self.assertIs(loaded, target)
+        self.assertEqual([id(p) for p in loaded.players], [id(p) for p in players])
+        self.assertEqual(snapshot(loaded), snapshot(self.game))
+
+    def test_pending_penalty_and_house_rules_are_kept(self):
+        game = new_computer_game(2, HouseRules(stacking=True, jump_in=True))
+        game.reset()
+        game.pending_draw = 6
+        for loaded in (load_binary(save_binary(game)), load_json(save_json(game)),
+                       load_binary(save_binary(game), new_computer_game(2))):
+            self.assertEqual(loaded.pending_draw, 6)
+            self.assertEqual(loaded.rules.names(), ["stacking", "jump_in"])
+            self.assertEqual(loaded.take_turn, loaded._take_turn_stacking)
+
+    def test_long_names_are_rejected_cleanly(self):
+        self.game.players[0].name = "x" * 70000
+        with self.assertRaises(ValueError):
+            save_binary(self.game)
+        self.game.players[0].name = "Ö" * 300
+        self.assertEqual(load_binary(save_binary(self.game)).players[0].name, "Ö" * 300)
+
+    def test_rejects_damaged_data(self):
+        data = save_binary(self.game)
+        with self.assertRaises(ValueError):
+            load_binary(b"XXXX" + data[4:])
+        with self.assertRaises(ValueError):
+            load_binary(data[:-3])
+        with self.assertRaises(ValueError):
+            load_json('{"version": 3, "deck": ["Rot 99"]}')
+
+    def test_rejects_malformed_states(self):
+        saved = save_json(self.game)
+
+        def changed(change):
+            state = json.loads(saved)
+            change(state)
+            return json.dumps(state)
+
+        cases = {
+            "rules missing": changed(lambda state: state.pop("rules")),
+            "index not a number": changed(lambda state: state.update(current_player_index="x")),
+            "index out of range": changed(lambda state: state.update(current_player_index=3)),
+            "rules not a list": changed(lambda state: state.update(rules=5)),
+            "empty discard pile": changed(lambda state: state.update(discard_pile=[])),
+            "too many players": changed(lambda state: state.update(players=state["players"] * 100)),
+            "one player": changed(lambda state: state.update(players=state["players"][:1],
+                                                             current_player_index=0)),
+            "players not a list": changed(lambda state: state.update(players=5)),
+            "hand not a list": changed(lambda state: state["players"][0].update(hand="Rot 5")),
+            "not an object": "[]",
+        }
+        for case, text in cases.items():
+            with self.subTest(case), self.assertRaises(ValueError):
+                load_json(text)
+
+        # The binary header holds any index up to 255
+        data = bytearray(save_binary(self.game))
+        data[6] = 200
+        with self.assertRaises(ValueError):
+            load_binary(bytes(data))
+
+    def test_rejects_unknown_player_type(self):
+        text = save_json(self.game).replace("ComputerPlayer", "os.system")
+        with self.assertRaises(ValueError):
+            load_json(text)
+
+    def test_strategies_keep_their_parameters(self):
+        game = Game()
+        game.players = [HumanPlayer("Spieler"), create_player("Anfänger:wild_threshold=2", "Computer")]
+        game.reset()
+        for loaded in (load_binary(save_binary(game)), load_json(save_json(game))):
+            self.assertEqual(loaded.players[1].params(), game.players[1].params())
+        # A target game with other parameters gets new players
+        target = new_computer_game(2)
+        self.assertEqual(load_binary(save_binary(game), target).players[1].color_rule, "random")
+
+    def test_file_format_follows_extension(self):
+        game = Game()
+        game.players = [HumanPlayer("Spieler"), ComputerPlayer("Computer")]
+        game.reset()
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("spiel.bin", "spiel.json"):
+                path = os.path.join(tmp, name)
+                save_game(game, path)
+                self.assertEqual(snapshot(load_game(path)), snapshot(game))
+            with open(os.path.join(tmp, "spiel.json"), encoding="utf-8") as f:
+                self.assertTrue(f.read().startswith("{"))
+
+
+
+class TestStrategies(unittest.TestCase):
+    def tearDown(self):
+        STRATEGIES.pop("Test", None)
+
+    def test_creates_types_and_named_strategies(self):
+        self.assertIsInstance(create_player("HumanPlayer", "Spieler"), HumanPlayer)
+        beginner = create_player("Anfänger", "Computer")
+        self.assertIsInstance(beginner, ComputerPlayer)
+        self.assertEqual(beginner.name, "Computer")
+        self.assertEqual(beginner.color_rule, "random")
+        self.assertIn("Profi", strategy_names())
+
+    def test_parameters_after_the_name(self):
+        player = create_player("Anfänger:wild_threshold=2,actions_first=ja,forget_uno=0.5", "Computer")
+        self.assertEqual(player.params(), {**ComputerPlayer.PARAMS, "wild_threshold": 2, "actions_first": True,
+                                           "forget_uno": 0.5, "color_rule": "random"})
+
+    def test_registered_strategy(self):
+        register_strategy("Test", color_rule="points", endgame_cards=0)
+        self.assertEqual(create_player("Test", "Computer").color_rule, "points")
+        self.assertEqual(create_player("Test:color_rule=majority", "Computer").color_rule, "majority")
+
+    def test_rejects_unknown_names_and_parameters(self):
+        for spec in ("os.system", "ComputerPlayer:wild_limit=2", "ComputerPlayer:actions_first=vielleicht",
+                     "ComputerPlayer:wild_threshold=drei", "HumanPlayer:forget_uno=0"):
+            with self.assertRaises(ValueError):
+                create_player(spec, "Computer")
+        with self.assertRaises(ValueError):
+            register_strategy("Test", "ComputerPlayer", wild_limit=2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
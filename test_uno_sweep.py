@@ -0,0 +1,80 @@
+import unittest
+
+from uno_sweep import parse_space, grid, random_configs, config_spec, wilson_interval, run_sweep, race
+
+
+class TestSweep(unittest.TestCase):
+    def test_grid_covers_all_combinations(self):
+        space = parse_space(["wild_threshold=0,2,3", "color_rule=majority,points"])
+        configs = grid(space)
+        self.assertEqual(len(configs), 6)
+        self.assertIn({"wild_threshold": "2", "color_rule": "points"}, configs)
+        with self.assertRaises(ValueError):
+            grid(parse_space(["forget_uno=0..0.3"]))
+        with self.assertRaises(ValueError):
+            parse_space(["wild_threshold"])
+
+    def test_random_search_stays_in_its_ranges(self):
+        space = parse_space(["forget_uno=0..0.3", "wild_threshold=1..4", "actions_first=true,false"])
+        configs = random_configs(space, 20, seed=2)
+        self.assertEqual(len(configs), 20)
+        self.assertEqual(configs, random_configs(space, 20, seed=2))
+        for config in configs:
+            self.assertTrue(0 <= config["forget_uno"] <= 0.3)
+            self.assertIn(config["wild_threshold"], range(1, 5))
+        # A small space runs out of distinct configurations
+        self.assertEqual(len(random_configs(parse_space(["actions_first=true,false"]), 5)), 2)
+
+    def test_wilson_interval(self):
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, places=3)
+        self.assertAlmostEqual(high, 0.5962, places=3)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+        self.assertEqual(wilson_interval(0, 10)[0], 0.0)
+
+    def test_sweep_is_ranked_and_reproducible(self):
+        configs = [{"forget_uno": 1.0}, {"wild_threshold": 2}, {}]
+        results = run_sweep(configs, games=40, chunk=15, workers=1, seed=3)
+        self.assertEqual([result["games"] for result in results], [40] * 3)
+        self.assertEqual(sorted(results, key=lambda result: -result["win_rate"]), results)
+        for result in results:
+            self.assertLessEqual(result["low"], result["win_rate"])
+            self.assertLessEqual(result["win_rate"], result["high"])
+        self.assertEqual(config_spec("ComputerPlayer", {}), "ComputerPlayer")
+
+        # Chunking and worker processes do not change the games played
+        parallel = run_sweep(configs, games=40, chunk=40, workers=2, seed=3)
+        self.assertEqual([(r["spec"], r["wins"], r["turns"]) for r in parallel],
+                         [(r["spec"], r["wins"], r["turns"]) for r in results])
+
+    def test_sweep_reports_paired_difference(self):
+        results = run_sweep([{}, {"forget_uno": 1.0}], games=60, workers=1, seed=4)
+        by_spec = {result["spec"]: result for result in results}
+        # Against itself every deal is a draw
+        self.assertEqual(by_spec["ComputerPlayer"]["paired"]["difference"], 0.0)
+        forgetful = by_spec["ComputerPlayer:forget_uno=1.0"]
+        self.assertAlmostEqual(forgetful["paired"]["difference"], 2 * forgetful["win_rate"] - 1)
+
+    def test_race_drops_clearly_worse_configurations_early(self):
+        configs = [{"color_rule": "random"}, {}, {"forget_uno": 0.5}, {"forget_uno": 1.0}]
+        results = race(configs, games=800, first_round=100, workers=1, seed=1)
+        self.assertEqual(results[0]["spec"], "ComputerPlayer")
+        self.assertIsNone(results[0]["dropped"])
+        for result in results[1:]:
+            self.assertIsNotNone(result["dropped"])
+            self.assertEqual(result["games"], result["dropped"])
+        # Decided with a single configuration left, long before the budget
+        self.assertLess(results[0]["games"], 800)
+        self.assertEqual(race(configs, games=800, first_round=100, workers=1, seed=1), results)
+        with self.assertRaises(ValueError):
+            race(configs, first_round=99, workers=1)
+
+    def test_unknown_parameter_fails_before_playing(self):
+        with self.assertRaises(ValueError):
+            run_sweep([{"wild_limit": 2}], games=10, workers=1)
+        with self.assertRaises(ValueError):
+            run_sweep([{}], games=11, workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
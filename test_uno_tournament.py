@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import unittest
+
+from uno_tournament import Tournament
+
+
+class Crash(Exception):
+    pass
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "turnier.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def new_tournament(self, **kwargs):
+        return Tournament(["ComputerPlayer"] * 3, 30, seed=5, checkpoint_path=self.path,
+                          checkpoint_every=5, max_turns=300, **kwargs)
+
+    def test_resume_after_crash_matches_uninterrupted_run(self):
+        self.check_resume_after_crash()
+
+    def test_paired_resume_in_the_middle_of_a_deal(self):
+        # The checkpoint after game 10 falls between the rotations of deal 3
+        self.check_resume_after_crash(paired=True)
+
+    def check_resume_after_crash(self, **kwargs):
+        reference = Tournament(["ComputerPlayer"] * 3, 30, seed=5, max_turns=300, **kwargs)
+        self.assertTrue(reference.run())
+
+        crashing = self.new_tournament(**kwargs)
+        play_game = crashing.play_game
+
+        def crash_at_game_13(index):
+            if index == 13:
+                raise Crash()
+            return play_game(index)
+
+        crashing.play_game = crash_at_game_13
+        with self.assertRaises(Crash):
+            crashing.run()
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["completed"], 10)
+
+        resumed = self.new_tournament(**kwargs)
+        self.assertTrue(resumed.load_checkpoint())
+        self.assertTrue(resumed.run())
+        self.assertEqual(resumed.completed, 30)
+        self.assertEqual(resumed.stats, reference.stats)
+        self.assertEqual(resumed.pairs, reference.pairs)
+        self.assertEqual(resumed.turns, reference.turns)
+
+    def test_stop_request_checkpoints_and_finished_run_is_not_replayed(self):
+        tournament = self.new_tournament()
+        tournament.stop_requested = True
+        self.assertFalse(tournament.run())
+
+        finished = self.new_tournament()
+        finished.load_checkpoint()
+        finished.run()
+        again = self.new_tournament()
+        again.load_checkpoint()
+        again.play_game = None  # would fail if any game were replayed
+        self.assertTrue(again.run())
+        self.assertEqual(again.stats, finished.stats)
+
+    def test_checkpoint_of_other_tournament_is_rejected(self):
+        self.new_tournament().run()
+        other = Tournament(["ComputerPlayer"] * 2, 30, seed=5, checkpoint_path=self.path)
+        with self.assertRaises(ValueError):
+            other.load_checkpoint()
+
+    def test_entrants_can_be_strategies_with_parameters(self):
+        tournament = Tournament(["Anfänger", "ComputerPlayer:forget_uno=0"], 20, seed=5)
+        self.assertTrue(tournament.run())
+        self.assertEqual(tournament.players[1].forget_uno, 0.0)
+        with self.assertRaises(ValueError):
+            Tournament(["ComputerPlayer", "Unbekannt"], 20)
+
+    def test_paired_games_cancel_the_luck_of_the_deal(self):
+        # The same strategy in both seats of every deal, with the same shuffles, wins each deal once
+        mirror = Tournament(["ComputerPlayer"] * 2, 40, seed=2, paired=True)
+        self.assertTrue(mirror.run())
+        self.assertEqual(mirror.pairs["deal_sum_sq"], 0)
+        self.assertEqual(mirror.paired_difference()["difference"], 0.0)
+        self.assertIsNone(mirror.paired_difference()["reduction"])
+
+        paired = Tournament(["Profi", "Anfänger"], 200, seed=2, paired=True)
+        self.assertTrue(paired.run())
+        result = paired.paired_difference()
+        self.assertEqual(paired.pairs["deals"], 100)
+        self.assertGreater(result["difference"] - result["half_width"], 0)
+        self.assertIn("Gepaart über 100 Verteilungen", paired.report())
+        with self.assertRaises(ValueError):
+            Tournament(["Profi", "Anfänger"], 201, paired=True)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
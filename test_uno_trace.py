@@ -0,0 +1,45 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from uno_trace import ChromeTracer, run_games
+
+
+class TestChromeTrace(unittest.TestCase):
+    def test_trace_contains_nested_spans(self):
+        tracer = ChromeTracer()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            traced = run_games(1, seed=42, sample_rate=1.0, tracer=tracer, max_turns=50)
+
+        self.assertEqual(traced, 1)
+        names = {e["name"] for e in tracer.events if e["ph"] == "X"}
+        self.assertIn("play_turn", names)
+        self.assertIn("choose_card", names)
+        self.assertIn("draw_card", names)
+
+        turns = [e for e in tracer.events if e["name"] == "play_turn"]
+        decisions = [e for e in tracer.events if e["name"] == "choose_card"]
+        # Every decision lies inside the span of its turn
+        for decision in decisions:
+            self.assertTrue(any(t["ts"] <= decision["ts"] and
+                                decision["ts"] + decision["dur"] <= t["ts"] + t["dur"]
+                                for t in turns))
+
+    def test_sampling_and_output_format(self):
+        tracer = ChromeTracer()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            traced = run_games(5, seed=1, sample_rate=0.0, tracer=tracer, max_turns=20)
+        self.assertEqual(traced, 0)
+        self.assertEqual(tracer.events, [])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            tracer.write(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["traceEvents"], [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
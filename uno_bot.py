@@ -0,0 +1,419 @@
+"""
+Line protocol that lets an external program play UNO against ComputerPlayer,
+similar to UCI for chess engines. The engine starts the bot as a child
+process and talks to it over stdin/stdout (UTF-8, one message per line).
+
+  engine -> bot
+      uno 1                 handshake; the bot answers "ok <name>"
+      batch <n>             followed by n turn lines, then the bot answers
+      turn <json>           {"id", "top", "declared", "hand", "playable", "opponents"}
+      quit
+  bot -> engine
+      ok <name>
+      <id> draw
+      <id> play <index> [uno] [color <Rot|Blau|Grün|Gelb>]
+
+A batch holds one decision for every game in which it is the bot's turn,
+so many concurrent games cost one pipe round-trip per step instead of one
+per move. Answers may come in any order. An invalid answer counts as an
+error and the bot draws instead. A bot that does not complete its
+handshake or a batch within the timeout (--timeout) is killed and the
+match ends with an error.
+
+A bot takes a seat as a BotPlayer, a registered player type, so it plays
+in any Game, tournament, sweep or ladder ("BotPlayer:command=./mein_bot").
+Like PolicyPlayer it can be told its move before the engine asks:
+decide_bot_moves sends the turns of many seats as one batch, and a seat
+asked without a prepared answer sends a batch of one. All seats with the
+same command share one bot process.
+
+Run "python uno_bot.py --serve" for a reference bot and
+"python uno_bot.py -- <command>" to pit any bot against ComputerPlayer.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import queue
+import random
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional, Tuple
+
+from uno_fixed import Game, Card, Color, Player, ComputerPlayer
+from uno_loadgen import choose_reply
+from uno_players import register_player_type
+from uno_server import COLOR_NAMES, turn_seed
+
+PROTOCOL_VERSION = 1
+
+
+class BotError(Exception):
+    pass
+
+
+class BotProcess:
+    def __init__(self, command: List[str], timeout: float = 10.0):
+        """timeout: seconds for the handshake and for each whole batch"""
+        self.command = command
+        self.timeout = timeout
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        encoding="utf-8", bufsize=1)
+        self.name = None
+        self.round_trips = 0
+        # Pipes cannot be read with a timeout, so a thread reads and the caller waits on the queue
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(target=self._read_lines, daemon=True).start()
+
+    def _read_lines(self):
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _send(self, lines: List[str]):
+        try:
+            self.process.stdin.write("".join(line + "\n" for line in lines))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as error:
+            raise BotError(f"Bot nicht erreichbar: {error}")
+
+    def _read(self, deadline: float) -> str:
+        try:
+            line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            self.process.kill()
+            raise BotError(f"Bot hat nicht innerhalb von {self.timeout:g} s geantwortet")
+        if line is None:
+            raise BotError("Bot hat die Verbindung beendet")
+        return line.strip()
+
+    def handshake(self) -> str:
+        self._send([f"uno {PROTOCOL_VERSION}"])
+        parts = self._read(time.monotonic() + self.timeout).split(maxsplit=1)
+        if not parts or parts[0] != "ok":
+            raise BotError(f"Unerwartete Antwort auf den Handshake: {' '.join(parts)}")
+        self.name = parts[1] if len(parts) > 1 else " ".join(self.command)
+        return self.name
+
+    def decide(self, requests: List[Dict]) -> Dict[int, str]:
+        """Send all requests in one batch and return the command for every id"""
+        self._send([f"batch {len(requests)}"] +
+                   [f"turn {json.dumps(request, ensure_ascii=False)}" for request in requests])
+        self.round_trips += 1
+        deadline = time.monotonic() + self.timeout
+        answers = {}
+        for _ in requests:
+            parts = self._read(deadline).split(maxsplit=1)
+            if len(parts) == 2 and parts[0].isdigit():
+                answers[int(parts[0])] = parts[1]
+        return answers
+
+    def close(self):
+        try:
+            self._send(["quit"])
+        except BotError:
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def turn_request(request_id: int, game: Game, seat: Player) -> Dict:
+    top_card = game.get_top_card()
+    position = game.players.index(seat)
+    return {
+        "id": request_id,
+        "top": str(top_card),
+        "declared": game.declared_color.value if game.declared_color else None,
+        "hand": [str(card) for card in seat.hand],
+        "playable": [i for i, card in enumerate(seat.hand)
+                     if card.can_play_on(top_card, game.declared_color)],
+        # In seat order, starting after the bot
+        "opponents": [len(player.hand) for player in game.players[position + 1:] + game.players[:position]],
+    }
+
+
+def parse_move(command: str, playable: List[int]) -> Optional[Tuple[Optional[int], Optional[Color], bool]]:
+    """(card, color, uno) for a valid command, None otherwise; draw is card None"""
+    parts = command.split()
+    if parts == ["draw"]:
+        return None, None, False
+    if len(parts) < 2 or parts[0] != "play" or not parts[1].isdigit() or int(parts[1]) not in playable:
+        return None
+    rest = parts[2:]
+    uno = rest[:1] == ["uno"]
+    if uno:
+        rest = rest[1:]
+    color = None
+    if rest:
+        if len(rest) != 2 or rest[0] != "color" or rest[1].lower() not in COLOR_NAMES:
+            return None
+        color = COLOR_NAMES[rest[1].lower()]
+    return int(parts[1]), color, uno
+
+
+_bots: Dict[Tuple[str, float], BotProcess] = {}
+
+
+def bot_process(command: str, timeout: float = 10.0) -> BotProcess:
+    """The running bot for command, started and greeted once and shared by all its seats"""
+    key = (command, timeout)
+    bot = _bots.get(key)
+    if bot is None or bot.process.poll() is not None:
+        bot = BotProcess(shlex.split(command), timeout)
+        try:
+            bot.handshake()
+        except BotError:
+            bot.close()
+            raise
+        _bots[key] = bot
+    return bot
+
+
+@atexit.register
+def close_bots():
+    for bot in _bots.values():
+        bot.close()
+    _bots.clear()
+
+
+@register_player_type
+class BotPlayer(Player):
+    """
+    A seat played by an external bot. Its card, color and UNO call come
+    from one answer of the bot, asked for by decide_bot_moves.
+    """
+
+    PARAMS = {
+        "command": "",      # start command of the bot, split like a shell command line
+        "timeout": 10.0,    # seconds for the handshake and for each batch
+    }
+
+    @classmethod
+    def available(cls) -> bool:
+        # Needs the command of a bot
+        return False
+
+    def __init__(self, name: str, command: str = "", timeout: float = 10.0, bot: Optional[BotProcess] = None):
+        super().__init__(name)
+        if bot is None and not command:
+            raise ValueError("BotPlayer braucht den Startbefehl des Bots, z.B. BotPlayer:command=./mein_bot")
+        self.command = command
+        self.timeout = timeout
+        self.bot = bot or bot_process(command, timeout)
+        self.game: Optional[Game] = None
+        self.errors = 0
+        # (top card, declared color, hand index, color, uno) answered for that position
+        self.prepared: Optional[Tuple[Card, Optional[Color], Optional[int], Optional[Color], bool]] = None
+        self.pending_color: Optional[Color] = None
+        self.pending_uno = False
+
+    def params(self) -> Dict:
+        return {"command": self.command, "timeout": self.timeout}
+
+    def start_round(self, game: Game):
+        self.game = game
+
+    def choose_card(self, top_card: Card, declared_color: Optional[Color] = None) -> Optional[int]:
+        prepared = self.prepared
+        if prepared is None or prepared[0] is not top_card or prepared[1] != declared_color:
+            decide_bot_moves([self])
+            prepared = self.prepared
+        self.prepared = None
+        _, _, index, self.pending_color, self.pending_uno = prepared
+        return index
+
+    def choose_color(self) -> Color:
+        if self.pending_color is not None:
+            color, self.pending_color = self.pending_color, None
+            return color
+        # A drawn wild is played without another round-trip: use the majority color
+        return ComputerPlayer.majority_color(self)
+
+    def choose_play_drawn(self, card: Card) -> bool:
+        return True
+
+    def wants_uno_call(self) -> bool:
+        called, self.pending_uno = self.pending_uno, False
+        return called
+
+    def reset(self):
+        super().reset()
+        self.prepared = None
+        self.pending_color = None
+        self.pending_uno = False
+
+
+def decide_bot_moves(players: List[BotPlayer]) -> int:
+    """
+    Ask the bots for the current turn of every player, one batch per bot,
+    and leave each answer in its player. Returns the number of invalid
+    answers; those players draw.
+    """
+    by_bot: Dict[BotProcess, List[BotPlayer]] = {}
+    for player in players:
+        by_bot.setdefault(player.bot, []).append(player)
+    errors = 0
+    for bot, seats in by_bot.items():
+        requests = [turn_request(request_id, player.game, player) for request_id, player in enumerate(seats)]
+        answers = bot.decide(requests)
+        for request_id, player in enumerate(seats):
+            move = parse_move(answers.get(request_id, ""), requests[request_id]["playable"])
+            if move is None:
+                errors += 1
+                player.errors += 1
+                move = None, None, False
+            game = player.game
+            player.prepared = (game.get_top_card(), game.declared_color, *move)
+    return errors
+
+
+class BotMatch:
+    """
+    Plays num_games games of the bot (first seat) against ComputerPlayers,
+    concurrency games at a time, with the turns of all games that wait for
+    the bot in one batch. Every turn is reseeded from (game seed, turn) like
+    on the server, so results do not depend on the batching.
+    """
+
+    def __init__(self, bot: BotProcess, num_games: int, concurrency: int = 64, seed: int = 0,
+                 num_computers: int = 1, max_turns: int = 1000):
+        self.bot = bot
+        self.num_games = num_games
+        self.concurrency = concurrency
+        self.seed = seed
+        self.num_computers = num_computers
+        self.max_turns = max_turns
+        self.stats = {"games": 0, "bot_wins": 0, "computer_wins": 0, "drawn": 0, "unfinished": 0,
+                      "turns": 0, "decisions": 0, "errors": 0}
+
+    def start_game(self, index: int) -> Dict:
+        game = Game()
+        game.players = [BotPlayer(self.bot.name or "Bot", bot=self.bot)] + [
+            ComputerPlayer(f"Computer {i + 1}") for i in range(self.num_computers)]
+        game_seed = turn_seed(self.seed, index)
+        random.seed(game_seed)
+        game.reset()
+        # Rotate the starting seat so the bot does not always move first
+        game.current_player_index = index % len(game.players)
+        return {"game": game, "seed": game_seed, "turn": 0}
+
+    def finish_game(self, table: Dict):
+        game = table["game"]
+        winner = game.check_winner()
+        self.stats["games"] += 1
+        self.stats["turns"] += table["turn"]
+        if game.drawn:
+            self.stats["drawn"] += 1
+        elif winner is None:
+            self.stats["unfinished"] += 1
+        elif isinstance(winner, BotPlayer):
+            self.stats["bot_wins"] += 1
+        else:
+            self.stats["computer_wins"] += 1
+
+    def run(self) -> Dict:
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            return self._run()
+
+    def _run(self) -> Dict:
+        started = time.monotonic()
+        next_index = 0
+        tables: List[Dict] = []
+
+        while tables or next_index < self.num_games:
+            while len(tables) < self.concurrency and next_index < self.num_games:
+                tables.append(self.start_game(next_index))
+                next_index += 1
+
+            # One batch for every game that waits for the bot
+            waiting = [player for player in (table["game"].players[table["game"].current_player_index]
+                                             for table in tables) if isinstance(player, BotPlayer)]
+            if waiting:
+                self.stats["decisions"] += len(waiting)
+                self.stats["errors"] += decide_bot_moves(waiting)
+
+            still_running = []
+            for table in tables:
+                game = table["game"]
+                random.seed(turn_seed(table["seed"], table["turn"]))
+                game.play_turn()
+                table["turn"] += 1
+                if game.is_over() or table["turn"] >= self.max_turns:
+                    self.finish_game(table)
+                else:
+                    still_running.append(table)
+            tables = still_running
+
+        elapsed = time.monotonic() - started
+        self.stats["round_trips"] = self.bot.round_trips
+        self.stats["games_per_second"] = round(self.stats["games"] / elapsed, 1) if elapsed else 0.0
+        return self.stats
+
+
+def serve(input_stream=sys.stdin, output_stream=sys.stdout, name: str = "Referenzbot"):
+    """Reference bot: plays the first playable card, like the load generator"""
+    pending: List[str] = []
+    expected = 0
+    for line in input_stream:
+        command, _, payload = line.strip().partition(" ")
+        if command == "uno":
+            output_stream.write(f"ok {name}\n")
+            output_stream.flush()
+        elif command == "batch":
+            expected = int(payload)
+        elif command == "turn":
+            request = json.loads(payload)
+            reply = choose_reply({"type": "choose_card", **request})
+            if reply.startswith("play"):
+                if request["hand"][request["playable"][0]] in ("Farbwahl", "Plus 4"):
+                    reply += " " + choose_reply({"type": "choose_color", "hand": request["hand"]})
+            pending.append(f"{request['id']} {reply}")
+            if len(pending) == expected:
+                output_stream.write("".join(answer + "\n" for answer in pending))
+                output_stream.flush()
+                pending = []
+        elif command == "quit":
+            break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Externen UNO-Bot gegen ComputerPlayer spielen lassen")
+    parser.add_argument("--serve", action="store_true", help="als Referenzbot über stdin/stdout spielen")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64, help="gleichzeitig laufende Spiele")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--computers", type=int, default=1)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="Sekunden für den Handshake und jeden Stapel von Zügen")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="Startbefehl des Bots")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve()
+        return
+
+    command = [part for part in args.command if part != "--"] or [sys.executable, __file__, "--serve"]
+    bot = BotProcess(command, args.timeout)
+    try:
+        print(f"Bot: {bot.handshake()}")
+        stats = BotMatch(bot, args.games, args.concurrency, args.seed,
+                         args.computers, args.max_turns).run()
+    except BotError as error:
+        sys.exit(f"Abbruch: {error}")
+    finally:
+        bot.close()
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
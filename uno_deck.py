@@ -0,0 +1,136 @@
+"""
+Draw pile for big tables with several combined decks.
+
+CountedDeck keeps the undrawn cards grouped by their 54 distinct faces and
+the number of cards per face in a Fenwick tree. Drawing picks a uniformly
+random card in O(log 54) without ever shuffling, and refilling from the
+discard pile is a counts update. Every card is as likely to be drawn as
+from a shuffled Deck, but a seed deals different cards than with Deck.
+"""
+
+import random
+from typing import Dict, List, Optional
+
+from uno_fixed import Card, Deck
+from uno_state import FACES, face_of
+
+
+class FenwickTree:
+    """Counts with O(log n) point updates and prefix-sum search"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.total = 0
+        self._top_step = 1 << (size.bit_length() - 1)
+
+    def rebuild(self, counts: List[int]):
+        """Replace all counts in O(n)"""
+        self.tree = [0] + list(counts)
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+        self.total = sum(counts)
+
+    def add(self, index: int, delta: int):
+        self.total += delta
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, target: int) -> int:
+        """Smallest index whose prefix sum exceeds target (0 <= target < total)"""
+        position = 0
+        step = self._top_step
+        while step:
+            upper = position + step
+            if upper <= self.size and self.tree[upper] <= target:
+                position = upper
+                target -= self.tree[upper]
+            step >>= 1
+        return position
+
+    def take(self, target: int) -> int:
+        """find(target) and decrement that count in the same descent"""
+        tree = self.tree
+        position = 0
+        step = self._top_step
+        while step:
+            upper = position + step
+            if upper <= self.size:
+                if tree[upper] <= target:
+                    position = upper
+                    target -= tree[upper]
+                else:
+                    # This node's range holds the result, so its sum loses one
+                    tree[upper] -= 1
+            step >>= 1
+        self.total -= 1
+        return position
+
+
+class CountedDeck(Deck):
+    def __init__(self, num_decks: int = 1):
+        self.num_decks = num_decks
+        self.rng = random
+        self.all_cards = self.new_cards(num_decks)
+        self.by_face: List[List[Card]] = [[] for _ in FACES]
+        self.counts = FenwickTree(len(FACES))
+        self._faces: Dict[Card, int] = {}
+        self._initial: List[List[Card]] = []
+        self._initial_for: Optional[List[Card]] = None
+        self.reset()
+
+    def _face(self, card: Card) -> int:
+        face = self._faces.get(card)
+        if face is None:
+            face = self._faces[card] = face_of(card)
+        return face
+
+    @property
+    def cards(self) -> List[Card]:
+        """The draw pile grouped by face; there is no meaningful order"""
+        return [card for pile in self.by_face for card in pile]
+
+    @cards.setter
+    def cards(self, cards: List[Card]):
+        for pile in self.by_face:
+            pile.clear()
+        for card in cards:
+            self.by_face[self._face(card)].append(card)
+        self.counts.rebuild([len(pile) for pile in self.by_face])
+
+    def shuffle(self):
+        # Every draw is already uniformly random
+        pass
+
+    def draw(self) -> Optional[Card]:
+        total = self.counts.total
+        if not total:
+            return None
+        return self.by_face[self.counts.take(int(self.rng.random() * total))].pop()
+
+    def add_cards(self, cards: List[Card]):
+        for card in cards:
+            face = self._face(card)
+            self.by_face[face].append(card)
+            self.counts.add(face, 1)
+
+    def put_back(self, card: Card):
+        self.add_cards([card])
+
+    def cards_remaining(self) -> int:
+        return self.counts.total
+
+    def reset(self):
+        # The piles of a full deck are computed once per all_cards list
+        if self._initial_for is not self.all_cards:
+            self.cards = self.all_cards
+            self._initial = [list(pile) for pile in self.by_face]
+            self._initial_for = self.all_cards
+            return
+        for pile, initial in zip(self.by_face, self._initial):
+            pile[:] = initial
+        self.counts.rebuild([len(pile) for pile in self._initial])
@@ -0,0 +1,188 @@
+"""
+Endgame search for two-player games.
+
+Once both hands are small, the rest of a game can be searched to its end.
+EndgameSolver does so for a position in which both hands and the next
+draws are known: minimax over the moves of both players, every value from
+the view of the player to move. Positions are keyed canonically by the
+sorted hands, top card, color and the cards still to be drawn, so a
+position reached by different move orders, or again on a later turn, is
+solved once. The memo holds at most max_entries positions and evicts the
+least recently used one. Values never depend on what is in the memo.
+
+The search is exact only within its bounds. A line that needs more than
+DRAW_WINDOW known draws, or in which a hand grows beyond MAX_HAND cards,
+is not searched further but scored by ahead(): the smaller hand is taken
+to win. Such a value is an estimate, not a proof. ComputerPlayer searches
+from two cards per hand by default, where even a Plus 4 keeps a hand
+within MAX_HAND; larger thresholds (the Endspiel strategy) reach more
+estimated lines.
+
+Computer players know neither the opponent's hand nor the deck, so
+play_endgame samples both from the unseen cards several times. A move that
+wins in every sample while another one does not is a won position that the
+usual heuristic might throw away; everything else is left to the heuristic.
+The samples come from a generator seeded by the position, so the search
+leaves the global random stream that games are seeded with untouched and
+decides a position the same way every time.
+"""
+
+import random
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from uno_fixed import Game, Card, Color, CardType, Player
+from uno_search import FACE_COLOR, FACE_PENALTY, FACE_TYPE, PLAYABLE, WILD
+from uno_state import FACES, COLORS, face_of
+
+DRAW_WINDOW = 6    # draws known per sample; a position needing more is estimated
+MAX_HAND = 6       # a hand growing beyond this has left the endgame and is estimated
+SAMPLES = 8
+
+Hand = Tuple[int, ...]  # sorted faces
+Move = Tuple[int, int]  # (face, color afterwards)
+
+
+def _without(hand: Hand, face: int) -> Hand:
+    i = hand.index(face)
+    return hand[:i] + hand[i + 1:]
+
+
+def ahead(mover: Hand, other: Hand) -> bool:
+    """Outcome assumed for a position that has left the endgame: the smaller hand wins"""
+    return len(mover) < len(other)
+
+
+class EndgameSolver:
+    def __init__(self, max_entries: int = 200_000):
+        self.max_entries = max_entries
+        self.memo: "OrderedDict[tuple, bool]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def moves(self, hand: Hand, top: int, color: int) -> List[Move]:
+        """Distinct plays in search order; a wild card once per color, the most held first"""
+        held = [0] * len(COLORS)
+        for face in hand:
+            if FACE_COLOR[face] != WILD:
+                held[FACE_COLOR[face]] += 1
+        colors = sorted(range(len(COLORS)), key=lambda new_color: -held[new_color])
+        moves = []
+        for face in PLAYABLE[top][color]:
+            if face in hand:
+                if FACE_COLOR[face] == WILD:
+                    moves.extend((face, new_color) for new_color in colors)
+                else:
+                    moves.append((face, FACE_COLOR[face]))
+        return moves
+
+    def wins(self, mover: Hand, other: Hand, top: int, color: int, deck: Hand) -> bool:
+        """Whether the player to move can force a win; estimated by ahead() beyond the search bounds"""
+        key = (mover, other, top, color, deck)
+        memo = self.memo
+        won = memo.get(key)
+        if won is not None:
+            memo.move_to_end(key)
+            self.hits += 1
+            return won
+
+        self.misses += 1
+        won = self._solve(mover, other, top, color, deck)
+        memo[key] = won
+        if len(memo) > self.max_entries:
+            memo.popitem(last=False)
+        return won
+
+    def _solve(self, mover: Hand, other: Hand, top: int, color: int, deck: Hand) -> bool:
+        moves = self.moves(mover, top, color)
+        if moves:
+            # The first winning move settles it
+            return any(self.play(mover, other, move, deck) for move in moves)
+
+        # Nothing to play: draw, and play the card if it fits and that wins
+        if not deck:
+            return ahead(mover, other)
+        drawn, deck = deck[0], deck[1:]
+        hand = tuple(sorted(mover + (drawn,)))
+        if len(hand) > MAX_HAND:
+            return ahead(hand, other)
+        return (any(self.play(hand, other, move, deck) for move in self.moves((drawn,), top, color))
+                or not self.wins(other, hand, top, color, deck))
+
+    def play(self, mover: Hand, other: Hand, move: Move, deck: Hand) -> bool:
+        """Whether playing move wins for the mover"""
+        face, color = move
+        rest = _without(mover, face)
+        if not rest:
+            return True
+
+        penalty = FACE_PENALTY[face]
+        if penalty:
+            if len(deck) < penalty:
+                return ahead(rest, other)
+            other = tuple(sorted(other + deck[:penalty]))
+            deck = deck[penalty:]
+            if len(other) > MAX_HAND:
+                return ahead(rest, other)
+        if penalty or FACE_TYPE[face] in (CardType.SKIP, CardType.REVERSE):
+            # With two players all of these leave the mover on turn
+            return self.wins(rest, other, face, color, deck)
+        return not self.wins(other, rest, face, color, deck)
+
+    def best_move(self, hand: Sequence[int], opponent_size: int, top: int, color: int,
+                  unseen: Sequence[int], samples: int = SAMPLES) -> Optional[Move]:
+        """
+        A move that wins against every sampled opponent hand and draw order
+        when some other move does not; None when the samples leave the
+        choice open, so that the caller's own heuristic decides
+        """
+        hand = tuple(sorted(hand))
+        candidates = self.moves(hand, top, color)
+        if len(candidates) <= 1:
+            return None
+
+        pool = [face for face, count in enumerate(unseen) for _ in range(count)]
+        rng = random.Random(hash((hand, opponent_size, top, color, tuple(unseen))))
+        some_move_loses = False
+        for _ in range(samples):
+            sample = rng.sample(pool, min(len(pool), opponent_size + DRAW_WINDOW))
+            other = tuple(sorted(sample[:opponent_size]))
+            deck = tuple(sample[opponent_size:])
+            winning = [move for move in candidates if self.play(hand, other, move, deck)]
+            some_move_loses = some_move_loses or len(winning) < len(candidates)
+            candidates = winning
+            if not candidates:
+                return None
+        return candidates[0] if some_move_loses else None
+
+
+SOLVER = EndgameSolver()
+
+
+def unseen_faces(player: Player, game: Game) -> List[int]:
+    """Face counts of the cards player cannot see: all but its hand and the discard pile"""
+    unseen = [0] * len(FACES)
+    for card in game.deck.all_cards:
+        unseen[face_of(card)] += 1
+    for card in player.hand + game.discard_pile:
+        unseen[face_of(card)] -= 1
+    return unseen
+
+
+def play_endgame(player, opponent: Player, game: Game, top_card: Card,
+                 declared_color: Optional[Color]) -> Optional[int]:
+    """Hand index for player to play, or None when the search leaves the choice open"""
+    playable = [i for i, card in enumerate(player.hand) if card.can_play_on(top_card, declared_color)]
+    color = declared_color or top_card.color
+    if color not in COLORS or (len(playable) <= 1 and
+                               not any(player.hand[i].color == Color.WILD for i in playable)):
+        return None
+
+    move = SOLVER.best_move([face_of(card) for card in player.hand], len(opponent.hand),
+                            face_of(top_card), COLORS.index(color), unseen_faces(player, game))
+    if move is None:
+        return None
+    face, new_color = move
+    if FACE_COLOR[face] == WILD:
+        player.planned_color = COLORS[new_color]
+    return next(i for i in playable if face_of(player.hand[i]) == face)
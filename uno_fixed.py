@@ -1,6 +1,6 @@
 import random
 from enum import Enum
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 class Color(Enum):
     RED = "Rot"
@@ -22,6 +22,13 @@ class Card:
         self.color = color
         self.card_type = card_type
         self.value = value
+        # Official scoring: face value, 20 for action cards, 50 for wild cards
+        if card_type == CardType.NUMBER:
+            self.points = value
+        elif color == Color.WILD:
+            self.points = 50
+        else:
+            self.points = 20
     
     def __str__(self):
         if self.card_type == CardType.NUMBER:
@@ -48,34 +55,51 @@ class Card:
             return True
         
         return False
+    
+    def is_identical(self, other: 'Card') -> bool:
+        """Same color and face; wild cards never count as identical"""
+        return (self.color == other.color and self.color != Color.WILD and
+                self.card_type == other.card_type and self.value == other.value)
 
 class Deck:
-    def __init__(self):
-        self.cards: List[Card] = []
-        self._create_deck()
+    def __init__(self, num_decks: int = 1):
+        self.num_decks = num_decks
+        # Shuffles use the global random module until the deck gets its own stream
+        self.rng = random
+        self.cards: List[Card] = self.new_cards(num_decks)
+        self.all_cards = list(self.cards)
         self.shuffle()
     
-    def _create_deck(self):
+    @staticmethod
+    def new_cards(num_decks: int = 1) -> List[Card]:
+        """num_decks complete 108-card decks in creation order"""
+        cards = []
         colors = [Color.RED, Color.BLUE, Color.GREEN, Color.YELLOW]
         
-        for color in colors:
-            self.cards.append(Card(color, CardType.NUMBER, 0))
-            
-            for value in range(1, 10):
-                self.cards.append(Card(color, CardType.NUMBER, value))
-                self.cards.append(Card(color, CardType.NUMBER, value))
+        for _ in range(num_decks):
+            for color in colors:
+                cards.append(Card(color, CardType.NUMBER, 0))
+                
+                for value in range(1, 10):
+                    cards.append(Card(color, CardType.NUMBER, value))
+                    cards.append(Card(color, CardType.NUMBER, value))
+                
+                for _ in range(2):
+                    cards.append(Card(color, CardType.SKIP))
+                    cards.append(Card(color, CardType.REVERSE))
+                    cards.append(Card(color, CardType.DRAW_TWO))
             
-            for _ in range(2):
-                self.cards.append(Card(color, CardType.SKIP))
-                self.cards.append(Card(color, CardType.REVERSE))
-                self.cards.append(Card(color, CardType.DRAW_TWO))
-        
-        for _ in range(4):
-            self.cards.append(Card(Color.WILD, CardType.WILD))
-            self.cards.append(Card(Color.WILD, CardType.WILD_DRAW_FOUR))
+            for _ in range(4):
+                cards.append(Card(Color.WILD, CardType.WILD))
+                cards.append(Card(Color.WILD, CardType.WILD_DRAW_FOUR))
+        return cards
+    
+    def seed(self, seed: int):
+        """Shuffle from a private stream from now on, independent of the players' random choices"""
+        self.rng = random.Random(seed)
     
     def shuffle(self):
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
     
     def draw(self) -> Optional[Card]:
         if self.cards:
@@ -86,8 +110,18 @@ class Deck:
         self.cards.extend(cards)
         self.shuffle()
     
+    def put_back(self, card: Card):
+        """Return a card that must not be turned up and shuffle it in"""
+        self.cards.insert(0, card)
+        self.shuffle()
+    
     def cards_remaining(self) -> int:
         return len(self.cards)
+    
+    def reset(self):
+        """Put all cards back in creation order and shuffle, like a new Deck"""
+        self.cards[:] = self.all_cards
+        self.shuffle()
 
 class Player:
     def __init__(self, name: str):
@@ -95,11 +129,13 @@ class Player:
         self.hand: List[Card] = []
         self.has_called_uno = False
         self.just_played_second_to_last = False  # FIX: Track when player just went to 1 card
+        self.hand_points = 0  # running point value of the hand, kept up to date on every draw and play
     
     def draw_card(self, deck: Deck) -> Optional[Card]:
         card = deck.draw()
         if card:
             self.hand.append(card)
+            self.hand_points += card.points
             # FIX: Reset UNO status when drawing
             if len(self.hand) > 1:
                 self.has_called_uno = False
@@ -111,7 +147,9 @@ class Player:
             # FIX: Track if player is going from 2 cards to 1 card
             if len(self.hand) == 2:
                 self.just_played_second_to_last = True
-            return self.hand.pop(index)
+            card = self.hand.pop(index)
+            self.hand_points -= card.points
+            return card
         return None
     
     def has_uno(self) -> bool:
@@ -121,6 +159,32 @@ class Player:
         if self.has_uno():
             self.has_called_uno = True
     
+    def reset(self):
+        self.hand.clear()
+        self.hand_points = 0
+        self.has_called_uno = False
+        self.just_played_second_to_last = False
+    
+    def recount_points(self):
+        """Recompute hand_points after the hand was replaced from outside"""
+        self.hand_points = sum(card.points for card in self.hand)
+    
+    def start_round(self, game: 'Game'):
+        """Called once the cards of a round are dealt or a saved round is loaded"""
+        pass
+    
+    def choose_jump_in(self, top_card: Card) -> Optional[int]:
+        """Index of an identical card to play out of turn (jump-in rule), or None"""
+        return None
+    
+    def choose_stack(self, top_card: Card, declared_color: Optional[Color], pending: int) -> Optional[int]:
+        """Index of a draw card that passes a pending penalty on (stacking rule), or None to take it"""
+        return self.choose_card(top_card, declared_color)
+    
+    def choose_swap_target(self, others: List['Player']) -> 'Player':
+        """Whom to swap hands with after playing a 7 (7-0 rule)"""
+        return min(others, key=lambda other: len(other.hand))
+    
     def reset_uno_call(self):
         # FIX: Only reset if player no longer has UNO
         if not self.has_uno():
@@ -170,9 +234,108 @@ class HumanPlayer(Player):
             except ValueError:
                 pass
             print("Ungültige Eingabe!")
+    
+    def choose_play_drawn(self, card: Card) -> bool:
+        return input("Möchtest du die gezogene Karte spielen? (j/n): ").lower() == 'j'
+    
+    def wants_uno_call(self) -> bool:
+        return input("UNO rufen? (j/n): ").lower() == 'j'
+    
+    def choose_stack(self, top_card: Card, declared_color: Optional[Color], pending: int) -> Optional[int]:
+        print(f"\n{self.name}, du musst {pending} Karten ziehen, außer du gibst mit einer Ziehkarte weiter:")
+        stack_indices = []
+        for i, card in enumerate(self.hand):
+            can_stack = Game.can_stack(card, top_card)
+            print(f"{i + 1}: {card} {'✓' if can_stack else '✗'}")
+            if can_stack:
+                stack_indices.append(i)
+        
+        if not stack_indices:
+            return None
+        
+        while True:
+            try:
+                choice = input(f"Wähle eine Ziehkarte (Nummer) oder 0 für {pending} Karten: ")
+                if choice == "0":
+                    return None
+                
+                index = int(choice) - 1
+                if index in stack_indices:
+                    return index
+                else:
+                    print("Mit dieser Karte kannst du die Strafe nicht weitergeben!")
+            except ValueError:
+                print("Ungültige Eingabe!")
+    
+    def choose_jump_in(self, top_card: Card) -> Optional[int]:
+        for i, card in enumerate(self.hand):
+            if card.is_identical(top_card):
+                if input(f"{self.name}, mit {card} reinspringen? (j/n): ").lower() == 'j':
+                    return i
+                return None
+        return None
+    
+    def choose_swap_target(self, others: List[Player]) -> Player:
+        print("\nMit wem tauschst du die Karten?")
+        for i, other in enumerate(others):
+            print(f"{i + 1}: {other.name} ({len(other.hand)} Karten)")
+        while True:
+            try:
+                choice = int(input("Spieler (Nummer): ")) - 1
+                if 0 <= choice < len(others):
+                    return others[choice]
+            except ValueError:
+                pass
+            print("Ungültige Eingabe!")
 
 class ComputerPlayer(Player):
+    # Tunable decisions and their defaults; subclasses that make a decision
+    # their own way ignore its parameter
+    PARAMS = {
+        "wild_threshold": 3,        # wild cards are preferred once the hand is this small
+        "actions_first": True,      # action cards before number cards
+        "forget_uno": 0.1,          # chance of not calling UNO
+        "color_rule": "majority",   # wild color: most cards held, most points held or random
+        "endgame_cards": 2,         # from here on in two-player games, moves are searched (0: never)
+    }
+    COLOR_RULES = ["majority", "points", "random"]
+    
+    def __init__(self, name: str, **params):
+        super().__init__(name)
+        unknown = sorted(set(params) - set(self.PARAMS))
+        if unknown:
+            raise ValueError(f"Unbekannte Parameter für {type(self).__name__}: {', '.join(unknown)}")
+        if params.get("color_rule", "majority") not in self.COLOR_RULES:
+            raise ValueError(f"Unbekannte Farbregel: {params['color_rule']}")
+        for key, default in self.PARAMS.items():
+            setattr(self, key, params.get(key, default))
+        self.game: Optional['Game'] = None
+        self.planned_color: Optional[Color] = None  # picked together with a wild card
+    
+    def params(self) -> Dict:
+        return {key: getattr(self, key) for key in self.PARAMS}
+    
+    def start_round(self, game: 'Game'):
+        self.game = game
+    
+    def endgame_move(self, top_card: Card, declared_color: Optional[Color] = None) -> Optional[int]:
+        """Card an exact search of the endgame plays; None outside it or without a choice"""
+        game = self.game
+        if (game is None or len(game.players) != 2 or len(self.hand) > self.endgame_cards
+                or game.pending_draw or game.rules.names()):
+            return None
+        opponent = game.players[1] if game.players[0] is self else game.players[0]
+        if len(opponent.hand) > self.endgame_cards:
+            return None
+        # uno_endgame builds on this module, so it is only loaded once needed
+        from uno_endgame import play_endgame
+        return play_endgame(self, opponent, game, top_card, declared_color)
+    
     def choose_card(self, top_card: Card, declared_color: Optional[Color] = None) -> Optional[int]:
+        endgame_index = self.endgame_move(top_card, declared_color)
+        if endgame_index is not None:
+            return endgame_index
+        
         playable_indices = []
         
         for i, card in enumerate(self.hand):
@@ -195,16 +358,27 @@ class ComputerPlayer(Player):
             else:
                 number_cards.append(index)
         
-        if len(self.hand) <= 3 and wild_cards:
+        first, second = (action_cards, number_cards) if self.actions_first else (number_cards, action_cards)
+        if len(self.hand) <= self.wild_threshold and wild_cards:
             return random.choice(wild_cards)
-        elif action_cards:
-            return random.choice(action_cards)
-        elif number_cards:
-            return random.choice(number_cards)
+        elif first:
+            return random.choice(first)
+        elif second:
+            return random.choice(second)
         else:
             return random.choice(playable_indices)
     
     def choose_color(self) -> Color:
+        if self.planned_color is not None:
+            color, self.planned_color = self.planned_color, None
+            return color
+        if self.color_rule == "points":
+            return self.points_color()
+        if self.color_rule == "random":
+            return random.choice([Color.RED, Color.BLUE, Color.GREEN, Color.YELLOW])
+        return self.majority_color()
+    
+    def majority_color(self) -> Color:
         color_counts = {Color.RED: 0, Color.BLUE: 0, Color.GREEN: 0, Color.YELLOW: 0}
         
         for card in self.hand:
@@ -213,32 +387,136 @@ class ComputerPlayer(Player):
         
         max_color = max(color_counts, key=color_counts.get)
         return max_color
+    
+    def points_color(self) -> Color:
+        """The color holding the most points, so that they can be shed first"""
+        color_points = {Color.RED: 0, Color.BLUE: 0, Color.GREEN: 0, Color.YELLOW: 0}
+        for card in self.hand:
+            if card.color in color_points:
+                color_points[card.color] += card.points
+        return max(color_points, key=color_points.get)
+    
+    def choose_play_drawn(self, card: Card) -> bool:
+        return True
+    
+    def wants_uno_call(self) -> bool:
+        return random.random() >= self.forget_uno
+    
+    def choose_jump_in(self, top_card: Card) -> Optional[int]:
+        for i, card in enumerate(self.hand):
+            if card.is_identical(top_card):
+                return i
+        return None
+
+class HouseRules:
+    """Optional rule variants; a Game compiles them once into its dispatch tables"""
+    
+    NAMES = ["stacking", "jump_in", "seven_o", "draw_until_playable", "forced_play"]
+    
+    def __init__(self, stacking: bool = False, jump_in: bool = False, seven_o: bool = False,
+                 draw_until_playable: bool = False, forced_play: bool = False):
+        self.stacking = stacking                        # +2/+4 pass the penalty on
+        self.jump_in = jump_in                          # identical card may be played out of turn
+        self.seven_o = seven_o                          # 7 swaps hands, 0 passes all hands on
+        self.draw_until_playable = draw_until_playable  # keep drawing until a card fits
+        self.forced_play = forced_play                  # a playable drawn card must be played
+    
+    @classmethod
+    def from_names(cls, names: List[str]) -> 'HouseRules':
+        unknown = sorted(set(names) - set(cls.NAMES))
+        if unknown:
+            raise ValueError(f"Unbekannte Hausregel: {', '.join(unknown)}")
+        return cls(**{name: True for name in names})
+    
+    def names(self) -> List[str]:
+        return [name for name in self.NAMES if getattr(self, name)]
 
 class Game:
-    def __init__(self):
-        self.deck = Deck()
+    # A position seen this often while nearly all cards are in the hands ends the game as drawn
+    REPETITION_LIMIT = 3
+    
+    def __init__(self, rules: Optional[HouseRules] = None, deck: Optional[Deck] = None):
+        self.deck = deck if deck is not None else Deck()
         self.discard_pile: List[Card] = []
         self.players: List[Player] = []
         self.current_player_index = 0
         self.direction = 1
         self.declared_color: Optional[Color] = None
+        self.pending_draw = 0
+        self.last_player: Optional[Player] = None
+        self.jump_in_checked: Optional[Card] = None
+        self.drawn: Optional[str] = None  # reason when the game ended without a winner
+        self.idle_turns = 0
+        self.positions: Dict[tuple, int] = {}
+        # Objects told about public events: card_played(player, card),
+        # cards_drawn(player, count), passed(player, top_card, declared_color)
+        # once the cards of the pass are drawn, cards_recycled(cards) and
+        # hands_changed(); players subscribe in Player.start_round
+        self.observers: List = []
+        self.set_rules(rules or HouseRules())
+    
+    def set_rules(self, rules: HouseRules):
+        """Compile rules into the handlers that play_turn dispatches to, so turns never test rule flags"""
+        self.rules = rules
+        self.card_effects: Dict[CardType, Callable[[Card, Player], None]] = {
+            CardType.NUMBER: self._no_effect,
+            CardType.SKIP: self._skip,
+            CardType.REVERSE: self._reverse,
+            CardType.DRAW_TWO: self._draw_two,
+            CardType.WILD: self._wild,
+            CardType.WILD_DRAW_FOUR: self._wild_draw_four,
+        }
+        if rules.seven_o:
+            self.card_effects[CardType.NUMBER] = self._seven_o
+        if rules.stacking:
+            self.card_effects[CardType.DRAW_TWO] = self._stack_draw_two
+            self.card_effects[CardType.WILD_DRAW_FOUR] = self._stack_wild_draw_four
+        self.take_turn = self._take_turn_stacking if rules.stacking else self._take_turn
+        self.draw_step = self._draw_until_playable if rules.draw_until_playable else self._draw_one
+        self.play_drawn = self._must_play_drawn if rules.forced_play else self._may_play_drawn
+        self.pass_turn = self._pass_turn_jump_in if rules.jump_in else self._pass_turn
         
     def setup_game(self):
         print("=== UNO Spiel ===")
         self.players.append(HumanPlayer("Spieler"))
         self.players.append(ComputerPlayer("Computer"))
-        
+        self.deal()
+    
+    def deal(self):
+        """Deal 7 cards to every player and turn up the first card"""
         for player in self.players:
             for _ in range(7):
                 player.draw_card(self.deck)
         
         first_card = self.deck.draw()
         while first_card.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
-            self.deck.cards.insert(0, first_card)
-            self.deck.shuffle()
+            self.deck.put_back(first_card)
             first_card = self.deck.draw()
         
         self.discard_pile.append(first_card)
+        self.start_round()
+    
+    def start_round(self):
+        self.observers.clear()
+        for player in self.players:
+            player.start_round(self)
+    
+    def reset(self):
+        """Reinitialize this game in place for a new round with the same players"""
+        self.deck.reset()
+        self.discard_pile.clear()
+        for player in self.players:
+            player.reset()
+        self.current_player_index = 0
+        self.direction = 1
+        self.declared_color = None
+        self.pending_draw = 0
+        self.last_player = None
+        self.jump_in_checked = None
+        self.drawn = None
+        self.idle_turns = 0
+        self.positions.clear()
+        self.deal()
     
     def get_top_card(self) -> Card:
         return self.discard_pile[-1]
@@ -255,55 +533,106 @@ class Game:
         # Refill deck from discard pile
         old_top = self.discard_pile.pop()
         self.deck.add_cards(self.discard_pile)
+        for observer in self.observers:
+            observer.cards_recycled(self.discard_pile)
         self.discard_pile = [old_top]
         
         return self.deck.cards_remaining() >= needed
     
+    def draw_for(self, player: Player, count: int = 1) -> Optional[Card]:
+        """Draw count cards into player's hand and tell the observers; the last card drawn"""
+        card = None
+        drawn = 0
+        for _ in range(count):
+            card = player.draw_card(self.deck)
+            if card is None:
+                break
+            drawn += 1
+        if drawn:
+            for observer in self.observers:
+                observer.cards_drawn(player, drawn)
+        return card
+    
+    @staticmethod
+    def can_stack(card: Card, top_card: Card) -> bool:
+        """Whether card passes the penalty of the draw card top_card on"""
+        return card.card_type == CardType.WILD_DRAW_FOUR or card.card_type == top_card.card_type
+    
     def handle_action_card(self, card: Card, player: Player):
-        next_player_index = (self.current_player_index + self.direction) % len(self.players)
-        next_player = self.players[next_player_index]
-        
-        if card.card_type == CardType.SKIP:
-            print(f"{next_player.name} setzt aus!")
-            self.current_player_index = next_player_index
-        
-        elif card.card_type == CardType.REVERSE:
-            self.direction *= -1
-            print("Richtungswechsel!")
-        
-        elif card.card_type == CardType.DRAW_TWO:
-            print(f"{next_player.name} muss 2 Karten ziehen!")
-            if self.ensure_deck_has_cards(2):
-                for _ in range(2):
-                    next_player.draw_card(self.deck)
-            self.current_player_index = next_player_index
-        
-        elif card.card_type == CardType.WILD:
-            if isinstance(player, HumanPlayer):
-                self.declared_color = player.choose_color()
-            else:
-                self.declared_color = player.choose_color()
-            print(f"Neue Farbe: {self.declared_color.value}")
-        
-        elif card.card_type == CardType.WILD_DRAW_FOUR:
-            if isinstance(player, HumanPlayer):
-                self.declared_color = player.choose_color()
-            else:
-                self.declared_color = player.choose_color()
-            print(f"Neue Farbe: {self.declared_color.value}")
-            print(f"{next_player.name} muss 4 Karten ziehen!")
-            if self.ensure_deck_has_cards(4):
-                for _ in range(4):
-                    next_player.draw_card(self.deck)
-            self.current_player_index = next_player_index
+        self.card_effects[card.card_type](card, player)
+    
+    def _next_player(self) -> Tuple[int, Player]:
+        index = (self.current_player_index + self.direction) % len(self.players)
+        return index, self.players[index]
+    
+    def _no_effect(self, card: Card, player: Player):
+        pass
+    
+    def _skip(self, card: Card, player: Player):
+        next_player_index, next_player = self._next_player()
+        print(f"{next_player.name} setzt aus!")
+        self.current_player_index = next_player_index
+    
+    def _reverse(self, card: Card, player: Player):
+        self.direction *= -1
+        print("Richtungswechsel!")
+    
+    def _draw_two(self, card: Card, player: Player):
+        next_player_index, next_player = self._next_player()
+        print(f"{next_player.name} muss 2 Karten ziehen!")
+        if self.ensure_deck_has_cards(2):
+            self.draw_for(next_player, 2)
+        self.current_player_index = next_player_index
+    
+    def _wild(self, card: Card, player: Player):
+        self.declared_color = player.choose_color()
+        print(f"Neue Farbe: {self.declared_color.value}")
+    
+    def _wild_draw_four(self, card: Card, player: Player):
+        self._wild(card, player)
+        next_player_index, next_player = self._next_player()
+        print(f"{next_player.name} muss 4 Karten ziehen!")
+        if self.ensure_deck_has_cards(4):
+            self.draw_for(next_player, 4)
+        self.current_player_index = next_player_index
+    
+    def _stack_draw_two(self, card: Card, player: Player):
+        self.pending_draw += 2
+        print(f"Strafe: {self.pending_draw} Karten!")
+    
+    def _stack_wild_draw_four(self, card: Card, player: Player):
+        self._wild(card, player)
+        self.pending_draw += 4
+        print(f"Strafe: {self.pending_draw} Karten!")
+    
+    def _seven_o(self, card: Card, player: Player):
+        if card.value == 7 and player.hand:
+            target = player.choose_swap_target([p for p in self.players if p is not player])
+            print(f"{player.name} tauscht die Karten mit {target.name}!")
+            player.hand, target.hand = target.hand, player.hand
+            swapped = [player, target]
+        elif card.value == 0:
+            print("Alle geben ihre Karten weiter!")
+            hands = [p.hand for p in self.players]
+            for i, p in enumerate(self.players):
+                p.hand = hands[(i - self.direction) % len(hands)]
+            swapped = self.players
+        else:
+            return
+        # A hand that changed owner has not been called UNO on
+        for p in swapped:
+            p.has_called_uno = False
+            p.just_played_second_to_last = False
+            p.recount_points()
+        for observer in self.observers:
+            observer.hands_changed()
     
     def check_uno_penalty(self, player: Player):
         """FIX: Only penalize if player just played their second-to-last card"""
         if player.has_uno() and not player.has_called_uno and player.just_played_second_to_last:
             print(f"{player.name} hat vergessen UNO zu rufen! 2 Strafkarten!")
             if self.ensure_deck_has_cards(2):
-                for _ in range(2):
-                    player.draw_card(self.deck)
+                self.draw_for(player, 2)
             player.just_played_second_to_last = False
     
     def play_turn(self):
@@ -319,55 +648,149 @@ class Game:
         # FIX: Don't reset UNO call at start of turn
         # player.reset_uno_call()
         
-        card_index = player.choose_card(self.get_top_card(), self.declared_color)
+        supply = (self.deck.cards_remaining(), len(self.discard_pile), self.discard_pile[-1])
+        self.take_turn(player)
+        self.pass_turn()
+        self._check_drawn(player, supply)
+    
+    def play_from_hand(self, player: Player, card_index: int):
+        card = player.play_card(card_index)
+        print(f"{player.name} spielt: {card}")
+        self.discard_pile.append(card)
+        self.declared_color = None
+        self.last_player = player
+        for observer in self.observers:
+            observer.card_played(player, card)
+        
+        # FIX: Check UNO immediately after playing
+        if player.has_uno():
+            if player.wants_uno_call():
+                player.call_uno()
+                print(f"{player.name} ruft UNO!")
+            
+            # FIX: Check penalty immediately for this player only
+            self.check_uno_penalty(player)
+        else:
+            # Reset UNO status when player has more than 1 card
+            player.reset_uno_call()
         
+        self.handle_action_card(card, player)
+    
+    def _take_turn(self, player: Player):
+        card_index = player.choose_card(self.get_top_card(), self.declared_color)
         if card_index is None:
             print(f"{player.name} zieht eine Karte")
-            if self.ensure_deck_has_cards(1):
-                drawn_card = player.draw_card(self.deck)
-                
-                if drawn_card and drawn_card.can_play_on(self.get_top_card(), self.declared_color):
-                    if isinstance(player, HumanPlayer):
-                        play_drawn = input("Möchtest du die gezogene Karte spielen? (j/n): ").lower() == 'j'
-                    else:
-                        play_drawn = True
-                    
-                    if play_drawn:
-                        print(f"{player.name} spielt: {drawn_card}")
-                        self.discard_pile.append(drawn_card)
-                        self.declared_color = None
-                        
-                        if drawn_card.card_type != CardType.NUMBER:
-                            self.handle_action_card(drawn_card, player)
+            top_card, declared_color = self.get_top_card(), self.declared_color
+            self.draw_step(player)
+            for observer in self.observers:
+                observer.passed(player, top_card, declared_color)
         else:
-            card = player.play_card(card_index)
-            print(f"{player.name} spielt: {card}")
-            self.discard_pile.append(card)
-            self.declared_color = None
-            
-            # FIX: Check UNO immediately after playing
-            if player.has_uno():
-                if isinstance(player, HumanPlayer):
-                    uno_call = input("UNO rufen? (j/n): ").lower() == 'j'
-                    if uno_call:
-                        player.call_uno()
-                        print(f"{player.name} ruft UNO!")
-                else:
-                    if random.random() > 0.1:
-                        player.call_uno()
-                        print(f"{player.name} ruft UNO!")
-                
-                # FIX: Check penalty immediately for this player only
-                self.check_uno_penalty(player)
-            else:
-                # Reset UNO status when player has more than 1 card
-                player.reset_uno_call()
-            
-            if card.card_type != CardType.NUMBER:
-                self.handle_action_card(card, player)
-        
+            self.play_from_hand(player, card_index)
+    
+    def _take_turn_stacking(self, player: Player):
+        if not self.pending_draw:
+            self._take_turn(player)
+            return
+        
+        # A draw penalty can only be passed on with another draw card
+        top_card = self.get_top_card()
+        card_index = player.choose_stack(top_card, self.declared_color, self.pending_draw)
+        if card_index is not None:
+            card = player.hand[card_index]
+            if self.can_stack(card, top_card):
+                self.play_from_hand(player, card_index)
+                return
+            print(f"{card} gibt die Strafe nicht weiter")
+        
+        print(f"{player.name} muss {self.pending_draw} Karten ziehen!")
+        self.ensure_deck_has_cards(self.pending_draw)
+        self.draw_for(player, self.pending_draw)
+        self.pending_draw = 0
+    
+    def _draw_one(self, player: Player):
+        if self.ensure_deck_has_cards(1):
+            drawn_card = self.draw_for(player)
+            if drawn_card and drawn_card.can_play_on(self.get_top_card(), self.declared_color):
+                if self.play_drawn(player, drawn_card):
+                    # The drawn card is the last one in the hand
+                    self.play_from_hand(player, len(player.hand) - 1)
+    
+    def _draw_until_playable(self, player: Player):
+        top_card = self.get_top_card()
+        while self.ensure_deck_has_cards(1):
+            drawn_card = self.draw_for(player)
+            if drawn_card.can_play_on(top_card, self.declared_color):
+                if self.play_drawn(player, drawn_card):
+                    self.play_from_hand(player, len(player.hand) - 1)
+                return
+    
+    def _may_play_drawn(self, player: Player, card: Card) -> bool:
+        return player.choose_play_drawn(card)
+    
+    def _must_play_drawn(self, player: Player, card: Card) -> bool:
+        return True
+    
+    def _pass_turn(self):
         self.current_player_index = (self.current_player_index + self.direction) % len(self.players)
     
+    def _pass_turn_jump_in(self):
+        self._pass_turn()
+        # Each newly played card may be answered out of turn with an identical one;
+        # play then continues after whoever jumped in. The card turned up by the
+        # deal was played by nobody, so there is nothing to jump in on before the first play.
+        while (self.last_player is not None and self.jump_in_checked is not self.get_top_card()
+               and not self.check_winner()):
+            top_card = self.jump_in_checked = self.get_top_card()
+            for offset in range(len(self.players)):
+                index = (self.current_player_index + offset) % len(self.players)
+                jumper = self.players[index]
+                if jumper is self.last_player:
+                    continue
+                card_index = jumper.choose_jump_in(top_card)
+                if card_index is not None and jumper.hand[card_index].is_identical(top_card):
+                    print(f"{jumper.name} springt rein!")
+                    self.current_player_index = index
+                    self.play_from_hand(jumper, card_index)
+                    self._pass_turn()
+                    break
+    
+    def _check_drawn(self, player: Player, supply: Tuple[int, int, Card]):
+        """End the game as drawn when nobody can move any more or a position keeps coming back"""
+        moved = supply != (self.deck.cards_remaining(), len(self.discard_pile), self.discard_pile[-1])
+        if not moved and not any(card.can_play_on(self.get_top_card(), self.declared_color)
+                                 for card in player.hand):
+            # Nothing moved and nothing could have: a full round of these is a stall
+            self.idle_turns += 1
+            if self.idle_turns >= len(self.players):
+                self.drawn = "Keine Karte kann mehr gezogen oder gespielt werden"
+        else:
+            self.idle_turns = 0
+        
+        # Games only loop once almost every card is held; before that positions keep changing
+        if self.deck.cards_remaining() + len(self.discard_pile) <= len(self.players) + 1:
+            position = self._position()
+            self.positions[position] = self.positions.get(position, 0) + 1
+            if self.positions[position] >= self.REPETITION_LIMIT:
+                self.drawn = "Stellung hat sich wiederholt"
+        
+        if self.drawn:
+            print(f"Unentschieden: {self.drawn}")
+    
+    def _position(self) -> tuple:
+        def face(card: Card):
+            return card.color.value, card.card_type.value, card.value or 0
+        
+        return (self.current_player_index, self.direction, self.declared_color, self.pending_draw,
+                face(self.get_top_card()), self.deck.cards_remaining(), len(self.discard_pile),
+                tuple(tuple(sorted(map(face, player.hand))) for player in self.players))
+    
+    def round_points(self) -> int:
+        """Points the winner of this round scores: the value of all other hands"""
+        return sum(player.hand_points for player in self.players)
+    
+    def is_over(self) -> bool:
+        return self.drawn is not None or self.check_winner() is not None
+    
     def check_winner(self) -> Optional[Player]:
         for player in self.players:
             if len(player.hand) == 0:
@@ -384,6 +807,86 @@ class Game:
             if winner:
                 print(f"\n🎉 {winner.name} hat gewonnen! 🎉")
                 break
+            if self.drawn:
+                print("\nDas Spiel endet unentschieden.")
+                break
+
+class Match:
+    """
+    Rounds of one game until a player has target points. The winner of a
+    round scores the hand values of all other players; a drawn round or one
+    cut off at max_turns scores nothing.
+    """
+    
+    def __init__(self, game: Game, target: int = 500, max_turns: int = 1000, max_rounds: int = 1000):
+        self.game = game
+        self.target = target
+        self.max_turns = max_turns
+        self.max_rounds = max_rounds
+        self.scores: Dict[Player, int] = {player: 0 for player in game.players}
+        self.rounds: List[Dict] = []
+    
+    def play_round(self) -> Dict:
+        game = self.game
+        game.reset()
+        # The first player moves on by one seat every round
+        game.current_player_index = len(self.rounds) % len(game.players)
+        
+        turns = 0
+        while turns < self.max_turns and not game.is_over():
+            game.play_turn()
+            turns += 1
+        
+        winner = game.check_winner()
+        points = game.round_points() if winner else 0
+        if winner:
+            self.scores[winner] += points
+        result = {"round": len(self.rounds) + 1, "winner": winner.name if winner else None,
+                  "points": points, "turns": turns, "drawn": game.drawn}
+        self.rounds.append(result)
+        return result
+    
+    def winner(self) -> Optional[Player]:
+        leader = max(self.scores, key=self.scores.get)
+        return leader if self.scores[leader] >= self.target else None
+    
+    def play(self) -> Optional[Player]:
+        while not self.winner() and len(self.rounds) < self.max_rounds:
+            self.play_round()
+        return self.winner()
+    
+    def result(self) -> Dict:
+        winner = self.winner()
+        return {"winner": winner.name if winner else None, "rounds": len(self.rounds),
+                "scores": {player.name: score for player, score in self.scores.items()}}
+
+def deck_stream(seed: int) -> int:
+    """Seed of the deck's private stream in a game seeded with seed"""
+    # Apart from every game seed, so the deck and the players never share a stream
+    return seed + (1 << 48)
+
+class GamePool:
+    """Hands out reset games so that busy loops do not rebuild decks and players"""
+    
+    def __init__(self, factory: Callable[[], Game]):
+        self.factory = factory
+        self.free: List[Game] = []
+    
+    def acquire(self, seed: Optional[int] = None) -> Game:
+        """
+        A dealt game. With seed, the deal and the random module depend on seed
+        only: a new game has already shuffled once in its constructor, a
+        reused one has not.
+        """
+        game = self.free.pop() if self.free else self.factory()
+        if seed is not None:
+            random.seed(seed)
+            game.deck.seed(deck_stream(seed))
+        game.reset()
+        return game
+    
+    def release(self, game: Game):
+        self.free.append(game)
 
 if __name__ == "__main__":
     game = Game()
@@ -1,54 +1,396 @@
 import tkinter as tk
 from tkinter import messagebox, font as tkfont
-import random
-from uno import Game, Card, Color, CardType, Deck, Player, HumanPlayer, ComputerPlayer
+import os
+import queue
+import sys
+from collections import deque
+import threading
+import time
+from uno_fixed import Game, Card, Color, CardType, Deck, Player, HumanPlayer, ComputerPlayer
+from uno_players import create_player
+from uno_state import save_game, load_game
+
+CARD_COLORS = {
+    Color.RED: "#FF0000",
+    Color.BLUE: "#0000FF",
+    Color.GREEN: "#00AA00",
+    Color.YELLOW: "#FFD700",
+    Color.WILD: "#808080"
+}
+
+def card_colors(card):
+    bg_color = CARD_COLORS.get(card.color, "#808080")
+    fg_color = "white" if card.color in [Color.BLUE, Color.GREEN, Color.WILD] else "black"
+    return bg_color, fg_color
+
+def card_text(card):
+    if card.card_type == CardType.NUMBER:
+        return str(card.value)
+    elif card.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
+        return "WILD" if card.card_type == CardType.WILD else "+4"
+    text_map = {
+        CardType.SKIP: "⊘",
+        CardType.REVERSE: "↻",
+        CardType.DRAW_TWO: "+2"
+    }
+    return text_map.get(card.card_type, "?")
+
+def card_font(card, scale=1.0):
+    font_size = int(36 * scale) if card.card_type == CardType.NUMBER else int(20 * scale)
+    return ("Arial", font_size, "bold")
 
 class CardWidget(tk.Frame):
     def __init__(self, parent, card, clickable=False, click_callback=None, scale=1.0):
         super().__init__(parent, relief=tk.RAISED, borderwidth=2)
-        self.card = card
+        self.card = None
         self.click_callback = click_callback
+        self.clickable = False
+        self.scale = scale
         
         # Scale dimensions for history cards
-        width = int(80 * scale)
-        height = int(120 * scale)
-        font_size = int(36 * scale) if card.card_type == CardType.NUMBER else int(20 * scale)
-        
-        color_map = {
-            Color.RED: "#FF0000",
-            Color.BLUE: "#0000FF",
-            Color.GREEN: "#00AA00",
-            Color.YELLOW: "#FFD700",
-            Color.WILD: "#808080"
-        }
-        
-        bg_color = color_map.get(card.color, "#808080")
-        fg_color = "white" if card.color in [Color.BLUE, Color.GREEN, Color.WILD] else "black"
-        
-        self.configure(bg=bg_color, width=width, height=height)
+        self.configure(width=int(80 * scale), height=int(120 * scale))
         self.pack_propagate(False)
         
-        if card.card_type == CardType.NUMBER:
-            text = str(card.value)
-        elif card.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
-            text = "WILD" if card.card_type == CardType.WILD else "+4"
-        else:
-            text_map = {
-                CardType.SKIP: "⊘",
-                CardType.REVERSE: "↻",
-                CardType.DRAW_TWO: "+2"
-            }
-            text = text_map.get(card.card_type, "?")
+        self.label = tk.Label(self)
+        self.label.pack(expand=True)
+        
+        # Bind once; the handlers check the current state so the widget can be reused
+        self.bind("<Button-1>", self._on_click)
+        self.label.bind("<Button-1>", self._on_click)
+        self.bind("<Enter>", lambda e: self.clickable and self.configure(relief=tk.GROOVE))
+        self.bind("<Leave>", lambda e: self.clickable and self.configure(relief=tk.RAISED))
+        
+        self.set_card(card)
+        self.set_clickable(clickable)
+    
+    def set_card(self, card):
+        """Show a different card in this widget without recreating it"""
+        if card is self.card:
+            return
+        self.card = card
+        
+        bg_color, fg_color = card_colors(card)
         
-        label = tk.Label(self, text=text, bg=bg_color, fg=fg_color,
-                        font=("Arial", font_size, "bold"))
-        label.pack(expand=True)
+        self.configure(bg=bg_color)
+        self.label.configure(text=card_text(card), bg=bg_color, fg=fg_color,
+                             font=card_font(card, self.scale))
+    
+    def set_clickable(self, clickable):
+        clickable = bool(clickable and self.click_callback)
+        if clickable == self.clickable:
+            return
+        self.clickable = clickable
+        if not clickable:
+            self.configure(relief=tk.RAISED)
+    
+    def _on_click(self, event):
+        if self.clickable:
+            self.click_callback(self.card)
+
+class CardImageCache:
+    """Renders every card body once; all canvas items share these images"""
+    
+    def __init__(self, master):
+        self.master = master
+        self.images = {}
+    
+    def _render(self, fill, width, height, border):
+        image = tk.PhotoImage(master=self.master, width=width, height=height)
+        image.put(border, to=(0, 0, width, height))
+        image.put(fill, to=(2, 2, width - 2, height - 2))
+        return image
+    
+    def card(self, card, scale=1.0, playable=False):
+        # The symbol is drawn as a text item on top, so the body only
+        # depends on the color (Tk cannot rasterize text into a PhotoImage)
+        key = (card.color, scale, playable)
+        image = self.images.get(key)
+        if image is None:
+            bg_color, _ = card_colors(card)
+            border = "#FFFFFF" if playable else "#202020"
+            image = self._render(bg_color, int(80 * scale), int(120 * scale), border)
+            self.images[key] = image
+        return image
+    
+    def back(self):
+        image = self.images.get("back")
+        if image is None:
+            image = self._render("#333333", 50, 80, "#202020")
+            self.images["back"] = image
+        return image
+
+class CanvasCardItem:
+    """An image and a text item on the table canvas that can show any card"""
+    
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.image_id = canvas.create_image(0, 0, anchor=tk.NW, state="hidden")
+        self.text_id = canvas.create_text(0, 0, state="hidden")
+        self.card = None
+        self.scale = 1.0
+        self.playable = False
+        self.visible = False
+        self.bbox = (0, 0, 0, 0)
+    
+    def show(self, card, x, y, scale=1.0, playable=False):
+        width, height = int(80 * scale), int(120 * scale)
+        if card is not self.card or scale != self.scale or playable != self.playable:
+            _, fg_color = card_colors(card)
+            self.canvas.itemconfigure(self.image_id,
+                                      image=self.canvas.images.card(card, scale, playable))
+            self.canvas.itemconfigure(self.text_id, text=card_text(card), fill=fg_color,
+                                      font=card_font(card, scale))
+            self.card, self.scale, self.playable = card, scale, playable
+        if self.bbox != (x, y, x + width, y + height):
+            self.canvas.coords(self.image_id, x, y)
+            self.canvas.coords(self.text_id, x + width / 2, y + height / 2)
+            self.bbox = (x, y, x + width, y + height)
+        if not self.visible:
+            self.canvas.itemconfigure(self.image_id, state="normal")
+            self.canvas.itemconfigure(self.text_id, state="normal")
+            self.visible = True
+    
+    def hide(self):
+        if self.visible:
+            self.canvas.itemconfigure(self.image_id, state="hidden")
+            self.canvas.itemconfigure(self.text_id, state="hidden")
+            self.visible = False
+    
+    def contains(self, x, y):
+        x1, y1, x2, y2 = self.bbox
+        return self.visible and x1 <= x < x2 and y1 <= y < y2
+
+class CanvasTable(tk.Canvas):
+    """
+    Draws computer backs, history fan, top card and the hand as items on
+    one canvas. Items are pooled and only reconfigured when their card
+    changes; clicks are resolved by hit-testing the hand slots.
+    """
+    width = 1160
+    height = 560
+    hand_y = 400
+    hand_pitch = 90
+    hand_capacity = 12
+    top_card_position = (width / 2 + 40, 220)
+    computer_position = (width / 2 - 40, 40)
+    
+    def __init__(self, parent, click_callback, scroll_callback=None):
+        super().__init__(parent, width=self.width, height=self.height,
+                         bg="#006400", highlightthickness=0)
+        self.click_callback = click_callback
+        self.scroll_callback = scroll_callback
+        self.hand_offset = 0
+        self.images = CardImageCache(self)
+        self.can_play = False
         
-        if clickable and click_callback:
-            self.bind("<Button-1>", lambda e: click_callback(card))
-            label.bind("<Button-1>", lambda e: click_callback(card))
-            self.bind("<Enter>", lambda e: self.configure(relief=tk.GROOVE))
-            self.bind("<Leave>", lambda e: self.configure(relief=tk.RAISED))
+        self.create_text(self.width / 2, 280, text="→", font=("Arial", 24), fill="white")
+        self.create_text(self.width / 2, self.hand_y - 25, text="Deine Karten:",
+                         font=("Arial", 16), fill="white")
+        self.back_ids = []
+        self.history_items = [CanvasCardItem(self) for _ in range(3)]
+        self.top_card_item = CanvasCardItem(self)
+        self.hand_items = [CanvasCardItem(self) for _ in range(self.hand_capacity)]
+        # Every flying card has its own item; finished ones are reused
+        self.spare_flying_items = []
+        self.cards_landing = 0
+        
+        arrow_y = self.hand_y + 60
+        self.left_arrow = self.create_text(20, arrow_y, text="◀", font=("Arial", 24),
+                                           fill="white", state="hidden")
+        self.right_arrow = self.create_text(self.width - 20, arrow_y, text="▶",
+                                            font=("Arial", 24), fill="white", state="hidden")
+        
+        self.bind("<Button-1>", self._on_click)
+    
+    def render(self, game, can_play):
+        self.can_play = can_play
+        computer = game.players[1]
+        self._render_backs(min(len(computer.hand), 10))
+        
+        # Cards still flying to the discard pile are not shown on it before they land
+        pile = game.discard_pile[:max(1, len(game.discard_pile) - self.cards_landing)]
+        history_count = min(3, len(pile) - 1)
+        history_cards = pile[-(history_count+1):-1] if history_count > 0 else []
+        for i, item in enumerate(self.history_items):
+            if i < len(history_cards):
+                item.show(history_cards[i], self.width / 2 - 200 + i * 30, 244, scale=0.6)
+            else:
+                item.hide()
+        
+        if pile:
+            self.top_card_item.show(pile[-1], *self.top_card_position)
+        
+        self._render_hand(game)
+    
+    def _render_backs(self, count):
+        back = self.images.back()
+        x0 = (self.width - count * 54) / 2
+        while len(self.back_ids) < count:
+            self.back_ids.append(self.create_image(0, 0, anchor=tk.NW, image=back))
+        for i, back_id in enumerate(self.back_ids):
+            if i < count:
+                self.coords(back_id, x0 + i * 54, 40)
+                self.itemconfigure(back_id, state="normal")
+            else:
+                self.itemconfigure(back_id, state="hidden")
+    
+    def _render_hand(self, game):
+        player = game.players[0]
+        top_card = game.get_top_card()
+        
+        # A fixed pool of items shows a window of the hand, however large it is
+        self.hand_offset = max(0, min(self.hand_offset, len(player.hand) - self.hand_capacity))
+        visible = player.hand[self.hand_offset:self.hand_offset + self.hand_capacity]
+        
+        x0 = (self.width - len(visible) * self.hand_pitch + 10) / 2
+        for i, item in enumerate(self.hand_items):
+            if i < len(visible):
+                card = visible[i]
+                playable = card.can_play_on(top_card, game.declared_color)
+                item.show(card, x0 + i * self.hand_pitch, self.hand_y, playable=playable)
+            else:
+                item.hide()
+        
+        can_scroll_left = self.hand_offset > 0
+        can_scroll_right = self.hand_offset + self.hand_capacity < len(player.hand)
+        self.itemconfigure(self.left_arrow, state="normal" if can_scroll_left else "hidden")
+        self.itemconfigure(self.right_arrow, state="normal" if can_scroll_right else "hidden")
+    
+    def hand_card_position(self, card):
+        for item in self.hand_items:
+            if item.visible and item.card is card:
+                return item.bbox[:2]
+        return None
+    
+    def fly_card(self, card, start, end, frames=12, landed=None):
+        """
+        Animation steps that move a copy of card from start to the discard
+        pile at end; landed() is called once it arrives
+        """
+        item = self.spare_flying_items.pop() if self.spare_flying_items else CanvasCardItem(self)
+        self.cards_landing += 1
+        try:
+            (x0, y0), (x1, y1) = start, end
+            for frame in range(1, frames + 1):
+                t = frame / frames
+                item.show(card, x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+                self.tag_raise(item.image_id)
+                self.tag_raise(item.text_id)
+                yield
+        finally:
+            # Also when the animation is dropped, e.g. by a new game
+            item.hide()
+            self.spare_flying_items.append(item)
+            self.cards_landing -= 1
+        if landed is not None:
+            landed()
+    
+    def hand_card_at(self, x, y):
+        for item in self.hand_items:
+            if item.contains(x, y):
+                return item
+        return None
+    
+    def _on_click(self, event):
+        x, y = self.canvasx(event.x), self.canvasy(event.y)
+        if self.scroll_callback and self.hand_y <= y < self.hand_y + 120:
+            if x < 40 and self.itemcget(self.left_arrow, "state") == "normal":
+                self.scroll_callback(-1)
+                return
+            if x >= self.width - 40 and self.itemcget(self.right_arrow, "state") == "normal":
+                self.scroll_callback(1)
+                return
+        
+        item = self.hand_card_at(x, y)
+        if item and item.playable and self.can_play:
+            self.click_callback(item.card)
+
+class FrameScheduler:
+    """
+    Runs queued GUI work in frames: messages are shown one after another
+    for at least message_ms each, animations advance one step per frame
+    while the frame budget lasts, and any number of redraw requests
+    collapse into a single redraw per frame.
+    """
+    frame_ms = 16
+    budget_ms = 8
+    message_ms = 1000
+    message_clear_ms = 3000
+    
+    def __init__(self, root, redraw, show_text):
+        self.root = root
+        self.redraw = redraw
+        self.show_text = show_text
+        self.messages = deque()
+        self.animations = deque()
+        self.dirty = False
+        self.frame_id = None
+        self.frame_due = None
+        self.next_message_at = 0.0
+        self.clear_message_at = None
+    
+    def post_message(self, text):
+        self.messages.append(text)
+        self._wake(0)
+    
+    def request_redraw(self):
+        self.dirty = True
+        self._wake(self.frame_ms)
+    
+    def animate(self, steps):
+        """Run an iterator that moves things one step each time it is advanced"""
+        self.animations.append(iter(steps))
+        self._wake(self.frame_ms)
+    
+    def clear(self):
+        self.messages.clear()
+        self.animations.clear()
+        self.clear_message_at = None
+        self.next_message_at = 0.0
+    
+    def _wake(self, delay_ms):
+        due = time.monotonic() + delay_ms / 1000
+        if self.frame_id is not None:
+            if self.frame_due <= due:
+                return
+            self.root.after_cancel(self.frame_id)
+        self.frame_due = due
+        self.frame_id = self.root.after(delay_ms, self._run_frame)
+    
+    def _run_frame(self):
+        self.frame_id = None
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        now = time.monotonic()
+        
+        if self.messages and now >= self.next_message_at:
+            self.show_text(self.messages.popleft())
+            self.next_message_at = now + self.message_ms / 1000
+            self.clear_message_at = now + self.message_clear_ms / 1000
+        elif not self.messages and self.clear_message_at is not None and now >= self.clear_message_at:
+            self.show_text("")
+            self.clear_message_at = None
+        
+        # Animations that do not fit into this frame's budget continue in the next one
+        for _ in range(len(self.animations)):
+            if time.perf_counter() >= deadline:
+                break
+            animation = self.animations.popleft()
+            try:
+                next(animation)
+            except StopIteration:
+                continue
+            self.animations.append(animation)
+        
+        if self.dirty:
+            self.dirty = False
+            self.redraw()
+        
+        if self.animations:
+            self._wake(self.frame_ms)
+        elif self.messages:
+            self._wake(max(self.frame_ms, int((self.next_message_at - now) * 1000)))
+        elif self.clear_message_at is not None:
+            self._wake(max(self.frame_ms, int((self.clear_message_at - now) * 1000)))
 
 class ColorSelectionDialog(tk.Toplevel):
     def __init__(self, parent):
@@ -85,20 +427,46 @@ class ColorSelectionDialog(tk.Toplevel):
         self.destroy()
 
 class UnoGUI:
-    def __init__(self, root):
+    # Minimum time a computer turn stays visible, including its thinking time
+    computer_min_delay_ms = 1500
+    computer_poll_ms = 50
+    # Number of hand cards that get a widget at the same time
+    hand_capacity = 11
+    
+    def __init__(self, root, renderer="widgets", save_path=None, opponent="ComputerPlayer"):
         self.root = root
+        self.renderer = renderer
+        self.save_path = save_path
+        self.opponent = opponent  # strategy name, see uno_players.create_player
+        self.table = None
         self.root.title("UNO Spiel")
         self.root.geometry("1200x800")
         self.root.configure(bg="#006400")
         
         self.game = None
         self.player_card_frames = []
+        self.spare_card_frames = []
+        self.hand_offset = 0
+        self.computer_card_backs = []
+        self.history_card_widgets = []
+        self.top_card_widget = None
         self.selected_card = None
         self.can_play = True
-        self.message_timer = None
+        self.computer_decisions = queue.Queue()
+        self.computer_worker = None
+        self.computer_turn_token = 0
         
         self.setup_ui()
-        self.new_game()
+        self.scheduler = FrameScheduler(self.root, self.update_display,
+                                        lambda text: self.message_label.config(text=text))
+        
+        if self.save_path and os.path.exists(self.save_path) and \
+                messagebox.askyesno("Spiel fortsetzen?", "Gespeichertes Spiel fortsetzen?"):
+            self.resume_game()
+        else:
+            self.new_game()
+        if self.save_path:
+            self.root.protocol("WM_DELETE_WINDOW", self.quit)
     
     def setup_ui(self):
         self.title_font = tkfont.Font(family="Arial", size=24, weight="bold")
@@ -115,6 +483,10 @@ class UnoGUI:
                                     bg="#006400", fg="white")
         self.status_label.pack()
         
+        if self.renderer == "canvas":
+            self.setup_canvas_ui()
+            return
+        
         self.computer_frame = tk.Frame(self.root, bg="#006400", height=150)
         self.computer_frame.pack(side=tk.TOP, fill=tk.X, padx=20, pady=10)
         self.computer_frame.pack_propagate(False)
@@ -185,72 +557,108 @@ class UnoGUI:
         self.player_frame = tk.Frame(self.root, bg="#006400", height=150)
         self.player_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=20, pady=10)
         
-        tk.Label(self.player_frame, text="Deine Karten:",
-                font=("Arial", 16), bg="#006400", fg="white").pack()
+        self.hand_label = tk.Label(self.player_frame, text="Deine Karten:",
+                                  font=("Arial", 16), bg="#006400", fg="white")
+        self.hand_label.pack()
+        
+        hand_row = tk.Frame(self.player_frame, bg="#006400")
+        hand_row.pack(pady=10)
+        
+        self.hand_left_button = tk.Button(hand_row, text="◀", width=2, height=6,
+                                         state=tk.DISABLED,
+                                         command=lambda: self.scroll_hand(-1))
+        self.hand_left_button.pack(side=tk.LEFT, padx=5)
+        
+        self.player_cards_frame = tk.Frame(hand_row, bg="#006400")
+        self.player_cards_frame.pack(side=tk.LEFT)
         
-        self.player_cards_frame = tk.Frame(self.player_frame, bg="#006400")
-        self.player_cards_frame.pack(pady=10)
+        self.hand_right_button = tk.Button(hand_row, text="▶", width=2, height=6,
+                                          state=tk.DISABLED,
+                                          command=lambda: self.scroll_hand(1))
+        self.hand_right_button.pack(side=tk.LEFT, padx=5)
     
-    def new_game(self):
-        self.game = Game()
-        self.game.players = [
-            HumanPlayer("Spieler"),
-            ComputerPlayer("Computer")
-        ]
+    def setup_canvas_ui(self):
+        self.computer_info = tk.Label(self.root, text="Computer: 7 Karten",
+                                     font=("Arial", 16), bg="#006400", fg="white")
+        self.computer_info.pack(side=tk.TOP)
         
-        for player in self.game.players:
-            for _ in range(7):
-                player.draw_card(self.game.deck)
+        self.table = CanvasTable(self.root, click_callback=self.play_hand_card,
+                                 scroll_callback=self.scroll_hand)
+        self.table.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         
-        first_card = self.game.deck.draw()
-        while first_card.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
-            self.game.deck.cards.insert(0, first_card)
-            self.game.deck.shuffle()
-            first_card = self.game.deck.draw()
+        control_frame = tk.Frame(self.root, bg="#006400")
+        control_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=20, pady=10)
         
-        self.game.discard_pile.append(first_card)
+        self.draw_button = tk.Button(control_frame, text="ZIEHEN",
+                                    bg="#333333", fg="white", width=10, height=2,
+                                    font=("Arial", 16, "bold"),
+                                    command=self.draw_card)
+        self.draw_button.pack(side=tk.LEFT, padx=20)
+        
+        self.color_indicator = tk.Label(control_frame, text="",
+                                       font=("Arial", 12), bg="#006400", fg="white")
+        self.color_indicator.pack(side=tk.LEFT, padx=20)
+        
+        self.uno_button = tk.Button(control_frame, text="UNO!",
+                                   bg="#FF0000", fg="white", width=10, height=2,
+                                   font=("Arial", 20, "bold"),
+                                   command=self.call_uno)
+        self.uno_button.pack(side=tk.RIGHT, padx=20)
+        
+        self.message_label = tk.Label(control_frame, text="", wraplength=300,
+                                     font=("Arial", 12), bg="#006400", fg="yellow")
+        self.message_label.pack(side=tk.RIGHT, padx=20)
+    
+    def new_game(self):
+        # Drop any computer decision still in flight for the previous game
+        self.computer_turn_token += 1
+        self.scheduler.clear()
+        
+        # Reuse the game with its deck and players instead of building new ones
+        if self.game is None:
+            self.game = Game()
+            self.game.players = [
+                HumanPlayer("Spieler"),
+                create_player(self.opponent, "Computer")
+            ]
+        self.game.reset()
         
         self.update_display()
         self.show_message("Neues Spiel gestartet!")
     
-    def update_display(self):
-        for widget in self.computer_cards_frame.winfo_children():
-            widget.destroy()
+    def resume_game(self):
+        try:
+            self.game = load_game(self.save_path, self.game)
+        except (OSError, ValueError) as error:
+            self.new_game()
+            self.show_message(f"Spielstand nicht lesbar: {error}")
+            return
         
+        self.computer_turn_token += 1
+        self.update_display()
+        self.show_message("Gespeichertes Spiel fortgesetzt")
+        if self.game.current_player_index == 1:
+            self.can_play = False
+            self.schedule_computer_turn()
+    
+    def quit(self):
+        # Keep the game for the next start; a finished game was already replaced by a new one
+        try:
+            save_game(self.game, self.save_path)
+        except OSError as error:
+            print(f"Spielstand konnte nicht gespeichert werden: {error}")
+        self.root.destroy()
+    
+    def update_display(self):
         computer = self.game.players[1]
         self.computer_info.config(text=f"Computer: {len(computer.hand)} Karten")
         
-        for i in range(min(len(computer.hand), 10)):
-            back = tk.Frame(self.computer_cards_frame, bg="#333333", 
-                           width=50, height=80, relief=tk.RAISED, borderwidth=2)
-            back.pack(side=tk.LEFT, padx=2)
-        
-        # Update discard pile history
-        for widget in self.history_cards_frame.winfo_children():
-            widget.destroy()
-        for widget in self.discard_pile_widget.winfo_children():
-            widget.destroy()
+        player = self.game.players[0]
         
-        if self.game.discard_pile:
-            # Show last 3-4 cards as history (scaled down and overlapped)
-            history_count = min(3, len(self.game.discard_pile) - 1)
-            if history_count > 0:
-                history_cards = self.game.discard_pile[-(history_count+1):-1]
-                for i, card in enumerate(history_cards):
-                    # Create smaller cards for history
-                    card_widget = CardWidget(self.history_cards_frame, card, scale=0.6)
-                    card_widget.configure(relief=tk.FLAT, borderwidth=1)
-                    
-                    # Use place() for overlapping effect instead of pack()
-                    if i == 0:
-                        card_widget.pack(side=tk.LEFT, padx=(0, 5))
-                    else:
-                        # Place subsequent cards overlapping the previous ones
-                        card_widget.place(x=i*30, y=0)
-            
-            # Show current top card
-            top_card = self.game.get_top_card()
-            CardWidget(self.discard_pile_widget, top_card).pack()
+        if self.table is not None:
+            self.table.render(self.game, self.can_play)
+        else:
+            self._update_card_widgets(computer, player)
         
         if self.game.declared_color:
             color_names = {
@@ -263,29 +671,138 @@ class UnoGUI:
         else:
             self.color_indicator.config(text="")
         
-        for widget in self.player_cards_frame.winfo_children():
-            widget.destroy()
-        
-        self.player_card_frames = []
-        player = self.game.players[0]
-        
         # Update UNO button state
         if player.has_uno():
             self.uno_button.config(state=tk.NORMAL)
         else:
             self.uno_button.config(state=tk.DISABLED)
         
-        for i, card in enumerate(player.hand):
-            can_play = card.can_play_on(self.game.get_top_card(), self.game.declared_color)
-            card_widget = CardWidget(self.player_cards_frame, card, 
-                                   clickable=can_play and self.can_play,
-                                   click_callback=lambda c, idx=i: self.play_card(idx))
-            card_widget.pack(side=tk.LEFT, padx=5)
-            self.player_card_frames.append(card_widget)
-        
         current_player = self.game.players[self.game.current_player_index]
         self.status_label.config(text=f"{current_player.name} ist am Zug")
     
+    def _update_card_widgets(self, computer, player):
+        # Reconcile the existing widgets with the game state instead of
+        # destroying and recreating them on every call
+        self._update_computer_backs(min(len(computer.hand), 10))
+        
+        if self.game.discard_pile:
+            # Show last 3-4 cards as history (scaled down and overlapped)
+            history_count = min(3, len(self.game.discard_pile) - 1)
+            history_cards = self.game.discard_pile[-(history_count+1):-1] if history_count > 0 else []
+            self._update_history(history_cards)
+            
+            # Show current top card
+            top_card = self.game.get_top_card()
+            if self.top_card_widget is None:
+                self.top_card_widget = CardWidget(self.discard_pile_widget, top_card)
+                self.top_card_widget.pack()
+            else:
+                self.top_card_widget.set_card(top_card)
+        
+        self._update_hand(player.hand)
+    
+    def _update_computer_backs(self, count):
+        while len(self.computer_card_backs) > count:
+            self.computer_card_backs.pop().destroy()
+        while len(self.computer_card_backs) < count:
+            back = tk.Frame(self.computer_cards_frame, bg="#333333", 
+                           width=50, height=80, relief=tk.RAISED, borderwidth=2)
+            back.pack(side=tk.LEFT, padx=2)
+            self.computer_card_backs.append(back)
+    
+    def _update_history(self, history_cards):
+        while len(self.history_card_widgets) > len(history_cards):
+            self.history_card_widgets.pop().destroy()
+        
+        for i, card in enumerate(history_cards):
+            if i < len(self.history_card_widgets):
+                self.history_card_widgets[i].set_card(card)
+                continue
+            
+            # Create smaller cards for history
+            card_widget = CardWidget(self.history_cards_frame, card, scale=0.6)
+            card_widget.configure(relief=tk.FLAT, borderwidth=1)
+            
+            # Use place() for overlapping effect instead of pack()
+            if i == 0:
+                card_widget.pack(side=tk.LEFT, padx=(0, 5))
+            else:
+                # Place subsequent cards overlapping the previous ones
+                card_widget.place(x=i*30, y=0)
+            self.history_card_widgets.append(card_widget)
+    
+    def _update_hand(self, hand):
+        top_card = self.game.get_top_card()
+        
+        # Only the visible window of the hand gets widgets, so the cost of a
+        # redraw does not grow with the number of cards
+        self.hand_offset = max(0, min(self.hand_offset, len(hand) - self.hand_capacity))
+        visible = hand[self.hand_offset:self.hand_offset + self.hand_capacity]
+        
+        # Widgets are keyed by card identity, so playing or drawing a card
+        # only touches the widget of that card
+        existing = {id(widget.card): widget for widget in self.player_card_frames}
+        matched = [existing.pop(id(card), None) for card in visible]
+        
+        # Widgets whose card left the window are recycled, not destroyed
+        for card_widget in existing.values():
+            card_widget.pack_forget()
+            self.spare_card_frames.append(card_widget)
+        
+        widgets = []
+        for card, card_widget in zip(visible, matched):
+            can_play = self.can_play and card.can_play_on(top_card, self.game.declared_color)
+            if card_widget is None and self.spare_card_frames:
+                card_widget = self.spare_card_frames.pop()
+                card_widget.set_card(card)
+            if card_widget is None:
+                card_widget = CardWidget(self.player_cards_frame, card,
+                                       clickable=can_play,
+                                       click_callback=self.play_hand_card)
+            else:
+                card_widget.set_clickable(can_play)
+            widgets.append(card_widget)
+        
+        # Only repack when the order of the surviving widgets changed
+        kept = [w for w in self.player_card_frames if w not in existing.values()]
+        if widgets[:len(kept)] != kept:
+            for card_widget in kept:
+                card_widget.pack_forget()
+            kept = []
+        for card_widget in widgets[len(kept):]:
+            card_widget.pack(side=tk.LEFT, padx=5)
+        
+        self.player_card_frames = widgets
+        self._update_hand_scroll(len(hand))
+    
+    def _update_hand_scroll(self, hand_size):
+        can_scroll_left = self.hand_offset > 0
+        can_scroll_right = self.hand_offset + self.hand_capacity < hand_size
+        self.hand_left_button.config(state=tk.NORMAL if can_scroll_left else tk.DISABLED)
+        self.hand_right_button.config(state=tk.NORMAL if can_scroll_right else tk.DISABLED)
+        
+        if hand_size > self.hand_capacity:
+            last = min(self.hand_offset + self.hand_capacity, hand_size)
+            self.hand_label.config(text=f"Deine Karten: {self.hand_offset + 1}–{last} von {hand_size}")
+        else:
+            self.hand_label.config(text="Deine Karten:")
+    
+    def scroll_hand(self, direction):
+        if self.table is not None:
+            step = max(1, self.table.hand_capacity // 2)
+            self.table.hand_offset = max(0, self.table.hand_offset + direction * step)
+        else:
+            step = max(1, self.hand_capacity // 2)
+            self.hand_offset = max(0, self.hand_offset + direction * step)
+        self.update_display()
+    
+    def play_hand_card(self, card):
+        player = self.game.players[0]
+        for i, hand_card in enumerate(player.hand):
+            if hand_card is card:
+                self.play_card(i)
+                return
+    
     def play_card(self, card_index):
         if not self.can_play:
             return
@@ -302,6 +819,8 @@ class UnoGUI:
         
         self.can_play = False
         
+        if self.table is not None:
+            self.animate_play(card, self.table.hand_card_position(card))
         played_card = player.play_card(card_index)
         self.game.discard_pile.append(played_card)
         self.game.declared_color = None
@@ -320,7 +839,7 @@ class UnoGUI:
         if card.card_type != CardType.NUMBER:
             self.handle_action_card(card)
         
-        self.update_display()
+        self.request_redraw()
         
         if len(player.hand) == 0:
             messagebox.showinfo("Gewonnen!", "Du hast gewonnen! 🎉")
@@ -328,7 +847,7 @@ class UnoGUI:
             return
         
         self.game.current_player_index = (self.game.current_player_index + self.game.direction) % 2
-        self.root.after(1500, self.computer_turn)
+        self.schedule_computer_turn()
     
     def handle_action_card(self, card):
         next_player_index = (self.game.current_player_index + self.game.direction) % 2
@@ -354,11 +873,77 @@ class UnoGUI:
                 next_player.draw_card(self.game.deck)
             self.game.current_player_index = next_player_index
     
-    def computer_turn(self):
+    def schedule_computer_turn(self):
+        """Let the computer decide its whole move on a worker thread, then play it"""
         computer = self.game.players[1]
-        self.update_display()
+        top_card, declared_color = self.game.get_top_card(), self.game.declared_color
+        
+        def decide():
+            card_index = computer.choose_card(top_card, declared_color)
+            color = None
+            if card_index is not None and computer.hand[card_index].color == Color.WILD:
+                color = computer.choose_color()
+            return card_index, color
+        
+        self.run_computer_decision(decide, lambda move: self.computer_turn(*(move or (None, None))),
+                                   self.computer_min_delay_ms)
+    
+    def run_computer_decision(self, decide, finish, min_delay_ms=0):
+        """Run decide() on a worker thread and poll for its result, which finish() gets on the Tk thread"""
+        self.computer_turn_token += 1
+        token = self.computer_turn_token
+        
+        self.computer_worker = threading.Thread(target=self._decide_computer_move,
+                                                args=(token, decide), daemon=True)
+        self.computer_worker.start()
+        self.root.after(self.computer_poll_ms, self._poll_computer_turn, token, time.monotonic(),
+                        finish, min_delay_ms)
+    
+    def _decide_computer_move(self, token, decide):
+        # Runs on the worker thread: only read game state, never touch Tk
+        try:
+            result = decide()
+        except Exception as error:
+            self.computer_decisions.put((token, None, error))
+        else:
+            self.computer_decisions.put((token, result, None))
+    
+    def _poll_computer_turn(self, token, started, finish, min_delay_ms):
+        if token != self.computer_turn_token:
+            return  # A new game was started while the computer was thinking
+        
+        decision = None
+        while True:
+            try:
+                queued = self.computer_decisions.get_nowait()
+            except queue.Empty:
+                break
+            if queued[0] == token:
+                decision = queued
+        
+        if decision is None:
+            self.root.after(self.computer_poll_ms, self._poll_computer_turn, token, started,
+                            finish, min_delay_ms)
+            return
+        
+        _, result, error = decision
+        if error is not None:
+            self.show_message(f"Computer-Fehler: {error}")
         
-        card_index = computer.choose_card(self.game.get_top_card(), self.game.declared_color)
+        remaining_ms = min_delay_ms - int((time.monotonic() - started) * 1000)
+        if remaining_ms > 0:
+            self.root.after(remaining_ms, self._finish_computer_turn, token, finish, result)
+        else:
+            self._finish_computer_turn(token, finish, result)
+    
+    def _finish_computer_turn(self, token, finish, result):
+        if token == self.computer_turn_token:
+            finish(result)
+    
+    def computer_turn(self, card_index, color=None):
+        """Play the move decided on the worker: a hand index (None = draw) and the color for a wild card"""
+        computer = self.game.players[1]
+        self.request_redraw()
         
         if card_index is None:
             self.show_message("Computer zieht eine Karte")
@@ -366,33 +951,54 @@ class UnoGUI:
             
             if drawn_card and drawn_card.can_play_on(self.game.get_top_card(), self.game.declared_color):
                 self.show_message(f"Computer spielt gezogene Karte: {drawn_card}")
+                # The drawn card is the last one in the hand
+                computer.play_card(len(computer.hand) - 1)
+                self.animate_computer_play(drawn_card)
                 self.game.discard_pile.append(drawn_card)
                 self.game.declared_color = None
+                self.computer_check_uno()
                 
                 if drawn_card.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
-                    self.game.declared_color = computer.choose_color()
-                    self.show_message(f"Computer wählt: {self.game.declared_color.value}")
-                
-                if drawn_card.card_type != CardType.NUMBER:
-                    self.handle_action_card(drawn_card)
+                    # The drawn card was unknown when the move was decided, so its color is decided now
+                    self.run_computer_decision(computer.choose_color,
+                                               lambda color: self.computer_card_played(drawn_card, color))
+                    return
+                self.computer_card_played(drawn_card)
+                return
         else:
             card = computer.play_card(card_index)
             self.show_message(f"Computer spielt: {card}")
+            self.animate_computer_play(card)
             self.game.discard_pile.append(card)
             self.game.declared_color = None
-            
-            if computer.has_uno() and random.random() > 0.1:
-                computer.call_uno()
-                self.show_message("Computer ruft UNO!")
-            
-            if card.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
-                self.game.declared_color = computer.choose_color()
-                self.show_message(f"Computer wählt: {self.game.declared_color.value}")
-            
-            if card.card_type != CardType.NUMBER:
-                self.handle_action_card(card)
+            self.computer_check_uno()
+            self.computer_card_played(card, color)
+            return
         
-        self.update_display()
+        self.end_computer_turn()
+    
+    def computer_check_uno(self):
+        """Let the computer's strategy decide whether it calls UNO, as Game.play_from_hand does"""
+        computer = self.game.players[1]
+        if computer.has_uno() and computer.wants_uno_call():
+            computer.call_uno()
+            self.show_message("Computer ruft UNO!")
+    
+    def computer_card_played(self, card, color=None):
+        """Apply the effects of the card the computer just played"""
+        if card.card_type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
+            # Without a decision (the strategy failed) the most common color in hand
+            self.game.declared_color = color or self.game.players[1].majority_color()
+            self.show_message(f"Computer wählt: {self.game.declared_color.value}")
+        
+        if card.card_type != CardType.NUMBER:
+            self.handle_action_card(card)
+        
+        self.end_computer_turn()
+    
+    def end_computer_turn(self):
+        computer = self.game.players[1]
+        self.request_redraw()
         
         if len(computer.hand) == 0:
             messagebox.showinfo("Verloren!", "Der Computer hat gewonnen!")
@@ -411,7 +1017,7 @@ class UnoGUI:
         
         if drawn_card:
             self.show_message(f"Gezogen: {drawn_card}")
-            self.update_display()
+            self.request_redraw()
             
             if drawn_card.can_play_on(self.game.get_top_card(), self.game.declared_color):
                 response = messagebox.askyesno("Karte spielen?", 
@@ -423,7 +1029,7 @@ class UnoGUI:
         
         self.can_play = False
         self.game.current_player_index = 1
-        self.root.after(1500, self.computer_turn)
+        self.schedule_computer_turn()
     
     def call_uno(self):
         player = self.game.players[0]
@@ -437,17 +1043,29 @@ class UnoGUI:
             self.show_message("UNO vergessen! 2 Strafkarten!")
             for _ in range(2):
                 player.draw_card(self.game.deck)
-            self.update_display()
+            self.request_redraw()
     
     def show_message(self, message):
-        # Cancel previous timer if exists
-        if self.message_timer:
-            self.root.after_cancel(self.message_timer)
-        
-        self.message_label.config(text=message)
-        self.message_timer = self.root.after(3000, lambda: self.message_label.config(text=""))
+        # Messages are queued so back-to-back events are all shown
+        self.scheduler.post_message(message)
+    
+    def request_redraw(self):
+        self.scheduler.request_redraw()
+    
+    def animate_play(self, card, start):
+        if self.table is None or start is None:
+            return
+        self.scheduler.animate(self.table.fly_card(card, start, self.table.top_card_position,
+                                                   landed=self.request_redraw))
+    
+    def animate_computer_play(self, card):
+        if self.table is not None:
+            self.animate_play(card, self.table.computer_position)
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = UnoGUI(root)
+    # --gegner NAME picks the computer's strategy, e.g. Anfänger or Profi
+    opponent = sys.argv[sys.argv.index("--gegner") + 1] if "--gegner" in sys.argv[:-1] else "ComputerPlayer"
+    app = UnoGUI(root, renderer="canvas" if "--canvas" in sys.argv else "widgets",
+                 save_path=os.path.join(os.path.expanduser("~"), ".uno_spielstand.bin"), opponent=opponent)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Append-only write-ahead journal with group commit.
+
+Records from many concurrent games are buffered for at most max_delay
+seconds (or until max_batch records are waiting), written in one go and
+made durable with a single fsync. Every appender awaits the commit of its
+batch, so a move is only acknowledged once it is on disk, but the cost of
+an fsync is shared by all games that moved in the same window.
+"""
+
+import asyncio
+import json
+import os
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class GroupCommitJournal:
+    def __init__(self, path: str, max_delay: float = 0.005, max_batch: int = 4096):
+        self.path = path
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.commits = 0
+        self.records = 0
+        self._file = None
+        self._task: Optional[asyncio.Task] = None
+        self._buffer: List[bytes] = []
+        self._waiters: List[asyncio.Future] = []
+        self._has_records = asyncio.Event()
+        self._full = asyncio.Event()
+
+    async def open(self):
+        self._file = open(self.path, "ab")
+        self._task = asyncio.ensure_future(self._run())
+
+    async def append(self, record: Dict):
+        """Queue a record and wait until the batch containing it is fsynced"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._buffer.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode() + b"\n")
+        self._waiters.append(waiter)
+        self._has_records.set()
+        if len(self._buffer) >= self.max_batch:
+            self._full.set()
+        await waiter
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._buffer:
+            await self._commit()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def _run(self):
+        while True:
+            await self._has_records.wait()
+            # Give other games up to max_delay to join this batch
+            if len(self._buffer) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            await self._commit()
+
+    async def _commit(self):
+        batch, waiters = self._buffer, self._waiters
+        self._buffer, self._waiters = [], []
+        self._has_records.clear()
+        self._full.clear()
+
+        try:
+            # New records keep collecting in the fresh buffer while this one syncs
+            await asyncio.get_running_loop().run_in_executor(None, self._write, b"".join(batch))
+        except OSError as error:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(error)
+            return
+
+        self.commits += 1
+        self.records += len(batch)
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+
+def read_journal(path: str) -> Iterator[Dict]:
+    """All complete records; a torn last line from a crash is ignored"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                yield json.loads(line)
+            except ValueError:
+                break
+
+
+def compact_journal(path: str, keep: Callable[[Dict], bool]):
+    """Atomically rewrite the journal with only the records keep() accepts"""
+    records = [record for record in read_journal(path) if keep(record)]
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode() + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
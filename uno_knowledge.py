@@ -0,0 +1,160 @@
+"""
+Card counting for computer players.
+
+A CardCounter follows the public events of one game for its owner: which
+cards are still unseen (neither in the owner's hand nor on the discard
+pile) and which colors an opponent has shown it does not hold, by drawing
+instead of playing on them. Every event costs O(1) per card involved, so
+decisions never rescan the discard history.
+"""
+
+from typing import Dict, List, Optional, Set
+
+from uno_fixed import Game, Card, Color, CardType, Player, ComputerPlayer
+from uno_players import register_player_type
+from uno_state import FACES, COLORS, face_of
+
+
+class CardCounter:
+    def __init__(self, owner: Player):
+        self.owner = owner
+        self.game: Optional[Game] = None
+        self.unseen: List[int] = [0] * len(FACES)
+        # Indexed like COLORS, wild cards last; faces come in blocks of 13 per color
+        self.unseen_by_color: List[int] = [0] * (len(COLORS) + 1)
+        # opponent -> colors it passed on and has not drawn cards since
+        self.lacking: Dict[Player, Set[Color]] = {}
+        self._faces: Dict[Card, int] = {}
+        self._composition: List[int] = []
+        self._composition_for: Optional[List[Card]] = None
+
+    def start(self, game: Game):
+        """Subscribe to game and count from its full composition"""
+        self.game = game
+        game.observers.append(self)
+        self.hands_changed()
+
+    def hands_changed(self):
+        # The composition of a deck is counted once, not every round
+        all_cards = self.game.deck.all_cards
+        if self._composition_for is not all_cards:
+            self._composition = [0] * len(FACES)
+            for card in all_cards:
+                self._composition[self._face(card)] += 1
+            self._composition_for = all_cards
+
+        self.unseen = list(self._composition)
+        self.unseen_by_color = [sum(self.unseen[i:i + 13]) for i in range(0, len(FACES), 13)]
+        self.lacking = {}
+        for card in self.owner.hand + self.game.discard_pile:
+            self._unseen(card, -1)
+
+    def _face(self, card: Card) -> int:
+        face = self._faces.get(card)
+        if face is None:
+            face = self._faces[card] = face_of(card)
+        return face
+
+    def _unseen(self, card: Card, delta: int):
+        face = self._face(card)
+        self.unseen[face] += delta
+        self.unseen_by_color[face // 13] += delta
+
+    def unseen_of_color(self, color: Color) -> int:
+        return self.unseen_by_color[COLORS.index(color) if color in COLORS else len(COLORS)]
+
+    def saw_drawn(self, card: Card):
+        self._unseen(card, -1)
+
+    def card_played(self, player: Player, card: Card):
+        if player is not self.owner:
+            self._unseen(card, -1)
+
+    def cards_recycled(self, cards: List[Card]):
+        # Back in the deck, these are somewhere unknown again
+        for card in cards:
+            self._unseen(card, 1)
+
+    def cards_drawn(self, player: Player, count: int):
+        # Any card drawn later may be of a color the player lacked
+        self.lacking.pop(player, None)
+
+    def passed(self, player: Player, top_card: Card, declared_color: Optional[Color]):
+        # Told after the cards of the pass itself are drawn, so those do not clear it
+        if player is not self.owner:
+            self.lacking.setdefault(player, set()).add(declared_color or top_card.color)
+
+    def lacks(self, player: Player, color: Color) -> bool:
+        """True while player has drawn no card since it passed on that color"""
+        return color in self.lacking.get(player, ())
+
+    def next_player(self) -> Player:
+        game = self.game
+        return game.players[(game.players.index(self.owner) + game.direction) % len(game.players)]
+
+
+@register_player_type
+class CountingComputerPlayer(ComputerPlayer):
+    """
+    ComputerPlayer that counts cards: it plays and calls colors the next
+    player has shown it lacks, and sheds high-scoring cards first.
+    """
+
+    def __init__(self, name: str, **params):
+        super().__init__(name, **params)
+        self.counter = CardCounter(self)
+
+    def start_round(self, game: Game):
+        super().start_round(game)
+        self.counter.start(game)
+
+    def draw_card(self, deck) -> Optional[Card]:
+        card = super().draw_card(deck)
+        if card and self.counter.game is not None:
+            self.counter.saw_drawn(card)
+        return card
+
+    def choose_card(self, top_card: Card, declared_color: Optional[Color] = None) -> Optional[int]:
+        if self.counter.game is None:
+            return super().choose_card(top_card, declared_color)
+        endgame_index = self.endgame_move(top_card, declared_color)
+        if endgame_index is not None:
+            return endgame_index
+
+        playable = [i for i, card in enumerate(self.hand) if card.can_play_on(top_card, declared_color)]
+        if not playable:
+            return None
+
+        opponent = self.counter.next_player()
+        hand_size = len(self.hand)
+
+        def score(index: int) -> float:
+            card = self.hand[index]
+            value = card.points / 50
+            if card.color == Color.WILD:
+                # Keep wild cards for the end, or to stop an opponent about to win
+                return value + (4 if hand_size <= 3 or len(opponent.hand) <= 2 else -4)
+            if self.counter.lacks(opponent, card.color):
+                value += 3
+            if card.card_type != CardType.NUMBER:
+                value += 2 if len(opponent.hand) <= 2 else 1
+            return value
+
+        return max(playable, key=score)
+
+    def choose_color(self) -> Color:
+        if self.counter.game is None or self.planned_color is not None:
+            return super().choose_color()
+
+        opponent = self.counter.next_player()
+        counts = {color: 0 for color in COLORS}
+        for card in self.hand:
+            if card.color in counts:
+                counts[card.color] += 1
+
+        def score(color: Color) -> float:
+            # Few unseen cards of a color also means opponents are unlikely to hold it
+            return (counts[color] + 2 * self.counter.lacks(opponent, color)
+                    - self.counter.unseen_of_color(color) / 100)
+
+        return max(COLORS, key=score)
@@ -0,0 +1,368 @@
+"""
+Rating ladder for bots and external engines, fed one finished game at a
+time.
+
+Every entrant has a Gaussian skill estimate (mu, sigma) as in TrueSkill.
+A game updates the winner against each loser with the two-player
+TrueSkill formulas, using the ratings from before the game; games without
+a winner carry no information and are skipped. The ladder is ranked by
+the conservative rating mu - 3 sigma.
+
+Ratings live in memory and are updated as soon as a result arrives.
+Results and the changed ratings are written to SQLite in batches: after
+max_batch results or max_delay seconds, one transaction appends the
+results and replaces the ratings of all entrants that played, so the cost
+of a commit is shared by all games of the batch. The ladder has no thread
+of its own: a caller that waits for results asks wait_time() how long it
+may block and then calls flush_due(), as --feed does, so a quiet feed
+still writes its batch on time. A crash loses at most the unwritten
+batch; the ratings in the database always match the results stored with
+them.
+
+Matchmaking pairs the entrants whose game tells the most: the variance
+p (1 - p) of its outcome, for the win probability p, weighted by the share
+of the rating uncertainty in all uncertainty about the outcome. Games with
+an open outcome come first, but two equal entrants whose ratings are
+already settled give way to newcomers with a wide sigma.
+
+Any program can feed results ("python uno_ladder.py --feed < results.jsonl",
+one {"winner": ..., "losers": [...]} per line), and --play lets the
+registered computer strategies play a matchmade league.
+"""
+
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from uno_fixed import ComputerPlayer
+from uno_players import create_player, strategy_names
+from uno_tournament import Tournament
+
+MU = 25.0
+SIGMA = MU / 3
+BETA = SIGMA / 2
+# Skill may drift between games; keeps sigma from shrinking to nothing
+TAU = SIGMA / 100
+
+_normal = NormalDist()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ratings (
+    name TEXT PRIMARY KEY,
+    mu REAL NOT NULL,
+    sigma REAL NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    winner TEXT NOT NULL,
+    losers TEXT NOT NULL
+);
+"""
+
+
+class Rating:
+    __slots__ = ("mu", "sigma", "games", "wins")
+
+    def __init__(self, mu: float = MU, sigma: float = SIGMA, games: int = 0, wins: int = 0):
+        self.mu = mu
+        self.sigma = sigma
+        self.games = games
+        self.wins = wins
+
+    def conservative(self) -> float:
+        return self.mu - 3 * self.sigma
+
+
+def win_probability(a: Rating, b: Rating) -> float:
+    """Chance that a beats b"""
+    c = (2 * BETA * BETA + a.sigma * a.sigma + b.sigma * b.sigma) ** 0.5
+    return _normal.cdf((a.mu - b.mu) / c)
+
+
+def information(a: Rating, b: Rating) -> float:
+    """How much a game between a and b is expected to tell about their ratings"""
+    p = win_probability(a, b)
+    rating_var = a.sigma * a.sigma + b.sigma * b.sigma
+    return p * (1 - p) * rating_var / (2 * BETA * BETA + rating_var)
+
+
+def _update(winner: Rating, loser: Rating) -> Tuple[float, float, float, float]:
+    """
+    Shift of the winner's mu, factor of its variance, and the loser's new
+    mu and sigma after one game between them
+    """
+    winner_var = winner.sigma * winner.sigma + TAU * TAU
+    loser_var = loser.sigma * loser.sigma + TAU * TAU
+    c2 = 2 * BETA * BETA + winner_var + loser_var
+    c = c2 ** 0.5
+    t = (winner.mu - loser.mu) / c
+    # v: mean shift, w: variance reduction of the truncated Gaussian; stable for upsets far in the tail
+    cdf = _normal.cdf(t)
+    v = _normal.pdf(t) / cdf if cdf > 1e-300 else -t
+    w = v * (v + t)
+    return (winner_var / c * v, max(1 - winner_var / c2 * w, 1e-6),
+            loser.mu - loser_var / c * v, (loser_var * max(1 - loser_var / c2 * w, 1e-6)) ** 0.5)
+
+
+class Ladder:
+    def __init__(self, path: str, max_batch: int = 1000, max_delay: float = 1.0):
+        self.path = path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.commits = 0
+        self.db = sqlite3.connect(path)
+        # Readers (e.g. a dashboard) do not block the batches
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.ratings: Dict[str, Rating] = {
+            name: Rating(mu, sigma, games, wins)
+            for name, mu, sigma, games, wins in self.db.execute("SELECT name, mu, sigma, games, wins FROM ratings")}
+        self._results: List[Tuple[str, str]] = []
+        self._dirty: Set[str] = set()
+        self._first_pending = 0.0
+
+    def add(self, name: str) -> Rating:
+        """The rating of name, a fresh one for a newcomer"""
+        rating = self.ratings.get(name)
+        if rating is None:
+            rating = self.ratings[name] = Rating()
+            self._dirty.add(name)
+        return rating
+
+    def record(self, winner: Optional[str], losers: Iterable[str]):
+        """Rate a finished game; winner None for a game without winner"""
+        losers = [name for name in losers if name != winner]
+        if winner is None or not losers:
+            return
+        winning = self.add(winner)
+        updates = [_update(winning, self.add(name)) for name in losers]
+        # Simultaneous: every pairwise update starts from the ratings before the game
+        variance = winning.sigma * winning.sigma + TAU * TAU
+        for shift, factor, _, _ in updates:
+            winning.mu += shift
+            variance *= factor
+        winning.sigma = variance ** 0.5
+        winning.games += 1
+        winning.wins += 1
+        for name, (_, _, mu, sigma) in zip(losers, updates):
+            losing = self.ratings[name]
+            losing.mu, losing.sigma = mu, sigma
+            losing.games += 1
+
+        if not self._results:
+            self._first_pending = time.monotonic()
+        self._results.append((winner, json.dumps(losers, ensure_ascii=False)))
+        self._dirty.add(winner)
+        self._dirty.update(losers)
+        if len(self._results) >= self.max_batch:
+            self.flush()
+        else:
+            self.flush_due()
+
+    def wait_time(self) -> Optional[float]:
+        """Seconds until the pending batch is due, None if nothing is pending"""
+        if not self._results:
+            return None
+        return max(0.0, self._first_pending + self.max_delay - time.monotonic())
+
+    def flush_due(self):
+        """Write the pending batch if it has waited max_delay seconds"""
+        if self._results and time.monotonic() - self._first_pending >= self.max_delay:
+            self.flush()
+
+    def flush(self):
+        """Write the pending results and the ratings they changed in one transaction"""
+        if not self._results and not self._dirty:
+            return
+        rows = [(name, rating.mu, rating.sigma, rating.games, rating.wins)
+                for name, rating in ((name, self.ratings[name]) for name in self._dirty)]
+        with self.db:
+            self.db.executemany("INSERT INTO results (winner, losers) VALUES (?, ?)", self._results)
+            self.db.executemany("INSERT OR REPLACE INTO ratings (name, mu, sigma, games, wins) VALUES (?, ?, ?, ?, ?)",
+                                rows)
+        self.commits += 1
+        self._results = []
+        self._dirty = set()
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def pairings(self, names: Optional[List[str]] = None, count: int = 1) -> List[Tuple[str, str]]:
+        """
+        Up to count pairs of different entrants among names (all rated ones
+        by default), the most informative first
+        """
+        names = sorted(self.ratings if names is None else names)
+        ratings = [self.ratings.get(name) or Rating() for name in names]
+        candidates = []
+        for i in range(len(names)):
+            for j in range(i + 1, len(names)):
+                a, b = ratings[i], ratings[j]
+                candidates.append((-information(a, b), names[i], names[j]))
+        candidates.sort()
+
+        pairs, taken = [], set()
+        for _, a, b in candidates:
+            if a not in taken and b not in taken:
+                pairs.append((a, b))
+                taken.update((a, b))
+                if len(pairs) == count:
+                    break
+        return pairs
+
+    def ranking(self) -> List[Tuple[str, Rating]]:
+        return sorted(self.ratings.items(), key=lambda item: -item[1].conservative())
+
+    def report(self, top: int = 20) -> str:
+        lines = ["Rang  Wertung      mu  sigma   Spiele  Siege  Teilnehmer"]
+        for rank, (name, rating) in enumerate(self.ranking()[:top], 1):
+            share = rating.wins / rating.games * 100 if rating.games else 0.0
+            lines.append(f"{rank:>4}  {rating.conservative():7.2f}  {rating.mu:6.2f}  {rating.sigma:5.2f}  "
+                         f"{rating.games:7d}  {share:4.1f}%  {name}")
+        return "\n".join(lines)
+
+
+def league_entrants() -> List[str]:
+    """Registered strategies that a computer can play on its own"""
+    entrants = []
+    for spec in strategy_names():
+        try:
+            player = create_player(spec, spec)
+        except ValueError:
+            # A type that needs more than a name to play
+            continue
+        if isinstance(player, ComputerPlayer):
+            entrants.append(spec)
+    return entrants
+
+
+def play_league(ladder: Ladder, entrants: List[str], games: int, seed: int = 0, max_turns: int = 1000) -> int:
+    """
+    Play games two-player games between matchmade entrants and rate them;
+    every pairing plays a deal twice with the seats swapped. Returns the
+    number of games played.
+    """
+    if len(entrants) < 2:
+        raise ValueError("Eine Liga braucht mindestens zwei Teilnehmer")
+    for name in entrants:
+        ladder.add(name)
+    # One table per pairing, continuing its deals where the last visit stopped
+    tables: Dict[Tuple[str, str], Tournament] = {}
+    played = 0
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        while played < games:
+            for pair in ladder.pairings(entrants, len(entrants) // 2):
+                table = tables.get(pair)
+                if table is None:
+                    table = tables[pair] = Tournament(list(pair), 0, seed=seed, max_turns=max_turns, paired=True)
+                for _ in range(2):
+                    winner = table.play_game(table.completed)
+                    table.completed += 1
+                    names = [table.entrants[table.players.index(player)] for player in table.players]
+                    if winner is not None:
+                        name = table.entrants[table.players.index(winner)]
+                        ladder.record(name, names)
+                    played += 1
+                if played >= games:
+                    break
+    ladder.flush()
+    return played
+
+
+def parse_result(line: str) -> Tuple[Optional[str], List[str]]:
+    """Winner and losers of one feed line; ValueError for anything but {"winner": ..., "losers": [...]}"""
+    result = json.loads(line)
+    if not isinstance(result, dict):
+        raise ValueError("Ergebnis ist kein Objekt")
+    winner, losers = result.get("winner"), result.get("losers", [])
+    if winner is not None and not isinstance(winner, str):
+        raise ValueError("winner ist kein Name")
+    if not isinstance(losers, list) or not all(isinstance(name, str) for name in losers):
+        raise ValueError("losers ist keine Liste von Namen")
+    return winner, losers
+
+
+def feed(ladder: Ladder, lines: Iterable[str]) -> Tuple[int, List[int]]:
+    """
+    Record one JSON result per line; the lines are read on a thread so that
+    the pending batch is written after max_delay even while no line arrives.
+    A malformed line is skipped. Returns the number of results and the
+    numbers of the skipped lines.
+    """
+    received: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    def read():
+        for line in lines:
+            received.put(line)
+        received.put(None)
+
+    threading.Thread(target=read, daemon=True).start()
+    count = 0
+    skipped = []
+    number = 0
+    while True:
+        try:
+            line = received.get(timeout=ladder.wait_time())
+        except queue.Empty:
+            ladder.flush_due()
+            continue
+        if line is None:
+            return count, skipped
+        number += 1
+        if line.strip():
+            try:
+                winner, losers = parse_result(line)
+            except ValueError:  # includes json.JSONDecodeError
+                skipped.append(number)
+                continue
+            ladder.record(winner, losers)
+            count += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rangliste für UNO-Bots mit Partnerwahl")
+    parser.add_argument("--db", default="uno_ladder.sqlite", help="SQLite-Datenbank der Rangliste")
+    parser.add_argument("--feed", action="store_true",
+                        help='Ergebnisse von stdin lesen, je Zeile {"winner": ..., "losers": [...]}')
+    parser.add_argument("--play", type=int, default=0, metavar="N", help="N Ligaspiele der Computerstrategien")
+    parser.add_argument("entrants", nargs="*", help="Teilnehmer der Liga (Standard: alle Computerstrategien)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pairings", type=int, default=0, metavar="N", help="Die N informativsten Paarungen zeigen")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    ladder = Ladder(args.db)
+    started = time.monotonic()
+    try:
+        if args.feed:
+            count, skipped = feed(ladder, sys.stdin)
+            print(f"{count} Ergebnisse in {time.monotonic() - started:.1f} s, {ladder.commits} Commits")
+            if skipped:
+                shown = ", ".join(map(str, skipped[:10])) + (", …" if len(skipped) > 10 else "")
+                print(f"{len(skipped)} fehlerhafte Zeilen übersprungen: {shown}", file=sys.stderr)
+        if args.play:
+            played = play_league(ladder, args.entrants or league_entrants(), args.play, args.seed)
+            print(f"{played} Spiele in {time.monotonic() - started:.1f} s")
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        ladder.close()
+    print(ladder.report(args.top))
+    for a, b in ladder.pairings(count=args.pairings):
+        print(f"  {a} – {b}: {win_probability(ladder.ratings[a], ladder.ratings[b]) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Load generator for uno_server.py: opens active tables played by a simple
+bot and idle tables that only hold their connection, then reports
+throughput and server response latency.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Dict, List
+
+
+def choose_reply(message: Dict) -> str:
+    if message["type"] == "choose_card":
+        if not message["playable"]:
+            return "draw"
+        index = message["playable"][0]
+        uno = " uno" if len(message["hand"]) == 2 else ""
+        return f"play {index}{uno}"
+
+    # choose_color: the most common color name in the hand
+    colors = Counter(card.split()[0] for card in message["hand"])
+    for name, _ in colors.most_common():
+        if name in ("Rot", "Blau", "Grün", "Gelb"):
+            return f"color {name}"
+    return "color Rot"
+
+
+async def active_table(host: str, port: int, stop_at: float, stats: Dict, latencies: List[float]):
+    """Play games back to back until stop_at"""
+    while time.monotonic() < stop_at:
+        reader, writer = await asyncio.open_connection(host, port)
+        sent_at = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message["type"] in ("choose_card", "choose_color"):
+                    if sent_at is not None:
+                        latencies.append(time.monotonic() - sent_at)
+                    writer.write((choose_reply(message) + "\n").encode())
+                    await writer.drain()
+                    sent_at = time.monotonic()
+                    stats["moves"] += 1
+                elif message["type"] == "end":
+                    stats["games"] += 1
+                    break
+        finally:
+            writer.close()
+
+
+async def idle_table(host: str, port: int, stop_at: float, stats: Dict):
+    """Connect, read the welcome and then stay silent"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await reader.readline()
+        stats["idle_connected"] += 1
+        await asyncio.sleep(max(0.0, stop_at - time.monotonic()))
+    finally:
+        writer.close()
+
+
+async def run(host: str, port: int, active: int, idle: int, duration: float) -> Dict:
+    stats = {"games": 0, "moves": 0, "idle_connected": 0}
+    latencies: List[float] = []
+    started = time.monotonic()
+    stop_at = started + duration
+
+    tasks = [idle_table(host, port, stop_at, stats) for _ in range(idle)]
+    tasks += [active_table(host, port, stop_at, stats, latencies) for _ in range(active)]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    stats["errors"] = sum(1 for result in results if isinstance(result, Exception))
+    stats["moves_per_second"] = round(stats["moves"] / elapsed, 1)
+    if latencies:
+        stats["latency_p50_ms"] = round(latencies[len(latencies) // 2] * 1000, 2)
+        stats["latency_p99_ms"] = round(latencies[int(len(latencies) * 0.99)] * 1000, 2)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lastgenerator für den UNO-Server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--active", type=int, default=100, help="Tische mit spielendem Bot")
+    parser.add_argument("--idle", type=int, default=0, help="Tische, die nur verbunden bleiben")
+    parser.add_argument("--duration", type=float, default=10.0, help="Laufzeit in Sekunden")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args.host, args.port, args.active, args.idle, args.duration))
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Construction of players by name: the registered player types, named
+strategies (a player type with some of its PARAMS set) and the spec
+syntax "Name:key=value,..." that tournaments, sweeps and the GUI accept.
+"""
+
+from typing import Dict, List, Tuple, Type
+
+from uno_fixed import Player, HumanPlayer, ComputerPlayer
+
+PLAYER_TYPES: Dict[str, Type[Player]] = {}
+
+
+def register_player_type(player_class: Type[Player]):
+    """Allow player_class to be recreated when a saved game is loaded"""
+    PLAYER_TYPES[player_class.__name__] = player_class
+    return player_class
+
+
+register_player_type(HumanPlayer)
+register_player_type(ComputerPlayer)
+
+# Named strategies: a registered player type with some of its PARAMS set
+STRATEGIES: Dict[str, Tuple[str, Dict]] = {}
+
+
+def register_strategy(name: str, type_name: str = "ComputerPlayer", **params):
+    """Make name creatable with create_player, like a player type"""
+    player_class = PLAYER_TYPES.get(type_name)
+    if player_class is None:
+        raise ValueError(f"Unbekannter Spielertyp: {type_name}")
+    unknown = sorted(set(params) - set(getattr(player_class, "PARAMS", {})))
+    if unknown:
+        raise ValueError(f"Unbekannte Parameter für {type_name}: {', '.join(unknown)}")
+    STRATEGIES[name] = (type_name, params)
+
+
+def _parse_param(text: str, default):
+    if isinstance(default, bool):
+        if text.lower() not in ("true", "false", "ja", "nein", "1", "0"):
+            raise ValueError(f"Kein Wahrheitswert: {text}")
+        return text.lower() in ("true", "ja", "1")
+    if isinstance(default, (int, float)):
+        return type(default)(text)
+    return text
+
+
+def create_player(spec: str, name: str) -> Player:
+    """
+    Player called name for spec: a registered strategy or player type,
+    optionally followed by parameters, e.g. "ComputerPlayer:wild_threshold=1,color_rule=points"
+    """
+    base, _, overrides = spec.partition(":")
+    type_name, params = STRATEGIES.get(base, (base, {}))
+    player_class = PLAYER_TYPES.get(type_name)
+    if player_class is None:
+        raise ValueError(f"Unbekannter Spielertyp: {base}")
+
+    defaults = getattr(player_class, "PARAMS", {})
+    params = dict(params)
+    for item in filter(None, overrides.split(",")):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key not in defaults:
+            raise ValueError(f"Unbekannter Parameter für {type_name}: {key}")
+        params[key] = _parse_param(value.strip(), defaults[key])
+    return player_class(name, **params)
+
+
+def _available(type_name: str) -> bool:
+    # A player type may depend on files or packages that are missing, see PolicyPlayer.available
+    available = getattr(PLAYER_TYPES[type_name], "available", None)
+    return available is None or available()
+
+
+def strategy_names() -> List[str]:
+    """Everything create_player accepts without parameters, as far as it can be created now"""
+    names = [name for name in PLAYER_TYPES if _available(name)]
+    names += [name for name, (type_name, _) in STRATEGIES.items() if _available(type_name)]
+    return sorted(set(names))
+
+
+# Variants of the heuristic, e.g. as opponents of different strength in the GUI
+register_strategy("Anfänger", wild_threshold=0, actions_first=False, forget_uno=0.3, color_rule="random")
+register_strategy("Profi", wild_threshold=2, forget_uno=0.0)
+# Searches two-player endgames from larger hands, where more lines are estimated; about twice as slow
+register_strategy("Endspiel", wild_threshold=2, forget_uno=0.0, endgame_cards=4)
+
+
+def player_spec(player: Player) -> str:
+    """The create_player spec that rebuilds player, e.g. "ComputerPlayer:wild_threshold=2" """
+    type_name = type(player).__name__
+    defaults = getattr(type(player), "PARAMS", {})
+    changed = [f"{key}={value}" for key, value in player.params().items()
+               if value != defaults[key]] if defaults else []
+    return type_name + ":" + ",".join(changed) if changed else type_name
@@ -0,0 +1,319 @@
+"""
+Computer players driven by a small learned policy network.
+
+The policy is a multilayer perceptron with ReLU hidden layers, evaluated
+in plain NumPy. Its weights come from an .npz file with arrays W0, b0, W1,
+b1, ... in layer order. The input of a decision is FEATURES numbers:
+
+  0..53     count of each face in the hand
+  54..107   one-hot face of the top card
+  108..112  one-hot color to follow (Rot, Blau, Grün, Gelb, none)
+  113..116  own hand size, next player's hand size, smallest other hand
+            size and pending draw penalty, each divided by 10
+
+and the output is one score per face followed by one per color. A
+PolicyPlayer plays the highest-scoring face it may legally play and, for a
+wild card, calls the highest-scoring color.
+
+Decisions are made before the engine asks for them, like the network
+seat's in uno_server: decide_moves evaluates the current turn of many
+players with one matrix multiplication per layer and leaves each answer
+in its player, and PolicyBatcher collects the computer turns of all
+tables of the asyncio server into such batches. A PolicyPlayer asked
+without a prepared answer evaluates a batch of one.
+
+NumPy is only needed once a policy is loaded or created. No trained
+weights ship with the game: a PolicyPlayer without a policy needs an .npz
+file at PolicyPlayer.weights_path (--policy), and until one exists it is
+left out of uno_players.strategy_names.
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from uno_fixed import Card, Color, CardType, ComputerPlayer
+from uno_players import register_player_type
+from uno_state import FACES, COLORS, face_of
+
+FEATURES = 2 * len(FACES) + len(COLORS) + 1 + 4
+OUTPUTS = len(FACES) + len(COLORS)
+DEFAULT_WEIGHTS = "uno_policy.npz"
+
+_TOP = len(FACES)
+_COLOR = 2 * len(FACES)
+_SIZES = _COLOR + len(COLORS) + 1
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Für Policy-Spieler wird NumPy benötigt (pip install numpy)")
+
+
+class MLPPolicy:
+    def __init__(self, weights: Sequence[Tuple["np.ndarray", "np.ndarray"]]):
+        """weights: (W, b) per layer, W of shape (inputs, outputs)"""
+        _require_numpy()
+        self.layers = [(np.asarray(W, dtype=np.float64), np.asarray(b, dtype=np.float64))
+                       for W, b in weights]
+        inputs = FEATURES
+        for W, b in self.layers:
+            if W.ndim != 2 or W.shape[0] != inputs or b.shape != (W.shape[1],):
+                raise ValueError(f"Ungültige Policy-Gewichte: {W.shape} nach {inputs} Eingaben")
+            inputs = W.shape[1]
+        if inputs != OUTPUTS:
+            raise ValueError(f"Policy hat {inputs} statt {OUTPUTS} Ausgaben")
+
+    @classmethod
+    def load(cls, path: str) -> "MLPPolicy":
+        _require_numpy()
+        with np.load(path) as data:
+            return cls([(data[f"W{i}"], data[f"b{i}"]) for i in range(len(data.files) // 2)])
+
+    @classmethod
+    def random(cls, hidden: Sequence[int] = (64,), seed: int = 0) -> "MLPPolicy":
+        """Untrained weights, a starting point for training"""
+        _require_numpy()
+        rng = np.random.default_rng(seed)
+        sizes = [FEATURES, *hidden, OUTPUTS]
+        return cls([(rng.normal(0, (2 / n_in) ** 0.5, (n_in, n_out)), np.zeros(n_out))
+                    for n_in, n_out in zip(sizes, sizes[1:])])
+
+    def save(self, path: str):
+        np.savez(path, **{name: array for i, (W, b) in enumerate(self.layers)
+                          for name, array in ((f"W{i}", W), (f"b{i}", b))})
+
+    def forward(self, features: "np.ndarray") -> "np.ndarray":
+        """Scores for a batch of decisions, one row each"""
+        x = features
+        for W, b in self.layers[:-1]:
+            x = np.maximum(x @ W + b, 0.0)
+        W, b = self.layers[-1]
+        return x @ W + b
+
+
+_masks: Optional[Tuple["np.ndarray", "np.ndarray"]] = None
+
+
+def legal_masks() -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    playable[top, color]: faces that may be played on top face with color to
+    follow (len(COLORS) for none); stackable[top]: faces that pass on a
+    draw penalty
+    """
+    global _masks
+    if _masks is None:
+        cards = [Card(*face) for face in FACES]
+        playable = np.array([[[card.can_play_on(top, color) for card in cards]
+                              for color in [*COLORS, None]] for top in cards])
+        stackable = np.array([[card.card_type == CardType.WILD_DRAW_FOUR or card.card_type == top.card_type
+                               for card in cards] for top in cards])
+        _masks = playable, stackable
+    return _masks
+
+
+def encode(players: Sequence["PolicyPlayer"]) -> Tuple["np.ndarray", "np.ndarray", List[Tuple[Card, Optional[Color]]]]:
+    """
+    Features and legal faces of the current turn of every player, one row
+    each, and the positions (top card, declared color) they describe
+    """
+    rows, faces, tops, colors, sizes, stacking = [], [], [], [], [], []
+    positions = []
+    for row, player in enumerate(players):
+        game = player.game
+        top_card, declared_color = game.get_top_card(), game.declared_color
+        positions.append((top_card, declared_color))
+        color = declared_color or top_card.color
+        face = player.face
+        tops.append(face(top_card))
+        colors.append(COLORS.index(color) if color in COLORS else len(COLORS))
+        for card in player.hand:
+            rows.append(row)
+            faces.append(face(card))
+
+        seat = game.players.index(player)
+        others = [len(other.hand) for other in game.players if other is not player]
+        sizes.append((len(player.hand), len(game.players[(seat + game.direction) % len(game.players)].hand),
+                      min(others, default=0), game.pending_draw))
+        if game.pending_draw:
+            stacking.append(row)
+
+    batch = np.arange(len(players))
+    features = np.zeros((len(players), FEATURES))
+    np.add.at(features, (rows, faces), 1)
+    features[batch, _TOP + np.array(tops, dtype=int)] = 1
+    features[batch, _COLOR + np.array(colors, dtype=int)] = 1
+    features[:, _SIZES:] = np.array(sizes, dtype=float).reshape(len(players), 4) / 10
+
+    playable, stackable = legal_masks()
+    legal = (features[:, :len(FACES)] > 0) & playable[tops, colors]
+    legal[stacking] &= stackable[[tops[row] for row in stacking]]
+    return features, legal, positions
+
+
+def decide_moves(players: Sequence["PolicyPlayer"]):
+    """Prepare the current turn of every player; players sharing a policy are evaluated together"""
+    by_policy: Dict[int, List[PolicyPlayer]] = {}
+    for player in players:
+        by_policy.setdefault(id(player.policy), []).append(player)
+
+    for group in by_policy.values():
+        features, legal, positions = encode(group)
+        scores = group[0].policy.forward(features)
+        faces = np.where(legal, scores[:, :len(FACES)], -np.inf).argmax(axis=1).tolist()
+        calls = scores[:, len(FACES):].argmax(axis=1).tolist()
+        playing = legal.any(axis=1).tolist()
+        for row, player in enumerate(group):
+            index = color = None
+            if playing[row]:
+                index = next(i for i, card in enumerate(player.hand) if player.face(card) == faces[row])
+                if player.hand[index].color == Color.WILD:
+                    color = COLORS[calls[row]]
+            player.prepared = (*positions[row], index, color)
+
+
+_loaded: Dict[str, MLPPolicy] = {}
+
+
+def load_policy(path: str) -> MLPPolicy:
+    """The policy stored at path, loaded once and shared"""
+    if path not in _loaded:
+        if not os.path.exists(path):
+            raise ValueError(f"Keine Policy-Gewichte unter {path}; eine .npz-Datei mit --policy angeben")
+        try:
+            _loaded[path] = MLPPolicy.load(path)
+        except (OSError, KeyError) as error:
+            raise ValueError(f"Policy-Gewichte in {path} sind nicht lesbar: {error}")
+    return _loaded[path]
+
+
+@register_player_type
+class PolicyPlayer(ComputerPlayer):
+    """
+    ComputerPlayer whose cards and wild colors come from an MLPPolicy;
+    without one it loads weights_path.
+    """
+
+    weights_path = DEFAULT_WEIGHTS
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the player can be created from its name alone"""
+        return np is not None and os.path.exists(cls.weights_path)
+
+    def __init__(self, name: str, policy: Optional[MLPPolicy] = None, **params):
+        super().__init__(name, **params)
+        self.policy = policy or load_policy(self.weights_path)
+        # (top card, declared color, hand index, color) decided for that position
+        self.prepared: Optional[Tuple[Card, Optional[Color], Optional[int], Optional[Color]]] = None
+        self._faces: Dict[Card, int] = {}
+
+    def face(self, card: Card) -> int:
+        face = self._faces.get(card)
+        if face is None:
+            face = self._faces[card] = face_of(card)
+        return face
+
+    def plan(self, index: Optional[int], color: Optional[Color]):
+        """Use this move for the current position instead of asking the policy"""
+        self.prepared = (self.game.get_top_card(), self.game.declared_color, index, color)
+
+    def planned_move(self) -> Optional[Tuple[Optional[int], Optional[Color]]]:
+        if self.prepared is None:
+            return None
+        return self.prepared[2:]
+
+    def choose_card(self, top_card: Card, declared_color: Optional[Color] = None) -> Optional[int]:
+        if self.game is None:
+            return super().choose_card(top_card, declared_color)
+        prepared = self.prepared
+        if prepared is None or prepared[0] is not top_card or prepared[1] != declared_color:
+            decide_moves([self])
+            prepared = self.prepared
+        self.prepared = None
+        _, _, index, self.planned_color = prepared
+        return index
+
+    def reset(self):
+        super().reset()
+        self.prepared = None
+
+
+class PolicyBatcher:
+    """
+    Decides the turns of policy players at many tables together. Requests
+    are collected for at most max_delay seconds (or until max_batch are
+    waiting) and evaluated with one forward pass; every requester awaits
+    the batch containing its player.
+    """
+
+    def __init__(self, max_delay: float = 0.001, max_batch: int = 1024):
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.batches = 0
+        self.decisions = 0
+        self._task: Optional[asyncio.Task] = None
+        self._players: List[PolicyPlayer] = []
+        self._waiters: List[asyncio.Future] = []
+        self._has_requests = asyncio.Event()
+        self._full = asyncio.Event()
+
+    async def open(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def decide(self, player: PolicyPlayer):
+        """Wait until player's current turn is prepared"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._players.append(player)
+        self._waiters.append(waiter)
+        self._has_requests.set()
+        if len(self._players) >= self.max_batch:
+            self._full.set()
+        await waiter
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._players:
+            self._evaluate()
+
+    async def _run(self):
+        while True:
+            await self._has_requests.wait()
+            # Give other tables up to max_delay to join this batch
+            if len(self._players) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._evaluate()
+
+    def _evaluate(self):
+        players, waiters = self._players, self._waiters
+        self._players, self._waiters = [], []
+        self._has_requests.clear()
+        self._full.clear()
+
+        try:
+            decide_moves(players)
+        except Exception as error:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(error)
+            return
+
+        self.batches += 1
+        self.decisions += len(players)
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
@@ -0,0 +1,354 @@
+"""
+Lookahead search for computer players.
+
+ExpectimaxPlayer looks a fixed number of plies ahead. Its own turns are
+max nodes; the next player's turn and every random draw are chance nodes
+whose probabilities come from the player's CardCounter: the chance that
+the opponent holds a playable card follows from the unseen cards and its
+hand size, and it plays each face in proportion to how many are unseen.
+The rest of the table is modelled as that one opponent.
+
+Chance nodes are pruned with Star1 (bounds on the expected value) and,
+before that, Star2 probing of each outcome with only its first move, so
+good move ordering (action and wild cards first) saves most of the work.
+Searches deepen one ply at a time up to a fixed depth within a node
+budget, so the worst case of every decision costs about the same.
+"""
+
+import math
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from uno_fixed import Game, Card, Color, CardType
+from uno_knowledge import CountingComputerPlayer
+from uno_players import register_player_type
+from uno_state import FACES, COLORS, face_of
+
+WIN = 1.0
+LOSS = -1.0
+WILD = len(COLORS)
+
+FACE_COLOR = [COLORS.index(color) if color in COLORS else WILD for color, _, _ in FACES]
+FACE_TYPE = [card_type for _, card_type, _ in FACES]
+_ranks = sorted({(card_type.value, value or 0) for _, card_type, value in FACES})
+FACE_RANK = [_ranks.index((card_type.value, value or 0)) for _, card_type, value in FACES]
+FACE_POINTS = [Card(*face).points for face in FACES]
+FACE_PENALTY = [{CardType.DRAW_TWO: 2, CardType.WILD_DRAW_FOUR: 4}.get(card_type, 0) for card_type in FACE_TYPE]
+
+
+def _playable(face: int, top: int, color: int) -> bool:
+    return FACE_COLOR[face] in (WILD, color) or FACE_RANK[face] == FACE_RANK[top]
+
+
+# Faces playable on (top face, color), in move order: action cards, then wild cards,
+# then numbers from the highest value down
+_ORDER = {CardType.DRAW_TWO: 0, CardType.SKIP: 1, CardType.REVERSE: 1,
+          CardType.WILD_DRAW_FOUR: 2, CardType.WILD: 3, CardType.NUMBER: 4}
+WILD_FACES = [face for face in range(len(FACES)) if FACE_COLOR[face] == WILD]
+# In card counts: a wild card held for the end is worth more than the four
+# cards a Plus 4 deals out early, and a hand that fits the table half a card
+WILD_WORTH = 10
+FIT_WORTH = 0.5
+
+PLAYABLE: List[List[Tuple[int, ...]]] = [
+    [tuple(sorted((face for face in range(len(FACES)) if _playable(face, top, color)),
+                  key=lambda face: (_ORDER[FACE_TYPE[face]], -FACE_POINTS[face])))
+     for color in range(len(COLORS))]
+    for top in range(len(FACES))]
+
+Move = Tuple[int, int]  # (face, color afterwards)
+
+
+class Expectimax:
+    """
+    Search state for one decision. The own hand is known face by face; the
+    opponent's hand is only a size and cards the searcher will draw later
+    are counted in extra without a face.
+    """
+
+    def __init__(self, depth: int = 3, max_nodes: int = 1000, two_players: bool = True):
+        self.depth = depth
+        self.max_nodes = max_nodes
+        # Faces after which the same side moves again; with two players that includes reverse
+        self.skips = [bool(FACE_PENALTY[face]) or FACE_TYPE[face] == CardType.SKIP or
+                      (FACE_TYPE[face] == CardType.REVERSE and two_players) for face in range(len(FACES))]
+
+    def best_move(self, hand: Sequence[int], opponent_size: int, top: int, color: int,
+                  unseen: Sequence[int], lacking: Sequence[int] = ()) -> Optional[Move]:
+        """Best (face, color) to play from hand, None when nothing is playable; its value is left in self.value"""
+        self.hand = [0] * len(FACES)
+        for face in hand:
+            self.hand[face] += 1
+        self.size = len(hand)
+        self.extra = 0
+        self.opponent = opponent_size
+        self.unseen = list(unseen)
+        self.total = sum(unseen)
+        self.nodes = 0
+
+        # Iterative deepening: a search cut short by the node budget would compare
+        # deep values with shallow ones, so the deepest complete search decides
+        best = None
+        for depth in range(1, self.depth + 1):
+            move, value = self._root(top, color, depth, frozenset(lacking))
+            if self.nodes >= self.max_nodes and best is not None:
+                break
+            best, self.value = move, value
+        return best
+
+    def _root(self, top: int, color: int, depth: int, lacking: frozenset) -> Tuple[Optional[Move], float]:
+        best, best_value = None, LOSS - 1
+        for move in self._moves(top, color):
+            value = self._play(move, depth, best_value, WIN, lacking)
+            if value > best_value:
+                best, best_value = move, value
+        return best, best_value
+
+    def evaluate(self, top: int, color: int) -> float:
+        advantage = self.opponent - self.size - self.extra
+        advantage += WILD_WORTH * (self.hand[WILD_FACES[0]] + self.hand[WILD_FACES[1]])
+        if any(self.hand[face] for face in PLAYABLE[top][color] if FACE_COLOR[face] != WILD):
+            advantage += FIT_WORTH
+        # Strictly between LOSS and WIN
+        return 0.9 * math.tanh(advantage / 5)
+
+    def _moves(self, top: int, color: int) -> List[Move]:
+        moves = []
+        for face in PLAYABLE[top][color]:
+            if self.hand[face]:
+                if FACE_COLOR[face] == WILD:
+                    moves.extend((face, new_color) for new_color in self._colors())
+                else:
+                    moves.append((face, FACE_COLOR[face]))
+        return moves
+
+    def _colors(self) -> List[int]:
+        """Colors to call, the most held first so that ties go to it"""
+        held = [0] * len(COLORS)
+        for face, count in enumerate(self.hand):
+            if count and FACE_COLOR[face] != WILD:
+                held[FACE_COLOR[face]] += count
+        return sorted(range(len(COLORS)), key=lambda new_color: -held[new_color])
+
+    def _chance(self, outcomes: List[Tuple[float, Callable]], alpha: float, beta: float,
+                probe: bool = False) -> float:
+        """
+        Expected value of outcomes (probability, search(alpha, beta, probe)),
+        fail-soft: a result <= alpha is an upper and one >= beta a lower bound.
+        """
+        if probe:
+            # Only ever asked for a lower bound
+            return sum(p * outcome(LOSS, WIN, True) for p, outcome in outcomes)
+
+        # Star2: the first move of every outcome already gives a lower bound,
+        # which is only worth probing for when it can reach beta
+        if beta < WIN:
+            lower = LOSS
+            for p, outcome in outcomes:
+                lower -= p * LOSS
+                value = outcome(LOSS, min((beta - lower) / p, WIN), True)
+                lower += p * value
+                if lower >= beta:
+                    return lower
+
+        # Star1: the outcomes not searched yet are between LOSS and WIN
+        lower, upper = LOSS, WIN
+        for p, outcome in outcomes:
+            lower -= p * LOSS
+            upper -= p * WIN
+            child_alpha = (alpha - upper) / p
+            child_beta = (beta - lower) / p
+            value = outcome(max(child_alpha, LOSS), min(child_beta, WIN), False)
+            lower += p * value
+            upper += p * value
+            if value <= child_alpha:
+                return upper
+            if value >= child_beta:
+                return lower
+        return lower
+
+    def _my_turn(self, top: int, color: int, depth: int, alpha: float, beta: float,
+                 lacking: frozenset, probe: bool = False) -> float:
+        self.nodes += 1
+        if depth <= 0 or self.nodes >= self.max_nodes:
+            return self.evaluate(top, color)
+
+        moves = self._moves(top, color)
+        if not moves:
+            return self._my_draw(top, color, depth, alpha, beta, lacking, probe)
+        if probe:
+            moves = moves[:1]
+
+        best = LOSS - 1
+        for move in moves:
+            value = self._play(move, depth, max(alpha, best), beta, lacking)
+            if value > best:
+                best = value
+                if best >= beta:
+                    break
+        return best
+
+    def _play(self, move: Move, depth: int, alpha: float, beta: float, lacking: frozenset) -> float:
+        face, color = move
+        self.hand[face] -= 1
+        self.size -= 1
+        if not self.size and not self.extra:
+            value = WIN
+        else:
+            penalty = FACE_PENALTY[face]
+            if self.skips[face]:
+                # The opponent misses its turn
+                self.opponent += penalty
+                value = self._my_turn(face, color, depth - 1, alpha, beta,
+                                      lacking if not penalty else frozenset())
+                self.opponent -= penalty
+            else:
+                value = self._opponent_turn(face, color, depth - 1, alpha, beta, lacking)
+        self.hand[face] += 1
+        self.size += 1
+        return value
+
+    def _my_draw(self, top: int, color: int, depth: int, alpha: float, beta: float,
+                 lacking: frozenset, probe: bool) -> float:
+        if not self.total:
+            return self._opponent_turn(top, color, depth - 1, alpha, beta, lacking, probe)
+
+        def play_drawn(face):
+            def search(alpha, beta, probe):
+                self.unseen[face] -= 1
+                self.total -= 1
+                self.hand[face] += 1
+                self.size += 1
+                # Choosing the color of a drawn wild card is still a max node
+                best = LOSS - 1
+                if FACE_COLOR[face] == WILD:
+                    moves = [(face, new_color) for new_color in self._colors()]
+                else:
+                    moves = [(face, FACE_COLOR[face])]
+                for move in moves:
+                    best = max(best, self._play(move, depth, max(alpha, best), beta, lacking))
+                    if best >= beta or probe:
+                        break
+                self.hand[face] -= 1
+                self.size -= 1
+                self.unseen[face] += 1
+                self.total += 1
+                return best
+            return search
+
+        def keep_drawn(alpha, beta, probe):
+            self.extra += 1
+            value = self._opponent_turn(top, color, depth - 1, alpha, beta, lacking, probe)
+            self.extra -= 1
+            return value
+
+        outcomes = [(self.unseen[face] / self.total, play_drawn(face))
+                    for face in PLAYABLE[top][color] if self.unseen[face]]
+        kept = 1 - sum(p for p, _ in outcomes)
+        if kept > 1e-9:
+            outcomes.append((kept, keep_drawn))
+        return self._chance(outcomes, alpha, beta, probe)
+
+    def _opponent_turn(self, top: int, color: int, depth: int, alpha: float, beta: float,
+                       lacking: frozenset, probe: bool = False) -> float:
+        self.nodes += 1
+        if depth <= 0 or self.nodes >= self.max_nodes:
+            return self.evaluate(top, color)
+        if probe:
+            return LOSS
+
+        # Cards of a color the opponent has shown it lacks are not in its hand
+        faces = [face for face in PLAYABLE[top][color]
+                 if self.unseen[face] and FACE_COLOR[face] not in lacking]
+        playable = sum(self.unseen[face] for face in faces)
+        pool = self.total - sum(self.unseen[face] for face in range(len(FACES))
+                                if FACE_COLOR[face] in lacking) if lacking else self.total
+        if not playable or pool <= 0:
+            return self._opponent_passes(top, color, depth, alpha, beta, lacking)
+
+        # Hypergeometric: chance that none of its cards is playable
+        none_playable = 1.0
+        for i in range(self.opponent):
+            if pool - i <= 0:
+                break
+            none_playable *= max(pool - playable - i, 0) / (pool - i)
+        playable_drawn = playable / pool
+
+        outcomes = []
+        for face in faces:
+            share = self.unseen[face] / playable
+            colors = range(len(COLORS)) if FACE_COLOR[face] == WILD else [FACE_COLOR[face]]
+            for new_color in colors:
+                p = share / len(colors)
+                if (1 - none_playable) * p > 0:
+                    outcomes.append(((1 - none_playable) * p,
+                                     self._opponent_plays(face, new_color, depth, lacking, 1)))
+                if none_playable * playable_drawn * p > 0:
+                    outcomes.append((none_playable * playable_drawn * p,
+                                     self._opponent_plays(face, new_color, depth, frozenset(), 0)))
+        passes = none_playable * (1 - playable_drawn)
+        if passes > 1e-9:
+            outcomes.append((passes, lambda alpha, beta, probe:
+                             self._opponent_passes(top, color, depth, alpha, beta, lacking, probe)))
+        return self._chance(outcomes, alpha, beta)
+
+    def _opponent_passes(self, top: int, color: int, depth: int, alpha: float, beta: float,
+                         lacking: frozenset, probe: bool = False) -> float:
+        self.opponent += 1
+        value = self._my_turn(top, color, depth - 1, alpha, beta, lacking | {color}, probe)
+        self.opponent -= 1
+        return value
+
+    def _opponent_plays(self, face: int, color: int, depth: int, lacking: frozenset, from_hand: int):
+        def search(alpha, beta, probe):
+            self.unseen[face] -= 1
+            self.total -= 1
+            self.opponent -= from_hand
+            if not self.opponent:
+                value = LOSS
+            else:
+                penalty = FACE_PENALTY[face]
+                if self.skips[face]:
+                    self.extra += penalty
+                    value = self._opponent_turn(face, color, depth - 1, alpha, beta, lacking, probe)
+                    self.extra -= penalty
+                else:
+                    value = self._my_turn(face, color, depth - 1, alpha, beta, lacking, probe)
+            self.opponent += from_hand
+            self.unseen[face] += 1
+            self.total += 1
+            return value
+        return search
+
+
+@register_player_type
+class ExpectimaxPlayer(CountingComputerPlayer):
+    """
+    Plays the card with the best expected outcome over the next plies;
+    without a game to count (or while a draw penalty is pending) it plays
+    like CountingComputerPlayer. The search depth and node budget are
+    parameters like those of ComputerPlayer.
+    """
+
+    PARAMS = {**CountingComputerPlayer.PARAMS, "depth": 3, "max_nodes": 1000}
+
+    def choose_card(self, top_card: Card, declared_color: Optional[Color] = None) -> Optional[int]:
+        game: Optional[Game] = self.counter.game
+        color = declared_color or top_card.color
+        if game is None or game.pending_draw or color not in COLORS:
+            return super().choose_card(top_card, declared_color)
+        endgame_index = self.endgame_move(top_card, declared_color)
+        if endgame_index is not None:
+            return endgame_index
+
+        playable = [i for i, card in enumerate(self.hand) if card.can_play_on(top_card, declared_color)]
+        if len(playable) <= 1 and not any(self.hand[i].color == Color.WILD for i in playable):
+            return playable[0] if playable else None
+
+        opponent = self.counter.next_player()
+        search = Expectimax(self.depth, self.max_nodes, len(game.players) == 2)
+        move = search.best_move([face_of(card) for card in self.hand], len(opponent.hand),
+                                face_of(top_card), COLORS.index(color), self.counter.unseen,
+                                [COLORS.index(c) for c in COLORS if self.counter.lacks(opponent, c)])
+        face, new_color = move
+        self.planned_color = COLORS[new_color] if FACE_COLOR[face] == WILD else None
+        return next(i for i in playable if face_of(self.hand[i]) == face)
@@ -0,0 +1,458 @@
+"""
+Asyncio UNO server: every TCP connection gets its own table where the
+client plays against computer players.
+
+Protocol (UTF-8, one message per line):
+  server -> client: JSON objects with a "type" field
+      welcome      {"table": id, "players": [...]}
+      log          {"lines": [...]}            engine output of one turn
+      choose_card  {"top", "declared", "hand", "playable", "timeout"}
+      choose_color {"hand", "timeout"}
+      error        {"message"}
+      timeout      {"message"}                 the server moved for the client
+      end          {"winner": name or null, "drawn": reason or null, "turns"}
+  client -> server: plain text commands
+      play <index> [uno]   play hand card <index> (0-based), optionally call UNO
+      draw                 draw a card
+      color <Rot|Blau|Grün|Gelb>
+      resume <table>       continue a suspended table (after a disconnect or restart)
+
+With --journal every move is written to a group-commit journal before it
+is applied. Each table has its own seed and the engine's random module is
+reseeded from (seed, turn) before every turn; the deck shuffles from its
+own stream seeded from the table seed. Replaying the journal on startup
+therefore rebuilds all games that were still in progress.
+
+With --policy the computer players are PolicyPlayers. Their turns at all
+tables are decided in batches by a PolicyBatcher, and the journal records
+their moves like the client's, so a replay never re-evaluates the network.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import time
+from contextlib import redirect_stdout
+from typing import Dict, Optional
+
+from uno_fixed import Game, GamePool, Player, ComputerPlayer, Card, Color
+from uno_journal import GroupCommitJournal, read_journal, compact_journal
+from uno_policy import MLPPolicy, PolicyBatcher, PolicyPlayer
+from uno_players import register_player_type
+
+COLOR_NAMES = {color.value.lower(): color for color in
+               [Color.RED, Color.BLUE, Color.GREEN, Color.YELLOW]}
+
+
+class ClientGone(Exception):
+    pass
+
+
+class ResumeRequest(Exception):
+    def __init__(self, table_id: int):
+        super().__init__(table_id)
+        self.table_id = table_id
+
+
+@register_player_type
+class NetworkPlayer(Player):
+    """
+    A seat whose decisions arrive over the network. The table awaits the
+    client's answers before the turn and the synchronous engine then reads
+    them from here, so Game.play_turn is used unchanged.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.pending_card: Optional[int] = None
+        self.pending_color: Optional[Color] = None
+        self.pending_uno = False
+
+    def choose_card(self, top_card: Card, declared_color: Optional[Color] = None) -> Optional[int]:
+        index = self.pending_card
+        self.pending_card = None
+        if index is not None and self.hand[index].can_play_on(top_card, declared_color):
+            return index
+        return None
+
+    def choose_color(self) -> Color:
+        if self.pending_color is not None:
+            color, self.pending_color = self.pending_color, None
+            return color
+        # A drawn wild is played without another round-trip: use the majority color
+        return ComputerPlayer.majority_color(self)
+
+    def choose_play_drawn(self, card: Card) -> bool:
+        return True
+
+    def wants_uno_call(self) -> bool:
+        called, self.pending_uno = self.pending_uno, False
+        return called
+
+    def reset(self):
+        super().reset()
+        self.pending_card = None
+        self.pending_color = None
+        self.pending_uno = False
+
+
+def new_table_game(num_computers: int = 1, policy: Optional[MLPPolicy] = None) -> Game:
+    """A game with the network seat first, followed by the computer players"""
+    game = Game()
+    if policy is not None:
+        computers = [PolicyPlayer(f"Computer {i + 1}", policy) for i in range(num_computers)]
+    else:
+        computers = [ComputerPlayer(f"Computer {i + 1}") for i in range(num_computers)]
+    game.players = [NetworkPlayer("Spieler")] + computers
+    return game
+
+
+def turn_seed(seed: int, turn: int) -> int:
+    return seed * 1_000_003 + turn
+
+
+def apply_turn(game: Game, seed: int, turn: int, record: Optional[Dict] = None):
+    """Play one journaled turn; record carries the network seat's or a policy player's decisions"""
+    if record is not None and "card" in record:
+        player = game.players[game.current_player_index]
+        color = Color(record["color"]) if record["color"] else None
+        if isinstance(player, PolicyPlayer):
+            player.plan(record["card"], color)
+        else:
+            player.pending_card = record["card"]
+            player.pending_color = color
+            player.pending_uno = record["uno"]
+    random.seed(turn_seed(seed, turn))
+    game.play_turn()
+
+
+class Table:
+    def __init__(self, table_id: int, reader: Optional[asyncio.StreamReader],
+                 writer: Optional[asyncio.StreamWriter], game: Game, move_timeout: float = 30.0,
+                 max_turns: int = 1000, seed: int = 0, server: Optional["UnoServer"] = None):
+        """game must come from new_table_game and already be dealt"""
+        self.table_id = table_id
+        self.reader = reader
+        self.writer = writer
+        self.move_timeout = move_timeout
+        self.max_turns = max_turns
+        self.game = game
+        self.seat = game.players[0]
+        self.seed = seed
+        self.server = server
+        self.turns = 0
+        self.waiting = False
+
+    @property
+    def journal(self) -> Optional[GroupCommitJournal]:
+        return self.server.journal if self.server else None
+
+    @property
+    def batcher(self) -> Optional[PolicyBatcher]:
+        return self.server.batcher if self.server else None
+
+    async def send(self, message: Dict):
+        self.writer.write(json.dumps(message, ensure_ascii=False).encode() + b"\n")
+        await self.writer.drain()
+
+    async def receive(self, deadline: float) -> Optional[str]:
+        """Next command line, or None when the move time is up"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        self.waiting = True
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), remaining)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.waiting = False
+        if not line:
+            raise ClientGone()
+        return line.decode(errors="replace").strip()
+
+    async def prompt_card(self):
+        game = self.game
+        top_card = game.get_top_card()
+        hand = self.seat.hand
+        self.seat.pending_uno = False
+        playable = [i for i, card in enumerate(hand) if card.can_play_on(top_card, game.declared_color)]
+        await self.send({
+            "type": "choose_card",
+            "top": str(top_card),
+            "declared": game.declared_color.value if game.declared_color else None,
+            "hand": [str(card) for card in hand],
+            "playable": playable,
+            "timeout": self.move_timeout,
+        })
+
+        deadline = time.monotonic() + self.move_timeout
+        while True:
+            command = await self.receive(deadline)
+            if command is None:
+                await self.send({"type": "timeout", "message": "Zeit abgelaufen, es wird gezogen"})
+                return
+            parts = command.split()
+            if parts == ["draw"]:
+                return
+            if len(parts) == 2 and parts[0] == "resume" and parts[1].isdigit():
+                raise ResumeRequest(int(parts[1]))
+            if len(parts) in (2, 3) and parts[0] == "play" and parts[1].isdigit():
+                index = int(parts[1])
+                if index in playable:
+                    self.seat.pending_card = index
+                    self.seat.pending_uno = parts[2:] == ["uno"]
+                    if hand[index].color == Color.WILD:
+                        await self.prompt_color(deadline)
+                    return
+                await self.send({"type": "error", "message": "Diese Karte kannst du nicht spielen!"})
+                continue
+            await self.send({"type": "error", "message": f"Ungültige Eingabe: {command}"})
+
+    async def prompt_color(self, deadline: float):
+        await self.send({"type": "choose_color", "hand": [str(card) for card in self.seat.hand],
+                         "timeout": max(0.0, deadline - time.monotonic())})
+        while True:
+            command = await self.receive(deadline)
+            if command is None:
+                await self.send({"type": "timeout", "message": "Zeit abgelaufen, Farbe wird gewählt"})
+                return
+            parts = command.split()
+            if len(parts) == 2 and parts[0] == "color" and parts[1].lower() in COLOR_NAMES:
+                self.seat.pending_color = COLOR_NAMES[parts[1].lower()]
+                return
+            await self.send({"type": "error", "message": f"Ungültige Farbe: {command}"})
+
+    async def play_turn(self):
+        game = self.game
+        player = game.players[game.current_player_index]
+        seat_turn = player is self.seat
+        policy_turn = isinstance(player, PolicyPlayer) and self.batcher is not None
+        if seat_turn:
+            await self.prompt_card()
+        elif policy_turn:
+            # Decided in one forward pass with the computer turns of other tables
+            await self.batcher.decide(player)
+
+        record = None
+        if self.journal is not None:
+            record = {"op": "turn", "table": self.table_id, "turn": self.turns}
+            if seat_turn:
+                color = self.seat.pending_color
+                record.update(card=self.seat.pending_card, color=color.value if color else None,
+                              uno=self.seat.pending_uno)
+            elif policy_turn:
+                index, color = player.planned_move()
+                record.update(card=index, color=color.value if color else None, uno=False)
+            # Write-ahead: the move is durable before it is applied and acknowledged
+            await self.journal.append(record)
+
+        # The engine narrates on stdout; forward it to the client instead
+        output = io.StringIO()
+        with redirect_stdout(output):
+            if record is not None:
+                apply_turn(game, self.seed, self.turns, record)
+            else:
+                game.play_turn()
+        self.turns += 1
+        await self.send({"type": "log", "lines": output.getvalue().strip().splitlines()})
+
+    def adopt(self, other: "Table"):
+        """Continue the game of a suspended table on this connection"""
+        self.table_id = other.table_id
+        self.game = other.game
+        self.seat = other.seat
+        self.seed = other.seed
+        self.turns = other.turns
+
+    async def run(self) -> Optional[Player]:
+        await self.send({"type": "welcome", "table": self.table_id,
+                         "players": [player.name for player in self.game.players]})
+
+        winner = None
+        while self.turns < self.max_turns:
+            try:
+                await self.play_turn()
+            except ResumeRequest as request:
+                await self.resume(request.table_id)
+                continue
+
+            winner = self.game.check_winner()
+            if winner or self.game.drawn:
+                break
+            # Let other tables run between computer turns
+            await asyncio.sleep(0)
+
+        if self.journal is not None:
+            await self.journal.append({"op": "end", "table": self.table_id})
+        await self.send({"type": "end", "winner": winner.name if winner else None,
+                         "drawn": self.game.drawn, "turns": self.turns})
+        return winner
+
+    async def resume(self, table_id: int):
+        suspended = self.server.suspended.pop(table_id, None) if self.server else None
+        if suspended is None:
+            await self.send({"type": "error", "message": f"Kein unterbrochener Tisch {table_id}"})
+            return
+
+        # The fresh game of this connection is abandoned in favour of the old one
+        if self.journal is not None:
+            await self.journal.append({"op": "end", "table": self.table_id})
+        self.server.pool.release(self.game)
+        self.adopt(suspended)
+        await self.send({"type": "welcome", "table": self.table_id,
+                         "players": [player.name for player in self.game.players]})
+
+
+class UnoServer:
+    def __init__(self, move_timeout: float = 30.0, num_computers: int = 1, max_turns: int = 1000,
+                 journal_path: Optional[str] = None, journal_delay: float = 0.005,
+                 policy: Optional[MLPPolicy] = None, policy_delay: float = 0.001):
+        self.move_timeout = move_timeout
+        self.num_computers = num_computers
+        self.max_turns = max_turns
+        self.policy = policy
+        self.tables: Dict[int, Table] = {}
+        # Tables whose client went away; with a journal they survive a restart
+        self.suspended: Dict[int, Table] = {}
+        # Finished tables return their game here for the next connection
+        self.pool = GamePool(lambda: new_table_game(num_computers, policy))
+        self.next_table_id = 1
+        self.games_finished = 0
+        self.turns_played = 0
+        self.journal_path = journal_path
+        self.journal_delay = journal_delay
+        self.journal: Optional[GroupCommitJournal] = None
+        self.batcher = PolicyBatcher(max_delay=policy_delay) if policy is not None else None
+        self._seeds = random.SystemRandom()
+
+    def new_table(self, reader: Optional[asyncio.StreamReader],
+                  writer: Optional[asyncio.StreamWriter], seed: int, table_id: int) -> Table:
+        # The deal must not depend on whether the game was built or reused, or a replay deals other cards
+        return Table(table_id, reader, writer, self.pool.acquire(seed), self.move_timeout,
+                     self.max_turns, seed=seed, server=self)
+
+    def replay_journal(self):
+        """Rebuild every table that has a start but no end record in the journal"""
+        tables: Dict[int, Table] = {}
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for record in read_journal(self.journal_path):
+                table_id = record["table"]
+                self.next_table_id = max(self.next_table_id, table_id + 1)
+                if record["op"] == "start":
+                    tables[table_id] = self.new_table(None, None, record["seed"], table_id)
+                elif record["op"] == "turn" and table_id in tables:
+                    table = tables[table_id]
+                    apply_turn(table.game, table.seed, record["turn"], record)
+                    table.turns = record["turn"] + 1
+                elif record["op"] == "end":
+                    tables.pop(table_id, None)
+
+        self.suspended.update(tables)
+        # Only the records of unfinished games are needed from now on
+        compact_journal(self.journal_path, lambda record: record["table"] in tables)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        table_id = self.next_table_id
+        self.next_table_id += 1
+        table = self.new_table(reader, writer, self._seeds.getrandbits(32), table_id)
+        self.tables[table_id] = table
+        try:
+            if self.journal is not None:
+                await self.journal.append({"op": "start", "table": table_id, "seed": table.seed})
+            await table.run()
+            self.games_finished += 1
+            self.pool.release(table.game)
+        except (ClientGone, ConnectionError):
+            if self.journal is not None:
+                table.reader = table.writer = None
+                self.suspended[table.table_id] = table
+            else:
+                self.pool.release(table.game)
+        finally:
+            self.turns_played += table.turns
+            del self.tables[table_id]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        waiting = sum(1 for table in self.tables.values() if table.waiting)
+        stats = {"tables": len(self.tables), "waiting": waiting,
+                 "games_finished": self.games_finished,
+                 "turns": self.turns_played + sum(t.turns for t in self.tables.values())}
+        if self.batcher is not None:
+            stats.update(policy_batches=self.batcher.batches, policy_decisions=self.batcher.decisions)
+        return stats
+
+    async def report(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            print(" ".join(f"{key}={value}" for key, value in self.stats().items()), flush=True)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 7777) -> asyncio.AbstractServer:
+        if self.journal_path:
+            self.replay_journal()
+            self.journal = GroupCommitJournal(self.journal_path, max_delay=self.journal_delay)
+            await self.journal.open()
+        if self.batcher is not None:
+            await self.batcher.open()
+        return await asyncio.start_server(self.handle_client, host, port, backlog=4096)
+
+    async def close(self):
+        if self.batcher is not None:
+            await self.batcher.close()
+        if self.journal is not None:
+            await self.journal.close()
+            self.journal = None
+
+
+async def serve(host: str, port: int, move_timeout: float, num_computers: int, stats_interval: float,
+                journal_path: Optional[str], journal_delay: float, policy_path: Optional[str] = None,
+                policy_delay: float = 0.001):
+    policy = MLPPolicy.load(policy_path) if policy_path else None
+    server = UnoServer(move_timeout, num_computers, journal_path=journal_path,
+                       journal_delay=journal_delay, policy=policy, policy_delay=policy_delay)
+    tcp_server = await server.start(host, port)
+    print(f"UNO-Server läuft auf {host}:{port}", flush=True)
+    if server.suspended:
+        print(f"{len(server.suspended)} unterbrochene Tische aus dem Journal wiederhergestellt", flush=True)
+    if stats_interval > 0:
+        asyncio.ensure_future(server.report(stats_interval))
+    try:
+        async with tcp_server:
+            await tcp_server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UNO-Server für viele gleichzeitige Tische")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--move-timeout", type=float, default=30.0,
+                        help="Sekunden pro Zug, danach zieht der Server für den Spieler")
+    parser.add_argument("--computers", type=int, default=1, help="Computergegner pro Tisch")
+    parser.add_argument("--stats", type=float, default=10.0, help="Statistik-Intervall in Sekunden")
+    parser.add_argument("--journal", help="Journal-Datei für absturzsichere Spielstände")
+    parser.add_argument("--journal-delay", type=float, default=0.005,
+                        help="Maximale Wartezeit in Sekunden, bis ein Journal-Batch synchronisiert wird")
+    parser.add_argument("--policy", help="Policy-Gewichte (.npz); die Computergegner spielen damit")
+    parser.add_argument("--policy-delay", type=float, default=0.001,
+                        help="Maximale Wartezeit in Sekunden, bis Policy-Züge gemeinsam berechnet werden")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.move_timeout, args.computers, args.stats,
+                          args.journal, args.journal_delay, args.policy, args.policy_delay))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Save and load a complete uno_fixed.Game.
+
+Two formats share one data model:
+  binary  compact struct layout, one byte per card (face index 0-53)
+  JSON    readable, cards written as their German names ("Rot 5", "Plus 4")
+
+Players are saved as their uno_players spec, so a strategy comes back
+with its parameters. Nothing is unpickled or evaluated: loading only
+accepts known card faces and specs of registered player types and raises
+ValueError for anything else.
+"""
+
+import json
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from uno_fixed import Game, Deck, HouseRules, Card, Color, CardType
+from uno_players import create_player, player_spec
+
+MAGIC = b"UNO\x01"
+FORMAT_VERSION = 3
+NO_COLOR = 255
+HEADER = "<BBBbBHHHB"
+# A game is played by 2 to 10 players
+MIN_PLAYERS = 2
+MAX_PLAYERS = 10
+
+# Every distinct card face, in a fixed order; a face is stored as its index here
+FACES: List[Tuple[Color, CardType, Optional[int]]] = []
+for _color in [Color.RED, Color.BLUE, Color.GREEN, Color.YELLOW]:
+    FACES.extend((_color, CardType.NUMBER, value) for value in range(10))
+    FACES.extend((_color, card_type, None) for card_type in
+                 [CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO])
+FACES.append((Color.WILD, CardType.WILD, None))
+FACES.append((Color.WILD, CardType.WILD_DRAW_FOUR, None))
+
+FACE_INDEX: Dict[Tuple[Color, CardType, Optional[int]], int] = {face: i for i, face in enumerate(FACES)}
+FACE_NAMES = [str(Card(*face)) for face in FACES]
+FACE_BY_NAME = {name: i for i, name in enumerate(FACE_NAMES)}
+COLORS = [Color.RED, Color.BLUE, Color.GREEN, Color.YELLOW]
+
+# Where each face sits in Deck.new_cards, so a loaded deck keeps the
+# creation order that Deck.reset() shuffles from
+CREATION_POSITIONS: Dict[int, List[int]] = {}
+for _position, _card in enumerate(Deck.new_cards()):
+    CREATION_POSITIONS.setdefault(FACE_INDEX[(_card.color, _card.card_type, _card.value)], []).append(_position)
+
+
+def face_of(card: Card) -> int:
+    return FACE_INDEX[(card.color, card.card_type, card.value)]
+
+
+def _state(game: Game) -> Dict:
+    """The saved fields of a game, with cards as face indices"""
+    return {
+        "deck": [face_of(card) for card in game.deck.cards],
+        "discard_pile": [face_of(card) for card in game.discard_pile],
+        "current_player_index": game.current_player_index,
+        "direction": game.direction,
+        "declared_color": game.declared_color,
+        "pending_draw": game.pending_draw,
+        "rules": game.rules.names(),
+        "players": [{
+            "spec": player_spec(player),
+            "name": player.name,
+            "hand": [face_of(card) for card in player.hand],
+            "has_called_uno": player.has_called_uno,
+            "just_played_second_to_last": player.just_played_second_to_last,
+        } for player in game.players],
+    }
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check(state: Dict):
+    """Raise ValueError unless state has the shape and ranges that _state writes"""
+    players = state["players"]
+    if not isinstance(players, list) or not MIN_PLAYERS <= len(players) <= MAX_PLAYERS:
+        raise ValueError(f"Spielstand braucht {MIN_PLAYERS} bis {MAX_PLAYERS} Spieler")
+    if not _is_int(state["current_player_index"]) or not 0 <= state["current_player_index"] < len(players):
+        raise ValueError("Ungültiger Spieler am Zug")
+    if state["direction"] not in (1, -1) or isinstance(state["direction"], bool):
+        raise ValueError("Ungültige Spielrichtung")
+    if not _is_int(state["pending_draw"]) or state["pending_draw"] < 0:
+        raise ValueError("Ungültige Strafkarten")
+    if not isinstance(state["rules"], list) or not all(isinstance(name, str) for name in state["rules"]):
+        raise ValueError("Ungültige Hausregeln")
+    if state["declared_color"] is not None and state["declared_color"] not in COLORS:
+        raise ValueError("Ungültige Farbe")
+    if not state["discard_pile"]:
+        raise ValueError("Spielstand ohne Ablagestapel")
+    for saved in players:
+        if not isinstance(saved["spec"], str) or not isinstance(saved["name"], str):
+            raise ValueError("Ungültiger Spieler")
+        if not all(isinstance(saved[flag], bool) for flag in ("has_called_uno", "just_played_second_to_last")):
+            raise ValueError("Ungültiger UNO-Status")
+        _check_faces(saved["hand"])
+    _check_faces(state["deck"])
+    _check_faces(state["discard_pile"])
+
+
+def _check_faces(faces) -> None:
+    if not isinstance(faces, list) or not all(_is_int(face) and 0 <= face < len(FACES) for face in faces):
+        raise ValueError("Ungültige Karten im Spielstand")
+
+
+def _restore(state: Dict, game: Optional[Game]) -> Game:
+    """Rebuild a game from state; any malformed field raises ValueError"""
+    try:
+        _check(state)
+        rules = HouseRules.from_names(state["rules"])
+    except (KeyError, TypeError, AttributeError) as error:
+        raise ValueError(f"Beschädigter Spielstand: {error!r}")
+    players = state["players"]
+
+    if game is None:
+        game = Game(rules)
+    else:
+        game.set_rules(rules)
+
+    # Reuse the player objects of the target game when the seats match
+    reuse = [player_spec(p) for p in game.players] == [p["spec"] for p in players]
+    if not reuse:
+        game.players = []
+    for i, saved in enumerate(players):
+        if reuse:
+            player = game.players[i]
+            player.reset()
+            player.name = saved["name"]
+        else:
+            player = create_player(saved["spec"], saved["name"])
+            game.players.append(player)
+        player.hand.extend(map(_new_card, saved["hand"]))
+        player.recount_points()
+        player.has_called_uno = saved["has_called_uno"]
+        player.just_played_second_to_last = saved["just_played_second_to_last"]
+
+    game.deck.cards = [_new_card(face) for face in state["deck"]]
+    game.discard_pile = [_new_card(face) for face in state["discard_pile"]]
+    game.current_player_index = state["current_player_index"]
+    game.direction = state["direction"]
+    game.declared_color = state["declared_color"]
+    game.pending_draw = state["pending_draw"]
+    game.drawn = None
+    game.idle_turns = 0
+    game.positions.clear()
+
+    all_cards = game.deck.cards + game.discard_pile + [c for p in game.players for c in p.hand]
+    game.deck.all_cards = _in_creation_order(all_cards)
+    game.start_round()
+    return game
+
+
+def _new_card(face: int) -> Card:
+    if not 0 <= face < len(FACES):
+        raise ValueError(f"Ungültige Karte: {face}")
+    return Card(*FACES[face])
+
+
+def _in_creation_order(cards: List[Card]) -> List[Card]:
+    free = {face: list(positions) for face, positions in CREATION_POSITIONS.items()}
+    ordered = []
+    for card in cards:
+        positions = free[face_of(card)]
+        # Cards beyond the standard composition go to the end
+        ordered.append((positions.pop(0) if positions else 1000 + len(ordered), card))
+    ordered.sort(key=lambda entry: entry[0])
+    return [card for _, card in ordered]
+
+
+def save_binary(game: Game) -> bytes:
+    state = _state(game)
+    color = state["declared_color"]
+    rules = sum(1 << i for i, name in enumerate(HouseRules.NAMES) if name in state["rules"])
+    parts = [MAGIC, struct.pack(HEADER, FORMAT_VERSION, len(game.players),
+                                state["current_player_index"], state["direction"],
+                                NO_COLOR if color is None else COLORS.index(color),
+                                len(state["deck"]), len(state["discard_pile"]),
+                                state["pending_draw"], rules),
+             bytes(state["deck"]), bytes(state["discard_pile"])]
+    for player in state["players"]:
+        spec = player["spec"].encode()
+        name = player["name"].encode()
+        if len(spec) > 0xFFFF or len(name) > 0xFFFF:
+            raise ValueError(f"Name zu lang für den Spielstand: {player['name'][:20]}…")
+        flags = player["has_called_uno"] | (player["just_played_second_to_last"] << 1)
+        parts.append(struct.pack("<HH", len(spec), len(name)))
+        parts.append(spec)
+        parts.append(name)
+        parts.append(struct.pack("<BH", flags, len(player["hand"])))
+        parts.append(bytes(player["hand"]))
+    return b"".join(parts)
+
+
+def load_binary(data: bytes, game: Optional[Game] = None) -> Game:
+    """Rebuild a game from save_binary output, reusing game's objects if given"""
+    view = memoryview(data)
+    if bytes(view[:4]) != MAGIC:
+        raise ValueError("Kein UNO-Spielstand")
+    try:
+        version, = struct.unpack_from("<B", view, 4)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unbekannte Version: {version}")
+        _, num_players, current, direction, color, deck_len, discard_len, pending_draw, rules = \
+            struct.unpack_from(HEADER, view, 4)
+        offset = 4 + struct.calcsize(HEADER)
+
+        def take(length: int) -> bytes:
+            nonlocal offset
+            if offset + length > len(view):
+                raise ValueError("Spielstand ist abgeschnitten")
+            chunk = bytes(view[offset:offset + length])
+            offset += length
+            return chunk
+
+        state = {
+            "deck": list(take(deck_len)),
+            "discard_pile": list(take(discard_len)),
+            "current_player_index": current,
+            "direction": direction,
+            "declared_color": None if color == NO_COLOR else COLORS[color],
+            "pending_draw": pending_draw,
+            "rules": [name for i, name in enumerate(HouseRules.NAMES) if rules & (1 << i)],
+            "players": [],
+        }
+        for _ in range(num_players):
+            spec_len, name_len = struct.unpack("<HH", take(4))
+            spec = take(spec_len).decode()
+            name = take(name_len).decode()
+            flags, hand_len = struct.unpack("<BH", take(3))
+            state["players"].append({
+                "spec": spec,
+                "name": name,
+                "hand": list(take(hand_len)),
+                "has_called_uno": bool(flags & 1),
+                "just_played_second_to_last": bool(flags & 2),
+            })
+    except (struct.error, IndexError, UnicodeDecodeError) as error:
+        raise ValueError(f"Beschädigter Spielstand: {error}")
+    return _restore(state, game)
+
+
+def save_json(game: Game) -> str:
+    state = _state(game)
+    for key in ("deck", "discard_pile"):
+        state[key] = [FACE_NAMES[face] for face in state[key]]
+    for player in state["players"]:
+        player["hand"] = [FACE_NAMES[face] for face in player["hand"]]
+    color = state["declared_color"]
+    state["declared_color"] = color.value if color else None
+    return json.dumps({"version": FORMAT_VERSION, **state}, ensure_ascii=False, indent=1)
+
+
+def load_json(text: str, game: Optional[Game] = None) -> Game:
+    try:
+        state = json.loads(text)
+        if state.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unbekannte Version: {state.get('version')}")
+
+        def faces(names: List[str]) -> List[int]:
+            return [FACE_BY_NAME[name] for name in names]
+
+        state["deck"] = faces(state["deck"])
+        state["discard_pile"] = faces(state["discard_pile"])
+        for player in state["players"]:
+            player["hand"] = faces(player["hand"])
+            player["has_called_uno"] = bool(player["has_called_uno"])
+            player["just_played_second_to_last"] = bool(player["just_played_second_to_last"])
+        color = state["declared_color"]
+        state["declared_color"] = Color(color) if color else None
+    except (KeyError, TypeError, AttributeError) as error:
+        raise ValueError(f"Beschädigter Spielstand: {error}")
+    return _restore(state, game)
+
+
+def save_game(game: Game, path: str):
+    """Write game to path; .json files use the readable format"""
+    if path.endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(save_json(game))
+    else:
+        with open(path, "wb") as f:
+            f.write(save_binary(game))
+
+
+def load_game(path: str, game: Optional[Game] = None) -> Game:
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return load_json(f.read(), game)
+    with open(path, "rb") as f:
+        return load_binary(f.read(), game)
@@ -0,0 +1,299 @@
+"""
+Parameter sweeps for computer-player strategies.
+
+Every configuration is a set of PARAMS for one player type and plays the
+same games against a fixed baseline: as in uno_tournament, game i is
+seeded from (seed, i) and seats the players rotated by i, so the
+configurations meet the same deals and differ only by their decisions.
+Games are paired: every deal is played twice with the seats swapped and
+identical shuffles, so each configuration also gets the difference of its
+win rate to the baseline's, free of most of the luck of the deal. The
+games of each configuration are split into chunks that run on a process
+pool. The report ranks the configurations by win rate with a 95% Wilson
+confidence interval, next to the paired difference.
+
+A race (--race) screens many configurations with fewer games: it plays
+rounds of doubling length and after each round drops every configuration
+whose paired difference is clearly below that of the leader, i.e. whose
+upper confidence bound lies below the leader's lower bound. It stops when
+a single configuration is left or the game budget is spent. The
+confidence is split over all configurations and rounds, so the winner of
+a race is the best one with at least the requested confidence.
+
+Search spaces are given per parameter, either as a list of values (all
+combinations are played, or a random sample of them) or for random
+search as a range lo..hi, drawn uniformly.
+"""
+
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from statistics import NormalDist
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from uno_players import create_player
+from uno_tournament import Tournament, paired_difference
+
+Range = Tuple[float, float]
+Space = Dict[str, Union[List[str], Range]]
+
+
+def parse_space(items: Sequence[str]) -> Space:
+    """"key=a,b,c" lists values, "key=lo..hi" a range for random search"""
+    space: Space = {}
+    for item in items:
+        key, sep, values = item.partition("=")
+        if not sep or not values:
+            raise ValueError(f"Ungültiger Parameterbereich: {item}")
+        if ".." in values:
+            lo, hi = values.split("..", 1)
+            space[key.strip()] = (_number(lo), _number(hi))
+        else:
+            space[key.strip()] = [value.strip() for value in values.split(",")]
+    return space
+
+
+def _number(text: str) -> float:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def grid(space: Space) -> List[Dict]:
+    """Every combination of the listed values"""
+    if any(isinstance(values, tuple) for values in space.values()):
+        raise ValueError("Bereiche (lo..hi) gibt es nur bei der Zufallssuche")
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def random_configs(space: Space, count: int, seed: int = 0) -> List[Dict]:
+    """count distinct configurations drawn from space"""
+    rng = random.Random(seed)
+    configs: List[Dict] = []
+    seen = set()
+    for _ in range(count * 20):
+        config = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                lo, hi = values
+                if isinstance(lo, int) and isinstance(hi, int):
+                    config[key] = rng.randint(lo, hi)
+                else:
+                    config[key] = round(rng.uniform(lo, hi), 3)
+            else:
+                config[key] = rng.choice(values)
+        key = tuple(sorted(config.items()))
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+            if len(configs) == count:
+                break
+    return configs
+
+
+def config_spec(player_type: str, config: Dict) -> str:
+    """The create_player spec of config, e.g. "ComputerPlayer:wild_threshold=2" """
+    if not config:
+        return player_type
+    return player_type + ":" + ",".join(f"{key}={value}" for key, value in config.items())
+
+
+def wilson_interval(wins: int, games: int, z: float = 1.96) -> Tuple[float, float]:
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    center = (p + z * z / (2 * games)) / (1 + z * z / games)
+    margin = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / (1 + z * z / games)
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def play_chunk(task: Tuple) -> Dict[str, int]:
+    """Games start..end of spec against baseline; runs in a worker process"""
+    spec, baseline, seed, start, end, rules, max_turns = task
+    tournament = Tournament([spec, baseline], end, seed=seed, max_turns=max_turns, rules=rules, paired=True)
+    tournament.completed = start
+    tournament.run()
+    stats = tournament.stats[tournament.labels[0]]
+    return {"games": end - start, "wins": stats["wins"], "points": stats["points"],
+            "turns": tournament.turns, "pairs": tournament.pairs}
+
+
+@contextmanager
+def _mapper(workers: Optional[int]) -> Iterator[Callable]:
+    """map over a process pool, or in this process for a single worker"""
+    if workers == 1:
+        yield map
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield pool.map
+
+
+def _check_specs(specs: List[str], baseline: str):
+    # Fail before any work is started
+    for spec in specs + [baseline]:
+        create_player(spec, "Test")
+
+
+def _play(mapper: Callable, totals: Dict[str, Dict], baseline: str, seed: int, start: int, end: int,
+          chunk: int, rules: List[str], max_turns: int):
+    """Play games start..end of every spec in totals and add them up there"""
+    # Chunks hold whole deals
+    chunk += chunk % 2
+    tasks = [(spec, baseline, seed, first, min(first + chunk, end), rules, max_turns)
+             for spec in totals for first in range(start, end, chunk)]
+    for task, outcome in zip(tasks, mapper(play_chunk, tasks)):
+        total = totals[task[0]]
+        for key, value in outcome["pairs"].items():
+            total["pairs"][key] = total["pairs"].get(key, 0) + value
+        for key in ("games", "wins", "points", "turns"):
+            total[key] += outcome[key]
+
+
+def _new_total() -> Dict:
+    return {"games": 0, "wins": 0, "points": 0, "turns": 0, "pairs": {}}
+
+
+def _result(config: Dict, spec: str, total: Dict) -> Dict:
+    low, high = wilson_interval(total["wins"], total["games"])
+    return {"config": config, "spec": spec,
+            **{key: value for key, value in total.items() if key != "pairs"},
+            "win_rate": total["wins"] / total["games"] if total["games"] else 0.0,
+            "low": low, "high": high, "paired": paired_difference(total["pairs"], 2)}
+
+
+def run_sweep(configs: List[Dict], player_type: str = "ComputerPlayer", baseline: str = "ComputerPlayer",
+              games: int = 1000, seed: int = 0, workers: Optional[int] = None, chunk: int = 250,
+              rules: Optional[List[str]] = None, max_turns: int = 1000) -> List[Dict]:
+    """Results of all configs, best win rate first"""
+    if games % 2:
+        raise ValueError("Gepaarte Spiele brauchen eine gerade Anzahl")
+    specs = [config_spec(player_type, config) for config in configs]
+    _check_specs(specs, baseline)
+
+    totals = {spec: _new_total() for spec in specs}
+    with _mapper(workers) as mapper:
+        _play(mapper, totals, baseline, seed, 0, games, chunk, rules or [], max_turns)
+
+    results = [_result(config, spec, totals[spec]) for config, spec in zip(configs, specs)]
+    results.sort(key=lambda result: (-result["win_rate"], -result["points"]))
+    return results
+
+
+def race(configs: List[Dict], player_type: str = "ComputerPlayer", baseline: str = "ComputerPlayer",
+         games: int = 100000, first_round: int = 200, confidence: float = 0.95, seed: int = 0,
+         workers: Optional[int] = None, chunk: int = 250, rules: Optional[List[str]] = None,
+         max_turns: int = 1000) -> List[Dict]:
+    """
+    Results of all configs after racing them with at most games games each:
+    the remaining ones by paired difference first, then the dropped ones,
+    those that lasted longest first. Each result tells after how many games
+    it was dropped ("dropped", None if it remained). The reported
+    intervals are the usual 95% ones, the race decides with wider ones.
+    """
+    if games % 2 or first_round % 2 or first_round <= 0:
+        raise ValueError("Gepaarte Spiele brauchen eine gerade Anzahl")
+    if not 0 < confidence < 1:
+        raise ValueError("Die Konfidenz muss zwischen 0 und 1 liegen")
+    specs = [config_spec(player_type, config) for config in configs]
+    _check_specs(specs, baseline)
+
+    # Round ends: first_round, twice that, ... up to games
+    ends = [min(first_round, games)]
+    while ends[-1] < games:
+        ends.append(min(2 * ends[-1], games))
+    # Every configuration may be wrongly dropped after every round
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / (2 * max(1, len(specs) * len(ends))))
+
+    totals = {spec: _new_total() for spec in specs}
+    dropped: Dict[str, int] = {}
+    alive = dict(totals)
+    start = 0
+    with _mapper(workers) as mapper:
+        for end in ends:
+            _play(mapper, alive, baseline, seed, start, end, chunk, rules or [], max_turns)
+            start = end
+            bounds = {}
+            for spec, total in alive.items():
+                paired = paired_difference(total["pairs"], 2, z)
+                if paired is not None:
+                    bounds[spec] = (paired["difference"] - paired["half_width"],
+                                    paired["difference"] + paired["half_width"])
+            if bounds:
+                leader_low = max(low for low, _ in bounds.values())
+                for spec, (_, high) in bounds.items():
+                    if high < leader_low:
+                        dropped[spec] = end
+                        del alive[spec]
+            if len(alive) <= 1:
+                break
+
+    results = [{**_result(config, spec, totals[spec]), "dropped": dropped.get(spec)}
+               for config, spec in zip(configs, specs)]
+    results.sort(key=lambda result: (result["dropped"] is not None, -(result["dropped"] or 0),
+                                     -(result["paired"] or {}).get("difference", 0.0)))
+    return results
+
+
+def report(results: List[Dict], baseline: str, top: int = 10) -> str:
+    most = max((result["games"] for result in results), default=0)
+    each = "je" if all(result["games"] == most for result in results) else "bis zu"
+    lines = [f"Gegen {baseline}, {each} {most} Spiele:",
+             "Rang  Siege   95%-Intervall    Differenz gepaart  Konfiguration"]
+    for rank, result in enumerate(results[:top], 1):
+        config = ", ".join(f"{key}={value}" for key, value in result["config"].items()) or "(Standard)"
+        paired = result["paired"]
+        difference = (f"{paired['difference'] * 100:+5.1f}% ± {paired['half_width'] * 100:4.1f}%"
+                      if paired else "")
+        lines.append(f"{rank:>4}  {result['win_rate'] * 100:5.1f}%  "
+                     f"[{result['low'] * 100:4.1f}%, {result['high'] * 100:4.1f}%]  {difference:<17}  {config}"
+                     + (f" (ausgeschieden nach {result['dropped']} Spielen)" if result.get("dropped") else ""))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parametersuche für Computerstrategien")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=WERTE",
+                        help="Werte eines Parameters, z. B. wild_threshold=0,1,2,3 oder forget_uno=0..0.3")
+    parser.add_argument("--random", type=int, default=0, metavar="N",
+                        help="N zufällige Konfigurationen statt aller Kombinationen")
+    parser.add_argument("--type", default="ComputerPlayer", help="Spielertyp der Konfigurationen")
+    parser.add_argument("--baseline", default="ComputerPlayer", help="Fester Gegner (Strategie)")
+    parser.add_argument("--games", type=int, default=2000, help="Spiele pro Konfiguration (im Rennen höchstens)")
+    parser.add_argument("--race", action="store_true",
+                        help="Deutlich schlechtere Konfigurationen früh aussortieren")
+    parser.add_argument("--first-round", type=int, default=200, help="Spiele der ersten Runde eines Rennens")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Konfidenz, mit der ein Rennen entscheidet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Prozesse")
+    parser.add_argument("--chunk", type=int, default=250, help="Spiele pro Auftrag an einen Prozess")
+    parser.add_argument("--rules", default="", help="Hausregeln, kommagetrennt")
+    parser.add_argument("--top", type=int, default=10, help="Anzahl ausgegebener Konfigurationen")
+    args = parser.parse_args()
+
+    try:
+        space = parse_space(args.param)
+        configs = random_configs(space, args.random, args.seed) if args.random else grid(space)
+        started = time.monotonic()
+        rules = [name for name in args.rules.split(",") if name]
+        if args.race:
+            results = race(configs, args.type, args.baseline, args.games, args.first_round, args.confidence,
+                           args.seed, args.workers, args.chunk, rules)
+        else:
+            results = run_sweep(configs, args.type, args.baseline, args.games, args.seed, args.workers,
+                                args.chunk, rules)
+    except ValueError as error:
+        parser.error(str(error))
+    print(report(results, args.baseline, args.top))
+    print(f"{len(configs)} Konfigurationen, {sum(result['games'] for result in results)} Spiele, "
+          f"{time.monotonic() - started:.1f} s mit {args.workers} Prozessen")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Long-running tournaments between computer strategies that survive being
+killed.
+
+Game i of a tournament is seeded from (seed, i) and seats the entrants
+rotated by i, so the next game index is the complete RNG position. The
+deck shuffles from its own stream, seeded per deal, so the cards dealt
+and drawn do not depend on the random choices of the players: every
+entrant meets the same shuffles (common random numbers). With paired=True
+each deal is played once per seat rotation, and for two entrants the
+report gives the difference of their win rates over these paired games,
+whose deal-to-deal luck cancels out. The
+driver writes a checkpoint with the aggregated statistics and that index
+every checkpoint_every games, on SIGTERM/SIGINT and at the end. Restarting
+with the same checkpoint file continues with the first game that is not in
+the checkpoint: games already counted are never replayed, and games played
+after the last checkpoint are replayed exactly and counted once.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import signal
+import time
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional
+
+from uno_deck import CountedDeck
+from uno_fixed import Deck, Game, HouseRules, Player, deck_stream
+from uno_players import create_player, strategy_names
+import uno_knowledge  # noqa: F401  registers CountingComputerPlayer
+import uno_search  # noqa: F401  registers ExpectimaxPlayer
+import uno_bot  # noqa: F401  registers BotPlayer
+from uno_policy import PolicyPlayer
+
+CHECKPOINT_VERSION = 4
+
+
+def game_seed(seed: int, index: int) -> int:
+    return seed * 1_000_003 + index
+
+
+def deck_seed(seed: int, deal: int) -> int:
+    return deck_stream(game_seed(seed, deal))
+
+
+def paired_difference(pairs: Dict[str, int], rotations: int, z: float = 1.96) -> Optional[Dict[str, float]]:
+    """
+    Win rate of the first entrant minus that of the second over the
+    finished deals of pairs, with the half width of its interval (95% for
+    the default z) and
+    how many times fewer games that interval needs than unpaired games
+    (None without any variance)
+    """
+    deals, games = pairs["deals"], pairs["games"]
+    if deals < 2:
+        return None
+    mean = pairs["deal_sum"] / deals
+    deal_variance = max(0.0, (pairs["deal_sum_sq"] - deals * mean * mean) / (deals - 1))
+    game_mean = pairs["sum"] / games
+    game_variance = (pairs["sum_sq"] - games * game_mean * game_mean) / (games - 1)
+    return {"difference": mean / rotations,
+            "half_width": z * math.sqrt(deal_variance / deals) / rotations,
+            # Unpaired, each game has game_variance; paired, each deal of rotations games has deal_variance
+            "reduction": game_variance * rotations / deal_variance if deal_variance else None}
+
+
+class Tournament:
+    def __init__(self, entrants: List[str], num_games: int, seed: int = 0,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 1000,
+                 max_turns: int = 1000, rules: Optional[List[str]] = None, decks: int = 1,
+                 paired: bool = False):
+        if len(entrants) < 2:
+            raise ValueError("Ein Turnier braucht mindestens zwei Teilnehmer")
+        if paired and num_games % len(entrants):
+            raise ValueError(f"Gepaarte Spiele brauchen ein Vielfaches von {len(entrants)} Spielen")
+
+        self.entrants = entrants
+        self.num_games = num_games
+        self.seed = seed
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.max_turns = max_turns
+        self.rules = HouseRules.from_names(rules or [])
+        self.decks = decks
+        self.paired = paired
+        self.stop_requested = False
+
+        self.labels = [f"{spec} {i + 1}" for i, spec in enumerate(entrants)]
+        self.completed = 0
+        self.drawn = 0
+        self.unfinished = 0
+        self.turns = 0
+        self.elapsed = 0.0
+        self.stats: Dict[str, Dict[str, int]] = {label: {"games": 0, "wins": 0, "points": 0}
+                                                  for label in self.labels}
+        # Wins of the first entrant minus wins of the second: per game, and per deal over its rotations
+        self.pairs = {"games": 0, "sum": 0, "sum_sq": 0, "deals": 0, "deal_sum": 0, "deal_sum_sq": 0,
+                      "open": 0}
+
+        # One player object per entrant; games reuse them seat-rotated
+        self.players: List[Player] = [create_player(spec, label) for spec, label in zip(entrants, self.labels)]
+        # From about four decks on, drawing from per-face counts beats reshuffling a list
+        self.game = Game(self.rules, CountedDeck(decks) if decks >= 4 else Deck(decks))
+
+    def config(self) -> Dict:
+        return {"entrants": self.entrants, "num_games": self.num_games,
+                "seed": self.seed, "max_turns": self.max_turns, "rules": self.rules.names(),
+                "decks": self.decks, "paired": self.paired}
+
+    def load_checkpoint(self) -> bool:
+        """Continue from checkpoint_path if it exists; False for a fresh start"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unbekannte Checkpoint-Version: {state.get('version')}")
+        if state["config"] != self.config():
+            raise ValueError("Checkpoint gehört zu einem anderen Turnier")
+
+        self.completed = state["completed"]
+        self.drawn = state["drawn"]
+        self.unfinished = state["unfinished"]
+        self.turns = state["turns"]
+        self.elapsed = state["elapsed"]
+        self.stats = state["stats"]
+        self.pairs = state["pairs"]
+        return True
+
+    def save_checkpoint(self):
+        """Atomically replace the checkpoint file"""
+        if not self.checkpoint_path:
+            return
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "config": self.config(),
+            "completed": self.completed,
+            "drawn": self.drawn,
+            "unfinished": self.unfinished,
+            "turns": self.turns,
+            "elapsed": self.elapsed,
+            "stats": self.stats,
+            "pairs": self.pairs,
+        }
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.checkpoint_path)
+
+    def play_game(self, index: int) -> Optional[Player]:
+        deal = index // len(self.players) if self.paired else index
+        random.seed(game_seed(self.seed, deal))
+        self.game.deck.seed(deck_seed(self.seed, deal))
+        shift = index % len(self.players)
+        self.game.players = self.players[shift:] + self.players[:shift]
+        self.game.reset()
+
+        for turn in range(1, self.max_turns + 1):
+            self.game.play_turn()
+            winner = self.game.check_winner()
+            if winner or self.game.drawn:
+                self.turns += turn
+                return winner
+        self.turns += self.max_turns
+        return None
+
+    def run(self) -> bool:
+        """Play until all games are done or stop_requested; True when finished"""
+        started = time.monotonic()
+        since_checkpoint = 0
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            while self.completed < self.num_games and not self.stop_requested:
+                winner = self.play_game(self.completed)
+                for label in self.labels:
+                    self.stats[label]["games"] += 1
+                if self.game.drawn:
+                    self.drawn += 1
+                elif winner is None:
+                    self.unfinished += 1
+                else:
+                    self.stats[winner.name]["wins"] += 1
+                    self.stats[winner.name]["points"] += self.game.round_points()
+                self.count_pair(winner)
+                self.completed += 1
+
+                since_checkpoint += 1
+                if since_checkpoint >= self.checkpoint_every:
+                    self.elapsed += time.monotonic() - started
+                    started = time.monotonic()
+                    self.save_checkpoint()
+                    since_checkpoint = 0
+
+        self.elapsed += time.monotonic() - started
+        self.save_checkpoint()
+        return self.completed >= self.num_games
+
+    def count_pair(self, winner: Optional[Player]):
+        difference = (winner is self.players[0]) - (winner is self.players[1])
+        pairs = self.pairs
+        pairs["games"] += 1
+        pairs["sum"] += difference
+        pairs["sum_sq"] += difference * difference
+        pairs["open"] += difference
+        if self.paired and (self.completed + 1) % len(self.players) == 0:
+            pairs["deals"] += 1
+            pairs["deal_sum"] += pairs["open"]
+            pairs["deal_sum_sq"] += pairs["open"] ** 2
+            pairs["open"] = 0
+
+    def paired_difference(self) -> Optional[Dict[str, float]]:
+        return paired_difference(self.pairs, len(self.players)) if self.paired else None
+
+    def report(self) -> str:
+        lines = [f"{self.completed}/{self.num_games} Spiele, {self.drawn} unentschieden, "
+                 f"{self.unfinished} abgebrochen, "
+                 f"{self.elapsed:.1f} s"]
+        # Ranked by points (official scoring), like a match
+        for label in sorted(self.labels, key=lambda label: -self.stats[label]["points"]):
+            games = self.stats[label]["games"]
+            wins = self.stats[label]["wins"]
+            share = wins / games * 100 if games else 0.0
+            lines.append(f"  {label}: {self.stats[label]['points']} Punkte, {wins} Siege ({share:.1f}%)")
+        paired = self.paired_difference()
+        if paired is not None:
+            line = (f"  Gepaart über {self.pairs['deals']} Verteilungen: {self.labels[0]} − {self.labels[1]} = "
+                    f"{paired['difference'] * 100:+.1f}% ± {paired['half_width'] * 100:.1f}% (95%)")
+            if paired["reduction"] is not None:
+                line += f", {paired['reduction']:.1f}× weniger Spiele als ungepaart"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UNO-Turnier mit Checkpoints")
+    parser.add_argument("entrants", nargs="*", default=["ComputerPlayer", "ComputerPlayer"],
+                        help="Strategien, optional mit Parametern wie ComputerPlayer:wild_threshold=1 "
+                             f"(Standard: zwei ComputerPlayer; bekannt: {', '.join(strategy_names())})")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--rules", default="",
+                        help=f"Hausregeln, kommagetrennt ({', '.join(HouseRules.NAMES)})")
+    parser.add_argument("--decks", type=int, default=1, help="Anzahl kombinierter 108er-Decks")
+    parser.add_argument("--paired", action="store_true",
+                        help="Jede Verteilung einmal je Sitzordnung spielen und die Differenz der Siegquoten angeben")
+    parser.add_argument("--checkpoint", help="Checkpoint-Datei; vorhanden = fortsetzen")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="Spiele zwischen Checkpoints")
+    parser.add_argument("--policy", default=PolicyPlayer.weights_path, help="Gewichte (.npz) für PolicyPlayer")
+    args = parser.parse_args()
+    PolicyPlayer.weights_path = args.policy
+
+    try:
+        tournament = Tournament(args.entrants, args.games, seed=args.seed,
+                                checkpoint_path=args.checkpoint,
+                                checkpoint_every=args.checkpoint_every, max_turns=args.max_turns,
+                                rules=[name for name in args.rules.split(",") if name], decks=args.decks,
+                                paired=args.paired)
+    except ValueError as error:
+        parser.error(str(error))
+    if tournament.load_checkpoint():
+        print(f"Fortgesetzt nach {tournament.completed} Spielen")
+
+    # Preemptible machines send SIGTERM: finish the current game and checkpoint
+    def request_stop(signum, frame):
+        tournament.stop_requested = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    finished = tournament.run()
+    print(tournament.report())
+    if not finished and args.checkpoint:
+        print(f"Unterbrochen, fortsetzen mit --checkpoint {args.checkpoint}")
+
+
+if __name__ == "__main__":
+    main()
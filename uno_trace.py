@@ -0,0 +1,149 @@
+"""
+Records the execution timeline of headless UNO games in the Chrome Trace
+Event format (open the output in chrome://tracing or ui.perfetto.dev).
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional
+
+from uno_fixed import Game, GamePool, ComputerPlayer
+
+
+class ChromeTracer:
+    """Collects complete ("X") events for every wrapped method call."""
+
+    def __init__(self):
+        self.events: List[Dict] = []
+        self._origin = time.perf_counter()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def name_process(self, pid: int, name: str):
+        self.events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                            "args": {"name": name}})
+
+    def wrap(self, obj, method_name: str, span_name: str, pid: int,
+             args_fn: Optional[Callable] = None):
+        """Replace obj.method_name on the instance with a traced version"""
+        method = getattr(obj, method_name)
+
+        def traced(*args, **kwargs):
+            span_args = args_fn(*args, **kwargs) if args_fn else {}
+            start = self._now_us()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.events.append({
+                    "name": span_name,
+                    "cat": "uno",
+                    "ph": "X",
+                    "ts": start,
+                    "dur": self._now_us() - start,
+                    "pid": pid,
+                    "tid": 0,
+                    "args": span_args,
+                })
+
+        setattr(obj, method_name, traced)
+
+    def attach(self, game: Game, pid: int):
+        """Trace turns, decisions, action cards, draws and refills of a game"""
+        turn_counter = [0]
+
+        def turn_args():
+            turn_counter[0] += 1
+            player = game.players[game.current_player_index]
+            return {"turn": turn_counter[0], "player": player.name, "hand": len(player.hand)}
+
+        self.wrap(game, "play_turn", "play_turn", pid, turn_args)
+        self.wrap(game, "handle_action_card", "handle_action_card", pid,
+                  lambda card, player: {"card": str(card)})
+        self.wrap(game, "ensure_deck_has_cards", "ensure_deck_has_cards", pid,
+                  lambda needed=1: {"needed": needed, "deck": game.deck.cards_remaining()})
+
+        for player in game.players:
+            self.wrap(player, "choose_card", "choose_card", pid,
+                      lambda *a, p=player: {"player": p.name, "hand": len(p.hand)})
+            self.wrap(player, "choose_color", "choose_color", pid,
+                      lambda p=player: {"player": p.name})
+            self.wrap(player, "draw_card", "draw_card", pid,
+                      lambda deck, p=player: {"player": p.name})
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+
+def new_computer_game(num_players: int = 2) -> Game:
+    """A computer-only game; deal it with reset() or Game.deal()"""
+    game = Game()
+    game.players = [ComputerPlayer(f"Computer {i + 1}") for i in range(num_players)]
+    return game
+
+
+def setup_computer_game(num_players: int = 2) -> Game:
+    """Deal a computer-only game the same way Game.setup_game does"""
+    game = new_computer_game(num_players)
+    game.deal()
+    return game
+
+
+def run_games(num_games: int, seed: int, sample_rate: float, tracer: ChromeTracer,
+              max_turns: int = 1000, num_players: int = 2) -> int:
+    """
+    Play num_games games with seeds seed, seed+1, ... and trace a sampled
+    subset of them. Returns the number of traced games.
+    """
+    sampler = random.Random(seed)
+    pool = GamePool(lambda: new_computer_game(num_players))
+    traced = 0
+
+    for i in range(num_games):
+        game_seed = seed + i
+        game = pool.acquire(game_seed)
+
+        # Traced games keep their wrapped methods and are not returned to the pool
+        sampled = sampler.random() < sample_rate
+        if sampled:
+            tracer.name_process(game_seed, f"Spiel seed={game_seed}")
+            tracer.attach(game, pid=game_seed)
+            traced += 1
+
+        for _ in range(max_turns):
+            game.play_turn()
+            if game.is_over():
+                break
+
+        if not sampled:
+            pool.release(game)
+
+    return traced
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chrome-Trace eines UNO-Spiels aufzeichnen")
+    parser.add_argument("--seed", type=int, default=0, help="Seed des ersten Spiels")
+    parser.add_argument("--games", type=int, default=1, help="Anzahl der Spiele")
+    parser.add_argument("--sample", type=float, default=1.0,
+                        help="Anteil der Spiele, die aufgezeichnet werden (0-1)")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("-o", "--output", default="uno_trace.json")
+    args = parser.parse_args()
+
+    tracer = ChromeTracer()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        traced = run_games(args.games, args.seed, args.sample, tracer,
+                           max_turns=args.max_turns, num_players=args.players)
+    tracer.write(args.output)
+    print(f"{traced} von {args.games} Spielen aufgezeichnet: {args.output}")
+
+
+if __name__ == "__main__":
+    main()